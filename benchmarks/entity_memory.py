@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+"""
+Measures the memory held by a list of resource items,
+built from payloads shaped like the API's.
+
+Usage: PYTHONPATH=. python benchmarks/entity_memory.py [count]
+"""
+
+import sys
+import tracemalloc
+from labstep.entities.resourceItem.model import ResourceItem
+from labstep.generic.entityList.model import EntityList
+
+
+def getPayload(i):
+    return {
+        'id': i,
+        'guid': f'00000000-0000-0000-0000-{i:012d}',
+        'name': f'Item {i}',
+        'amount': '10',
+        'unit': 'ml',
+        'status': 'available',
+        'barcode': None,
+        'created_at': '2024-01-01T00:00:00+00:00',
+        'updated_at': '2024-01-01T00:00:00+00:00',
+        'deleted_at': None,
+        'resource': {'id': i % 100, 'name': f'Resource {i % 100}'},
+        'resource_location': None,
+        'metadata_thread': {'id': i, 'metadata_count': 0},
+        'thread': {'id': i, 'comment_count': 0},
+        'author': {'id': 1, 'first_name': 'Jane', 'last_name': 'Doe'},
+        'permissions': ['view', 'edit'],
+    }
+
+
+def main(count=100000):
+    payloads = [getPayload(i) for i in range(count)]
+
+    tracemalloc.start()
+    items = EntityList(payloads, ResourceItem, user=None)
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f'{len(items)} resource items: {size / 2**20:.1f} MiB '
+          f'({size / len(items):.0f} bytes per item, excluding the payloads)')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:2]))
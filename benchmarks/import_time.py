@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+"""
+Times `import labstep` in fresh interpreters, and lists the
+packages it spends longest importing according to `python -X importtime`.
+
+Usage: PYTHONPATH=. python benchmarks/import_time.py [runs]
+"""
+
+import subprocess
+import sys
+
+
+def timeImport():
+    output = subprocess.run(
+        [sys.executable, '-c',
+         'import time; start = time.perf_counter(); import labstep; '
+         'print(time.perf_counter() - start)'],
+        capture_output=True, text=True, check=True).stdout
+    return float(output)
+
+
+def getSlowestPackages(count=10):
+    """
+    Returns
+    -------
+    list
+        (seconds, package) of the packages that took longest to import,
+        adding up the time spent in each of their modules.
+    """
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import labstep'],
+        capture_output=True, text=True, check=True).stderr
+
+    packages = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or '|' not in line:
+            continue
+        self, cumulative, name = line[len('import time:'):].split('|')
+        if not self.strip().isdigit():
+            continue
+        package = name.strip().split('.')[0]
+        packages[package] = packages.get(package, 0) + int(self) / 1e6
+
+    return sorted(((seconds, package) for package, seconds in packages.items()),
+                  reverse=True)[:count]
+
+
+def main(runs=5):
+    times = sorted(timeImport() for run in range(runs))
+    print(f'import labstep: best {times[0]:.3f}s, '
+          f'median {times[len(times) // 2]:.3f}s over {runs} runs')
+
+    for seconds, name in getSlowestPackages():
+        print(f'{seconds:>8.3f}s  {name}')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
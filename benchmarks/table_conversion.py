@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+"""
+Times converting plate reader style tables between
+Labstep's dataTable format and DataFrames.
+
+Usage: PYTHONPATH=. python benchmarks/table_conversion.py [rows ...]
+"""
+
+import sys
+import time
+import pandas  # noqa: F401 imported up front so that it is not timed
+from labstep.service.helpers import dataTableToDataFrame, dataFrameToDataTable
+
+
+def getDataTable(rowCount, columnCount=12):
+    dataTable = {'0': {str(c): {'value': f'Well {c}'} for c in range(columnCount)}}
+    for r in range(1, rowCount + 1):
+        dataTable[str(r)] = {str(c): {'value': r * 0.5 + c} for c in range(columnCount)}
+    return dataTable
+
+
+def timeIt(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main(rowCounts=(1000, 10000, 100000)):
+    for rowCount in rowCounts:
+        dataTable = getDataTable(rowCount)
+        df, toDataFrame = timeIt(dataTableToDataFrame, dataTable)
+        data, toDataTable = timeIt(dataFrameToDataTable, df)
+        print(f'{rowCount:>7} rows: dataTableToDataFrame {toDataFrame:.3f}s, '
+              f'dataFrameToDataTable {toDataTable:.3f}s')
+
+
+if __name__ == '__main__':
+    main(*[list(map(int, sys.argv[1:]))] if sys.argv[1:] else [])
@@ -15,35 +15,26 @@ user.setWorkspace(my_workspace.id)
 # Delete a list of Tags for 'crystallisation'
 # That are only in the Resource entity type
 tags_to_delete = user.getTags(search_query='crystallisation', type='resource')
-for i in range(len(tags_to_delete)):
-    print('TAGS TO DELETE =', tags_to_delete[i].name)
-    tags_to_delete[i].delete()
-
-
-# Get the difference of two lists using set()
-def diff(list1, list2):
-    return (list(set(list1) - set(list2)))
+for tag in tags_to_delete:
+    print('TAGS TO DELETE =', tag.name)
+tags_to_delete.delete()
 
 
 # Only keep experiments that investigate the protein structure by 'NMR'
-# And store the IDs in a list
 keep_experiments = user.getExperiments(search_query='NMR')
-keep_exp_ids = []
-for i in range(len(keep_experiments)):
-    print('EXPERIMENTS TO KEEP =', keep_experiments[i].name)
-    print('EXPERIMENT IDS TO KEEP =', keep_experiments[i].id)
-    keep_exp_ids.append(keep_experiments[i].id)
+keep_exp_ids = set(keep_experiments.indexBy('id'))
+for experiment in keep_experiments:
+    print('EXPERIMENTS TO KEEP =', experiment.name)
+    print('EXPERIMENT IDS TO KEEP =', experiment.id)
 
 
-# Get all Experiment IDs
+# Find the Experiments to delete, and delete them
 all_experiments = user.getExperiments()
-all_exp_ids = []
-for i in range(len(all_experiments)):
-    all_exp_ids.append(all_experiments[i].id)
-
-
-# Find the IDs of Experiments to delete, and delete them
-for i in diff(all_exp_ids, keep_exp_ids):
-    print('EXPERIMENT IDS TO DELETE =', i)
-    exp_to_delete = user.getExperiment(i)
-    exp_to_delete.delete()
+experiments_to_delete = all_experiments.filter(
+    lambda experiment: experiment.id not in keep_exp_ids)
+for experiment in experiments_to_delete:
+    print('EXPERIMENT IDS TO DELETE =', experiment.id)
+
+result = experiments_to_delete.delete()
+for experiment, error in result.failed:
+    print('FAILED TO DELETE =', experiment.id, error)
@@ -7,7 +7,4 @@ user = labstep.authenticate(apikey='<your API key>') ## Enter your API key
 
 workspace = user.getWorkspace(XXXX) ## Enter Workspace ID
 
-protocols = workspace.getProtocols() ## Filter protocols using parameters such as tag_id, collection_id, created_at_from, created_at_to
-
-for protocol in protocols:
-    protocol.export('my/folder/path') ## Export all formats to a path called 'export'.
\ No newline at end of file
+workspace.exportProtocols('my/folder/path', incremental=True) ## Export every protocol in the workspace. Re-running only re-exports protocols that have changed.
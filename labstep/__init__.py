@@ -8,3 +8,4 @@
 from .entities.user.facade import login, authenticate, impersonate
 from .service import jupyter
 from .service.ping import ping
+from .service.config import configure
@@ -0,0 +1 @@
+bulkWorkers = 8
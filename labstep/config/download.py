@@ -0,0 +1,2 @@
+downloadWorkers = 4
+partSize = 8 * 1024 * 1024
@@ -1,2 +1,3 @@
 entityNameInFolderName = True
 includePDF = False
+exportWorkers = 8
@@ -0,0 +1,5 @@
+pageSize = 50
+# Listings fetch this many pages at once when above 1. The pages
+# are addressed with the `page` parameter; listings that ignore it
+# are detected and walked with their cursor instead.
+pageConcurrency = 1
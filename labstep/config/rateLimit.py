@@ -0,0 +1,12 @@
+# Maximum requests per second for each user, None for no limit
+requestsPerSecond = None
+burst = 10
+
+# Bounds of the adaptive limit on concurrent requests for each user
+initialConcurrency = 8
+maxConcurrency = 64
+
+# Retries of throttled (429) requests
+maxRetries = 5
+backoffBase = 0.5  # seconds
+backoffMax = 60  # seconds
@@ -0,0 +1,6 @@
+# Connection pool settings for the shared session. Raise poolMaxsize
+# when running more threads than this against the API at once.
+poolConnections = 10
+poolMaxsize = 32
+timeout = 60  # seconds
+maxRetries = 3
@@ -0,0 +1,4 @@
+import os
+
+uploadWorkers = 4
+fileIndexPath = os.path.join('~', '.labstep', 'file-index')
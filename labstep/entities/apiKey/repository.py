@@ -1,5 +1,5 @@
-from labstep.service.config import configService
-from labstep.service.request import requestService
+from labstep.service.client import getHost
+from labstep.service.client import getRequestService
 from labstep.entities.apiKey.model import APIKey
 from labstep.generic.entity.repository import getEntities, newEntity, editEntity, getEntity
 from labstep.constants import UNSPECIFIED
@@ -22,8 +22,8 @@ def getAPIKey(user, APIKey_id,):
     params = {'id': APIKey_id, 'get_single': 1}
 
     headers = getHeaders(user=user)
-    url = url_join(configService.getHost(), "/api/generic/",APIKey.__entityName__)
-    response = requestService.get(url, headers=headers, params=params)
+    url = url_join(getHost(user), "/api/generic/",APIKey.__entityName__)
+    response = getRequestService(user).get(url, headers=headers, params=params)
     return APIKey(json.loads(response.content), user)
 
 
@@ -29,7 +29,7 @@ def addCollaboratorRoleRequirement(user,
 
     collab_requirements = entityRepository.newEntity(user, CollaboratorRoleRequirement, params)
 
-    setattr(entity_state,'entity_user_role_requirements', collab_requirements.__dict__)
+    setattr(entity_state,'entity_user_role_requirements', collab_requirements.__data__)
     setattr(collab_requirements, 'entity_state_id', entity_state.id)
 
     return collab_requirements
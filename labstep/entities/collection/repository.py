@@ -4,9 +4,9 @@
 
 import json
 from labstep.entities.collection.model import Collection
-from labstep.service.request import requestService
+from labstep.service.client import getRequestService
 from labstep.service.helpers import url_join, getHeaders
-from labstep.service.config import configService
+from labstep.service.client import getHost
 from labstep.generic.entity.repository import getEntities, editEntity, newEntities, newEntity
 from labstep.constants import UNSPECIFIED
 
@@ -54,14 +54,14 @@ def addToCollection(entity, collection_id):
 
     headers = getHeaders(entity.__user__)
     url = url_join(
-        configService.getHost(),
+        getHost(entity.__user__),
         "api/generic/",
         entityName,
         str(entity.id),
         Collection.__entityName__,
         str(collection_id),
     )
-    response = requestService.put(url, headers=headers)
+    response = getRequestService(entity.__user__).put(url, headers=headers)
     return json.loads(response.content)
 
 
@@ -70,14 +70,14 @@ def removeFromCollection(entity, collection_id):
 
     headers = getHeaders(entity.__user__)
     url = url_join(
-        configService.getHost(),
+        getHost(entity.__user__),
         "api/generic/",
         entityName,
         str(entity.id),
         Collection.__entityName__,
         str(collection_id),
     )
-    response = requestService.delete(url, headers=headers)
+    response = getRequestService(entity.__user__).delete(url, headers=headers)
     return json.loads(response.content)
 
 
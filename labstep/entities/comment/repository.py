@@ -7,6 +7,7 @@ from labstep.generic.entity.repository import getEntities, newEntity, editEntity
 import labstep.entities.file.repository as fileRepository
 from labstep.service.helpers import handleString
 from labstep.constants import UNSPECIFIED
+import labstep.service.taskGraph as taskGraph
 
 
 def getComments(entity, count=UNSPECIFIED, extraParams={}):
@@ -62,7 +63,11 @@ def editComment(comment, body=UNSPECIFIED, extraParams={}):
     return editEntity(comment, params)
 
 
-def exportComment(comment, rootPath):
+def exportComment(comment, rootPath, workers=UNSPECIFIED):
+    taskGraph.run(exportCommentTree, comment, rootPath, workers=workers)
+
+
+def exportCommentTree(comment, rootPath):
     commentDir = exportEntity(
         comment, rootPath)
 
@@ -652,7 +652,7 @@ class Experiment(EntityPrimary):
 
         return experimentLinkRepository.getExperimentLinks(self.__user__, self.id, direction=direction)
 
-    def export(self, path):
+    def export(self, path, workers=UNSPECIFIED):
         """
         Export the experiment to the directory specified.
 
@@ -660,6 +660,10 @@ class Experiment(EntityPrimary):
         -------
         path (str)
             The path to the directory to save the experiment.
+        workers (int)
+            The number of parts of the experiment (protocols, notes, files...)
+            exported in parallel. Defaults to
+            labstep.config.export.exportWorkers, 1 exports sequentially.
 
         Example
         -------
@@ -670,7 +674,7 @@ class Experiment(EntityPrimary):
         """
         import labstep.entities.experiment.repository as experimentRepository
 
-        return experimentRepository.exportExperiment(self, path)
+        return experimentRepository.exportExperiment(self, path, workers=workers)
 
     def getJupyterNotebooks(self, count=UNSPECIFIED):
         """
@@ -9,6 +9,7 @@ from labstep.entities.experiment.model import Experiment, ExperimentProtocol
 from labstep.service.helpers import handleDate
 from labstep.service.htmlExport import htmlExportService
 from labstep.service.htmlToPDF import htmlToPDF
+import labstep.service.taskGraph as taskGraph
 
 
 def getExperiment(user, experiment_id):
@@ -25,6 +26,8 @@ def getExperiments(
     tag_id=UNSPECIFIED,
     collection_id=UNSPECIFIED,
     extraParams={},
+    page_size=UNSPECIFIED,
+    serializer_groups=UNSPECIFIED,
 ):
     params = {
         "search_query": search_query,
@@ -34,7 +37,33 @@ def getExperiments(
         "folder_id": collection_id,
         **extraParams,
     }
-    return entityRepository.getEntities(user, Experiment, count, params)
+    return entityRepository.getEntities(user, Experiment, count, params,
+                                        pageSize=page_size, serializerGroups=serializer_groups)
+
+
+def iterExperiments(
+    user,
+    count=UNSPECIFIED,
+    search_query=UNSPECIFIED,
+    created_at_from=UNSPECIFIED,
+    created_at_to=UNSPECIFIED,
+    tag_id=UNSPECIFIED,
+    collection_id=UNSPECIFIED,
+    prefetch=False,
+    extraParams={},
+    page_size=UNSPECIFIED,
+    serializer_groups=UNSPECIFIED,
+):
+    params = {
+        "search_query": search_query,
+        "created_at_from": handleDate(created_at_from),
+        "created_at_to": handleDate(created_at_to),
+        "tag_id": tag_id,
+        "folder_id": collection_id,
+        **extraParams,
+    }
+    return entityRepository.iterEntities(user, Experiment, count, params, prefetch=prefetch,
+                                        pageSize=page_size, serializerGroups=serializer_groups)
 
 
 def newExperiment(user, name, entry=UNSPECIFIED, extraParams={}):
@@ -85,7 +114,12 @@ def editExperiment(
     return entityRepository.editEntity(experiment, params)
 
 
-def exportExperiment(experiment, root_path):
+def exportExperiment(experiment, root_path, workers=UNSPECIFIED):
+    taskGraph.run(exportExperimentTree, experiment,
+                  root_path, workers=workers)
+
+
+def exportExperimentTree(experiment, root_path):
 
     experiment.update()
 
@@ -109,6 +143,12 @@ def exportExperiment(experiment, root_path):
     for note in notes:
         note.export(notesDir)
 
+    # the html links to exported files, so wait for everything above
+    taskGraph.afterChildren(exportExperimentHTML, experiment, expDir)
+
+
+def exportExperimentHTML(experiment, expDir):
+
     # get html
     html = htmlExportService.getHTML(experiment, withImages=includePDF)
     html_with_paths = htmlExportService.insertFilepaths(expDir, html)
@@ -3,9 +3,16 @@
 # Author: Labstep <dev@labstep.com>
 
 import labstep.generic.entity.repository as entityRepository
+import labstep.service.taskGraph as taskGraph
+from labstep.constants import UNSPECIFIED
 
 
-def exportExperimentProtocol(experimentProtocol, rootPath, folderName):
+def exportExperimentProtocol(experimentProtocol, rootPath, folderName, workers=UNSPECIFIED):
+    taskGraph.run(exportExperimentProtocolTree, experimentProtocol,
+                  rootPath, folderName, workers=workers)
+
+
+def exportExperimentProtocolTree(experimentProtocol, rootPath, folderName):
 
     experimentProtocol.update()
 
@@ -1,8 +1,13 @@
 from labstep.generic.entity.repository import exportEntity
 from labstep.constants import UNSPECIFIED
+import labstep.service.taskGraph as taskGraph
 
 
-def exportExperimentStep(step, rootPath):
+def exportExperimentStep(step, rootPath, workers=UNSPECIFIED):
+    taskGraph.run(exportExperimentStepTree, step, rootPath, workers=workers)
+
+
+def exportExperimentStepTree(step, rootPath):
     stepDir = exportEntity(
         step, rootPath)
 
@@ -27,10 +27,15 @@ class File(Entity):
 
         return fileRepository.downloadFile(self.__user__, self.id)
 
-    def save(self, folder=UNSPECIFIED, name=UNSPECIFIED):
+    def save(self, folder=UNSPECIFIED, name=UNSPECIFIED, progress=UNSPECIFIED, checksum=UNSPECIFIED, workers=UNSPECIFIED):
         """
         Save a Labstep file to the local filesystem.
 
+        The file is streamed to disk in chunks, so memory use
+        does not depend on the size of the file. Large files are
+        downloaded in parallel parts, and an interrupted download
+        resumes from the parts already saved when called again.
+
         Parameters
         ----------
         folder (str)
@@ -38,6 +43,15 @@ class File(Entity):
             (defaults to the current working directory).
         name (str)
             Optionally give the file a new name.
+        progress (function)
+            Optionally called as progress(bytesDownloaded, totalBytes)
+            while the file downloads.
+        checksum (str)
+            Optionally the expected sha256 hex digest of the file.
+            A ChecksumError is raised if the download does not match.
+        workers (int)
+            The number of parts to download at once, defaults to
+            labstep.config.download.downloadWorkers.
 
         Returns
         -------
@@ -49,7 +63,7 @@ class File(Entity):
 
             entities = user.getFiles(search_query='bacteria')
             file = entities[0]
-            file.save()
+            file.save(progress=lambda done, total: print(done, total))
         """
         if self.link_source is not None:
             print('Warning: Files from External Cloud Providers cannot be downloaded')
@@ -63,8 +77,11 @@ class File(Entity):
         else:
             filepath = name
 
-        data = self.getData()
-        open(filepath, "wb").write(data)
+        import labstep.entities.file.repository as fileRepository
+
+        fileRepository.downloadFileToPath(
+            self.__user__, self.id, filepath,
+            progress=progress, checksum=checksum, workers=workers)
 
     def export(self, path):
         """
@@ -2,49 +2,117 @@
 # -*- coding: utf-8 -*-
 # Author: Labstep <dev@labstep.com>
 
+import io
 import json
-from labstep.service.config import configService
+import os
+from labstep.service.client import getHost
 from labstep.service.helpers import url_join, getHeaders
 from labstep.entities.file.model import File
-from labstep.service.request import requestService
+from labstep.service.client import getRequestService
+from labstep.service.download import downloadToPath
+from labstep.service.multipart import MultipartEncoder, isSeekable
+from labstep.service.fileIndex import getFileIndex
+from labstep.service.exportManifest import hashFile
+from labstep.service.concurrency import mapConcurrently
+import labstep.config.upload as uploadConfig
 import labstep.generic.entity.repository as entityRepository
 from labstep.constants import UNSPECIFIED
+import labstep.service.taskGraph as taskGraph
 
 
-def newFile(user, filepath=UNSPECIFIED, rawData=UNSPECIFIED, extraParams={}):
+def newFile(user, filepath=UNSPECIFIED, rawData=UNSPECIFIED, extraParams={}, progress=UNSPECIFIED):
     if filepath is not UNSPECIFIED:
         rawData = open(filepath, 'rb')
     if rawData is UNSPECIFIED:
         raise Exception('Please specify filepath or raw data')
 
-    files = {'file': rawData}
-    params = {"group_id": user.activeWorkspace, **extraParams}
-    headers = getHeaders(user=user)
-    url = url_join(configService.getHost(), "/api/generic/file/upload")
-    response = requestService.post(
-        url, headers=headers, files=files, data=params)
+    try:
+        if isinstance(rawData, str):
+            rawData = rawData.encode('utf-8')
+        if isinstance(rawData, (bytes, bytearray)):
+            fileobj, filename = io.BytesIO(rawData), 'file'
+        else:
+            fileobj = rawData
+            filename = os.path.basename(getattr(rawData, 'name', 'file'))
+
+        params = {"group_id": user.activeWorkspace, **extraParams}
+        url = url_join(getHost(user), "/api/generic/file/upload")
+
+        if isSeekable(fileobj):
+            body = MultipartEncoder(
+                params, {'file': (filename, fileobj)}, progress=progress)
+            headers = {**getHeaders(user=user), 'Content-Type': body.contentType}
+            response = getRequestService(user).post(url, headers=headers, data=body)
+        else:
+            # Pipes and sockets can't be measured or re-read,
+            # so they are read into memory by requests instead.
+            response = getRequestService(user).post(
+                url, headers=getHeaders(user=user), files={'file': (filename, fileobj)}, data=params)
+    finally:
+        if filepath is not UNSPECIFIED:
+            rawData.close()
+
     data = json.loads(response.content)
     return File(list(data.values())[0], user)
 
 
+def newFiles(user, filepaths, concurrency=UNSPECIFIED, deduplicate=True, extraParams={}):
+    if concurrency is UNSPECIFIED:
+        concurrency = uploadConfig.uploadWorkers
+
+    filepaths = list(filepaths)
+    hashes = mapConcurrently(hashFile, filepaths, concurrency)
+    index = getFileIndex(user)
+
+    pending = {}
+    for filepath, fileHash in zip(filepaths, hashes):
+        if deduplicate and (fileHash in pending or index.get(fileHash, extraParams) is not None):
+            continue
+        pending.setdefault(fileHash, []).append(filepath)
+
+    def upload(item):
+        fileHash, filepath = item
+        file = newFile(user, filepath, extraParams=extraParams)
+        index.add(fileHash, file.__data__, extraParams)
+        return file
+
+    uploads = [(fileHash, filepath)
+               for fileHash, paths in pending.items() for filepath in paths]
+    uploaded = mapConcurrently(upload, uploads, concurrency)
+    files = {filepath: file for (fileHash, filepath), file in zip(uploads, uploaded)}
+
+    return [
+        files[filepath] if filepath in files else File(index.get(fileHash, extraParams), user)
+        for filepath, fileHash in zip(filepaths, hashes)
+    ]
+
+
 def getFile(user, fileId):
     return entityRepository.getEntity(user, File, fileId)
 
 
 def getFileDownloadLink(user, fileId):
     headers = getHeaders(user=user)
-    url = url_join(configService.getHost(),
+    url = url_join(getHost(user),
                    "/api/generic/file/download", str(fileId))
-    response = requestService.post(url, headers=headers)
+    response = getRequestService(user).post(url, headers=headers)
     return json.loads(response.content)["signed_url"]
 
 
 def downloadFile(user, fileId):
     downloadLink = getFileDownloadLink(user, fileId)
-    response = requestService.get(downloadLink, headers=None)
+    response = getRequestService(user).get(downloadLink, headers=None, useCache=False)
     return response.content
 
 
+def downloadFileToPath(user, fileId, filepath, progress=UNSPECIFIED, checksum=UNSPECIFIED, workers=UNSPECIFIED):
+    downloadLink = getFileDownloadLink(user, fileId)
+    return downloadToPath(
+        downloadLink, filepath, progress=progress, checksum=checksum, workers=workers,
+        refreshUrl=lambda: getFileDownloadLink(user, fileId),
+        requestService=getRequestService(user))
+
+
 def getFiles(
     user, count=UNSPECIFIED, search_query=UNSPECIFIED, extension=UNSPECIFIED, extraParams={}
 ):
@@ -53,7 +121,11 @@ def getFiles(
     return entityRepository.getEntities(user, File, count, params)
 
 
-def exportFile(file, root_path):
+def exportFile(file, root_path, workers=UNSPECIFIED):
+    taskGraph.run(exportFileTree, file, root_path, workers=workers)
+
+
+def exportFileTree(file, root_path):
 
     fileDir = entityRepository.exportEntity(
         file, root_path, folderName=str(file.id))
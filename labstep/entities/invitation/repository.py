@@ -3,15 +3,15 @@
 # Author: Labstep <dev@labstep.com>
 
 from labstep.service.helpers import url_join, getHeaders
-from labstep.service.config import configService
-from labstep.service.request import requestService
+from labstep.service.client import getHost
+from labstep.service.client import getRequestService
 from labstep.entities.invitation.model import Invitation
 import labstep.generic.entity.repository as entityRepository
 from labstep.constants import UNSPECIFIED
 
 
 def newInvitations(user, invitationType, emails, organization_id, workspace_id=UNSPECIFIED):
-    url = url_join(configService.getHost(), 'api/generic',
+    url = url_join(getHost(user), 'api/generic',
                    'share-link-invitation', invitationType)
     headers = getHeaders(user=user)
     json = {
@@ -19,7 +19,7 @@ def newInvitations(user, invitationType, emails, organization_id, workspace_id=U
         'organization_id': organization_id,
         'organization_group_id': workspace_id
     }
-    requestService.post(url=url, headers=headers, json=json)
+    getRequestService(user).post(url=url, headers=headers, json=json)
 
 
 def getInvitations(user, organization_id, extraParams):
@@ -3,7 +3,7 @@
 # Author: Labstep <dev@labstep.com>
 
 from labstep.entities.jupyterNotebook.model import JupyterNotebook
-from labstep.service.request import requestService
+from labstep.service.client import getRequestService
 import labstep.generic.entity.repository as entityRepository
 from labstep.constants import UNSPECIFIED
 
@@ -40,5 +40,5 @@ def editJupyterNotebook(
 
 
 def runJupyterNotebook(jupyterNotebook):
-    return requestService.get(
+    return getRequestService(jupyterNotebook.__user__).get(
         f'https://jupyter-api.labstep.com/run/{jupyterNotebook.guid}')
@@ -12,9 +12,9 @@ from labstep.service.helpers import (
     url_join,
     getHeaders,
 )
-from labstep.service.config import configService
+from labstep.service.client import getHost
 import json
-from labstep.service.request import requestService
+from labstep.service.client import getRequestService
 
 
 
@@ -56,9 +56,9 @@ def disableUser(organizationUser):
 
 def addUsers(adminUser,users,workspace_id=UNSPECIFIED):
     headers = getHeaders(user=adminUser)
-    url = url_join(configService.getHost(), "/api/generic/",
+    url = url_join(getHost(adminUser), "/api/generic/",
                    "user", "batch")
-    response = requestService.post(
+    response = getRequestService(adminUser).post(
         url, headers=headers, json={"items": users, "group_id": adminUser.activeWorkspace})
     responseJson = json.loads(response.content)
 
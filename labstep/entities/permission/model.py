@@ -13,7 +13,6 @@ class Permission(Entity):
     def __init__(self, data, user):
         super().__init__(data, user)
         self.workspace = data["group"]
-        delattr(self, 'group')
 
     def set(self, type):
         """
@@ -4,8 +4,8 @@
 
 import json
 from labstep.service.helpers import url_join, getHeaders
-from labstep.service.config import configService
-from labstep.service.request import requestService
+from labstep.service.client import getHost
+from labstep.service.client import getRequestService
 from labstep.entities.permission.model import Permission
 from labstep.generic.entity.repository import getEntities, newEntity, editEntity, deleteEntity
 from labstep.constants import UNSPECIFIED
@@ -44,7 +44,7 @@ def transferOwnership(entity, workspace_id):
     entityName = entity.__entityName__
     headers = getHeaders(entity.__user__)
     url = url_join(
-        configService.getHost(), "api/generic/", entityName, str(entity.id), "transfer-ownership"
+        getHost(entity.__user__), "api/generic/", entityName, str(entity.id), "transfer-ownership"
     )
     params = {"group_id": workspace_id}
-    requestService.post(url, headers=headers, json=params)
+    getRequestService(entity.__user__).post(url, headers=headers, json=params)
@@ -501,7 +501,7 @@ class Protocol(EntityPrimary):
         """
         return self.getCurrentVersion().getFiles()
 
-    def export(self, path):
+    def export(self, path, workers=UNSPECIFIED):
         """
         Export the protocol to the directory specified.
 
@@ -509,6 +509,10 @@ class Protocol(EntityPrimary):
         -------
         path (str)
             The path to the directory to save the protocol.
+        workers (int)
+            The number of parts of the protocol (protocols, notes, files...)
+            exported in parallel. Defaults to
+            labstep.config.export.exportWorkers, 1 exports sequentially.
 
         Example
         -------
@@ -519,7 +523,7 @@ class Protocol(EntityPrimary):
         """
         import labstep.entities.protocol.repository as protocolRepository
 
-        return protocolRepository.exportProtocol(self, path)
+        return protocolRepository.exportProtocol(self, path, workers=workers)
 
     def getJupyterNotebooks(self, count=100):
         """
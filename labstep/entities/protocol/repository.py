@@ -10,6 +10,7 @@ from labstep.entities.protocolVersion.model import ProtocolVersion
 from labstep.service.helpers import handleDate
 from labstep.service.htmlExport import htmlExportService
 from labstep.service.htmlToPDF import htmlToPDF
+import labstep.service.taskGraph as taskGraph
 
 
 def getProtocol(user, protocol_id):
@@ -26,6 +27,8 @@ def getProtocols(
     tag_id=UNSPECIFIED,
     collection_id=UNSPECIFIED,
     extraParams={},
+    page_size=UNSPECIFIED,
+    serializer_groups=UNSPECIFIED,
 ):
     params = {
         "search_query": search_query,
@@ -35,7 +38,33 @@ def getProtocols(
         "folder_id": collection_id,
         **extraParams,
     }
-    return entityRepository.getEntities(user, Protocol, count, params)
+    return entityRepository.getEntities(user, Protocol, count, params,
+                                        pageSize=page_size, serializerGroups=serializer_groups)
+
+
+def iterProtocols(
+    user,
+    count=UNSPECIFIED,
+    search_query=UNSPECIFIED,
+    created_at_from=UNSPECIFIED,
+    created_at_to=UNSPECIFIED,
+    tag_id=UNSPECIFIED,
+    collection_id=UNSPECIFIED,
+    prefetch=False,
+    extraParams={},
+    page_size=UNSPECIFIED,
+    serializer_groups=UNSPECIFIED,
+):
+    params = {
+        "search_query": search_query,
+        "created_at_from": handleDate(created_at_from),
+        "created_at_to": handleDate(created_at_to),
+        "tag_id": tag_id,
+        "folder_id": collection_id,
+        **extraParams,
+    }
+    return entityRepository.iterEntities(user, Protocol, count, params, prefetch=prefetch,
+                                        pageSize=page_size, serializerGroups=serializer_groups)
 
 
 def newProtocol(user, name, extraParams={}):
@@ -55,7 +84,11 @@ def editProtocol(
     return entityRepository.editEntity(protocol, params)
 
 
-def exportProtocol(protocol, root_path):
+def exportProtocol(protocol, root_path, workers=UNSPECIFIED):
+    taskGraph.run(exportProtocolTree, protocol, root_path, workers=workers)
+
+
+def exportProtocolTree(protocol, root_path):
 
     protocol.update()
 
@@ -3,7 +3,7 @@
 # Author: Labstep <dev@labstep.com>
 
 from labstep.generic.entity.model import Entity
-from labstep.service.helpers import dataTableToDataFrame
+from labstep.service.helpers import DEFAULT_SHEET, DataFrameSheets, dataFramesToData, getDataTable
 from labstep.constants import UNSPECIFIED
 
 
@@ -59,9 +59,7 @@ class ProtocolTable(Entity):
         return entityRepository.editEntity(self, params)
 
     def getDataTable(self,sheet='Sheet1'):
-        if 'sheets' in self.data:
-            return self.data['sheets'][sheet]['data']['dataTable']
-        return self.data['data']['dataTable']
+        return getDataTable(self.data, sheet=sheet)
 
     def getDataFrame(self,sheet='Sheet1'):
         """
@@ -108,4 +106,59 @@ class ProtocolTable(Entity):
             dataFrame = protocol_table.getDataFrame()
             print(dataFrame['Column A'][0])
         """
-        return dataTableToDataFrame(self.getDataTable(sheet=sheet))
+        dataFrames = self.getDataFrames()
+        if 'sheets' not in self.data:
+            # Single sheet tables return their only sheet for any name.
+            sheet = DEFAULT_SHEET
+        return dataFrames[sheet].copy()
+
+    def getDataFrames(self):
+        """
+        Returns every sheet of the table as a DataFrame.
+
+        Sheets are converted the first time they are accessed
+        and kept until the table is edited or updated.
+
+        Returns
+        -------
+        dict
+            A read-only dict mapping sheet names to DataFrames.
+
+        Example
+        -------
+        ::
+
+            dataFrames = protocol_table.getDataFrames()
+            for sheet in dataFrames:
+                print(sheet, dataFrames[sheet].shape)
+        """
+        sheets = getattr(self, '__sheets__', None)
+        if sheets is None or sheets.data is not self.data:
+            sheets = DataFrameSheets(self.data)
+            self.__sheets__ = sheets
+        return sheets
+
+    def setDataFrames(self, data_frames):
+        """
+        Replaces the sheets of the table with DataFrames.
+        Sheets not in data_frames are left as they are, and the
+        sheet of a single sheet table is kept as 'Sheet1'.
+
+        Parameters
+        ----------
+        data_frames (dict)
+            Maps sheet names to DataFrames, whose
+            column names become the first row.
+
+        Returns
+        -------
+        :class:`~labstep.entities.protocolTable.model.ProtocolTable`
+            The edited table.
+
+        Example
+        -------
+        ::
+
+            protocol_table.setDataFrames({'Plate 1': plate1, 'Plate 2': plate2})
+        """
+        return self.edit(data=dataFramesToData(data_frames, self.data))
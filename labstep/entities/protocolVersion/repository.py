@@ -3,6 +3,7 @@ from labstep.config.export import includePDF
 from labstep.constants import UNSPECIFIED
 from labstep.service.htmlExport import htmlExportService
 from labstep.service.htmlToPDF import htmlToPDF
+import labstep.service.taskGraph as taskGraph
 
 
 def edit(
@@ -13,7 +14,12 @@ def edit(
     return entityRepository.editEntity(protocolVersion, params)
 
 
-def exportProtocolVersion(protocolVersion, root_path):
+def exportProtocolVersion(protocolVersion, root_path, workers=UNSPECIFIED):
+    taskGraph.run(exportProtocolVersionTree, protocolVersion,
+                  root_path, workers=workers)
+
+
+def exportProtocolVersionTree(protocolVersion, root_path):
 
     protocolVersion.update()
 
@@ -40,6 +46,12 @@ def exportProtocolVersion(protocolVersion, root_path):
     for dat in data:
         dat.export(dataDir)
 
+    # the html links to exported files, so wait for everything above
+    taskGraph.afterChildren(exportProtocolVersionHTML, protocolVersion, expDir)
+
+
+def exportProtocolVersionHTML(protocolVersion, expDir):
+
     # get html
     html = htmlExportService.getHTML(
         protocolVersion, withImages=includePDF)
@@ -12,12 +12,23 @@ def getResource(user, resource_id):
 
 
 def getResources(
-    user, count=UNSPECIFIED, search_query=UNSPECIFIED, resource_category_id=UNSPECIFIED, tag_id=UNSPECIFIED, extraParams={}
+    user, count=UNSPECIFIED, search_query=UNSPECIFIED, resource_category_id=UNSPECIFIED, tag_id=UNSPECIFIED, extraParams={}, page_size=UNSPECIFIED, serializer_groups=UNSPECIFIED
 ):
     params = {"search_query": search_query,
               "template_id": resource_category_id,
               "tag_id": tag_id, **extraParams}
-    return entityRepository.getEntities(user, Resource, count, params)
+    return entityRepository.getEntities(user, Resource, count, params,
+                                        pageSize=page_size, serializerGroups=serializer_groups)
+
+
+def iterResources(
+    user, count=UNSPECIFIED, search_query=UNSPECIFIED, resource_category_id=UNSPECIFIED, tag_id=UNSPECIFIED, prefetch=False, extraParams={}, page_size=UNSPECIFIED, serializer_groups=UNSPECIFIED
+):
+    params = {"search_query": search_query,
+              "template_id": resource_category_id,
+              "tag_id": tag_id, **extraParams}
+    return entityRepository.iterEntities(user, Resource, count, params, prefetch=prefetch,
+                                        pageSize=page_size, serializerGroups=serializer_groups)
 
 
 def newResource(user, name, resource_category_id=UNSPECIFIED, extraParams={}):
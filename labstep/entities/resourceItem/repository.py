@@ -13,14 +13,27 @@ def getResourceItem(user, resourceItem_id):
 
 
 def getResourceItems(
-    user, resource_id=UNSPECIFIED, count=UNSPECIFIED, search_query=UNSPECIFIED, extraParams={}
+    user, resource_id=UNSPECIFIED, count=UNSPECIFIED, search_query=UNSPECIFIED, extraParams={}, page_size=UNSPECIFIED, serializer_groups=UNSPECIFIED
 ):
     params = {
         "search_query": search_query,
         "resource_id": resource_id,
         **extraParams,
     }
-    return entityRepository.getEntities(user, ResourceItem, count, params)
+    return entityRepository.getEntities(user, ResourceItem, count, params,
+                                        pageSize=page_size, serializerGroups=serializer_groups)
+
+
+def iterResourceItems(
+    user, resource_id=UNSPECIFIED, count=UNSPECIFIED, search_query=UNSPECIFIED, prefetch=False, extraParams={}, page_size=UNSPECIFIED, serializer_groups=UNSPECIFIED
+):
+    params = {
+        "search_query": search_query,
+        "resource_id": resource_id,
+        **extraParams,
+    }
+    return entityRepository.iterEntities(user, ResourceItem, count, params, prefetch=prefetch,
+                                        pageSize=page_size, serializerGroups=serializer_groups)
 
 
 def newResourceItem(
@@ -4,7 +4,7 @@
 
 import requests
 from labstep.generic.entity.model import Entity
-from labstep.service.config import configService
+from labstep.service.client import getHost
 from labstep.service.helpers import url_join, getHeaders
 from labstep.constants import UNSPECIFIED
 
@@ -74,6 +74,6 @@ class Sharelink(Entity):
         """
         headers = getHeaders(self.__user__)
 
-        url = url_join(configService.getHost(), "api/generic/share-link/email")
+        url = url_join(getHost(self.__user__), "api/generic/share-link/email")
         fields = {"emails": emails, "message": message, "id": self.id}
         r = requests.post(url, json=fields, headers=headers)
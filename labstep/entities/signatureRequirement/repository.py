@@ -30,7 +30,8 @@ def setSignatureRequirement(user,
         **extraParams,
     }
     signature_requirement = entityRepository.newEntity(user, SignatureRequirement, params)
-    update(collaboratorRoleRequirement, { "signature_requirement": signature_requirement })
+    update(collaboratorRoleRequirement, {
+        **collaboratorRoleRequirement.__data__, "signature_requirement": signature_requirement})
     return signature_requirement
 
 
@@ -3,10 +3,10 @@
 # Author: Labstep <dev@labstep.com>
 
 import json
-from labstep.service.config import configService
+from labstep.service.client import getHost
 from labstep.service.helpers import url_join, handleKeyword, getHeaders
 from labstep.entities.tag.model import Tag
-from labstep.service.request import requestService
+from labstep.service.client import getRequestService
 import labstep.generic.entity.repository as entityRepository
 from labstep.constants import UNSPECIFIED
 
@@ -119,14 +119,14 @@ def addTagTo(entity, tag):
 
     headers = getHeaders(entity.__user__)
     url = url_join(
-        configService.getHost(),
+        getHost(entity.__user__),
         "api/generic/",
         entityName,
         str(entity.id),
         tag.__entityName__,
         str(tag.id),
     )
-    response = requestService.put(url, headers=headers)
+    response = getRequestService(entity.__user__).put(url, headers=headers)
     return json.loads(response.content)
 
 
@@ -148,8 +148,17 @@ def tag(entity, name):
     entity
         An object representing the tagged entity.
     """
-    user = entity.__user__
-    type = (entity.__entityName__).replace("-", "_")
+    tag = getOrCreateTag(entity.__user__, name, type(entity))
+
+    return addTagTo(entity, tag)
+
+
+def getOrCreateTag(user, name, entityClass):
+    """
+    Returns the tag called name for entities of entityClass
+    in the active workspace, creating it if none exists.
+    """
+    type = (entityClass.__entityName__).replace("-", "_")
 
     tags = getTags(
         user,
@@ -160,11 +169,9 @@ def tag(entity, name):
     matchingTags = list(filter(lambda x: x.name.lower() == name.lower(), tags))
 
     if len(matchingTags) == 0:
-        tag = newTag(user, name, type=type)
-    else:
-        tag = matchingTags[0]
+        return newTag(user, name, type=type)
 
-    return addTagTo(entity, tag)
+    return matchingTags[0]
 
 
 def editTag(tag, name, extraParams={}):
@@ -189,7 +196,7 @@ def editTag(tag, name, extraParams={}):
 
 def deleteTag(tag):
     headers = getHeaders(tag.__user__)
-    url = url_join(configService.getHost(), "/api/generic/",
+    url = url_join(getHost(tag.__user__), "/api/generic/",
                    Tag.__entityName__, str(tag.id))
-    requestService.delete(url, headers=headers)
+    getRequestService(tag.__user__).delete(url, headers=headers)
     return None
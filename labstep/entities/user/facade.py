@@ -5,6 +5,7 @@
 import os
 import labstep.entities.user.repository as userRepository
 from labstep.constants import UNSPECIFIED
+from labstep.service.config import configService
 
 
 def newUser(
@@ -18,7 +19,7 @@ def newUser(
     )
 
 
-def authenticate(username=UNSPECIFIED, apikey=UNSPECIFIED):
+def authenticate(username=UNSPECIFIED, apikey=UNSPECIFIED, client=UNSPECIFIED):
     """
     Returns an authenticated Labstep User object to allow
     you to interact with the Labstep API.
@@ -29,6 +30,9 @@ def authenticate(username=UNSPECIFIED, apikey=UNSPECIFIED):
         Your Labstep username.
     apikey (str)
         An apikey for the user.
+    client (:class:`~labstep.service.client.Client`)
+        Optionally a Client with its own connection pool
+        to make this user's requests through.
 
     Returns
     -------
@@ -44,9 +48,10 @@ def authenticate(username=UNSPECIFIED, apikey=UNSPECIFIED):
         user = labstep.authenticate('myaccount@labstep.com', 'MY_API_KEY')
     """
     if (apikey is UNSPECIFIED):
+        configService.load()
         apikey = os.environ['LABSTEP_API_KEY']
 
-    return userRepository.authenticate(username, apikey)
+    return userRepository.authenticate(username, apikey, client=client)
 
 
 def login(username, password):
@@ -77,5 +82,5 @@ def login(username, password):
     return userRepository.login(username, password)
 
 
-def impersonate(username, apikey):
-    return userRepository.impersonate(username, apikey)
+def impersonate(username, apikey, client=UNSPECIFIED):
+    return userRepository.impersonate(username, apikey, client=client)
@@ -4,9 +4,9 @@
 
 from deprecated import deprecated
 from labstep.generic.entity.model import Entity
-from labstep.service.config import configService
+from labstep.service.client import getHost
 from labstep.service.helpers import url_join, getHeaders
-from labstep.service.request import requestService
+from labstep.service.client import getRequestService
 from labstep.constants import UNSPECIFIED
 
 
@@ -29,6 +29,8 @@ class User(Entity):
         super().__init__(data, self)
         self.__user__ = adminUser if adminUser is not UNSPECIFIED else self
         self._activeWorkspace = getattr(self.__data__, 'group', None)
+        self._entityCache = getattr(self, '_entityCache', None)
+        self.__client__ = getattr(self, '__client__', None)
 
     @property
     def activeWorkspace(self):
@@ -47,12 +49,12 @@ class User(Entity):
     def update(self):
         import json
         from labstep.service.helpers import url_join, update
-        from labstep.service.config import configService
-        from labstep.service.request import requestService
+        from labstep.service.client import getHost
+        from labstep.service.client import getRequestService
 
         headers = getHeaders(self)
-        url = url_join(configService.getHost(), "api/generic/user/info")
-        response = requestService.get(url, headers=headers)
+        url = url_join(getHost(self), "api/generic/user/info")
+        response = getRequestService(self).get(url, headers=headers)
         data = json.loads(response.content)
         update(self, data)
         return self
@@ -83,6 +85,56 @@ class User(Entity):
 
         self._activeWorkspace = workspace_id
 
+    def enableEntityCache(self, ttl=300, max_size=1000):
+        """
+        Cache entities fetched by id / guid for this user so repeated
+        lookups of the same entity don't go back to the server.
+
+        The cache is cleared after every request that writes to
+        Labstep, entries expire after `ttl` seconds and `update()`
+        always fetches the entity from the server.
+
+        Parameters
+        ----------
+        ttl (int)
+            How long in seconds a cached entity stays valid.
+        max_size (int)
+            The maximum number of cached entities, the least recently
+            used are evicted first.
+
+        Returns
+        -------
+        :class:`~labstep.service.entityCache.EntityCache`
+            The cache, which keeps `hits` and `misses` counters.
+
+        Example
+        -------
+        ::
+
+            cache = user.enableEntityCache(ttl=600)
+            user.getExperiment(17000)
+            user.getExperiment(17000)
+            print(cache.getStats())
+        """
+        from labstep.service.entityCache import EntityCache
+        from labstep.service.client import getRequestService
+
+        self.disableEntityCache()
+        self._entityCache = EntityCache(ttl=ttl, maxSize=max_size)
+        getRequestService(self).addHook(self._entityCache)
+        return self._entityCache
+
+    def disableEntityCache(self):
+        """
+        Stop caching entities for this user and discard the cache.
+        """
+        from labstep.service.client import getRequestService
+
+        requestService = getRequestService(self)
+        if self._entityCache in requestService.hooks:
+            requestService.removeHook(self._entityCache)
+        self._entityCache = None
+
     # getSingle()
     def getExperiment(self, experiment_id):
         """
@@ -364,6 +416,8 @@ class User(Entity):
         tag_id=UNSPECIFIED,
         collection_id=UNSPECIFIED,
         extraParams={},
+        page_size=UNSPECIFIED,
+        serializer_groups=UNSPECIFIED,
     ):
         """
         Retrieve a list of a User's Experiments
@@ -386,6 +440,11 @@ class User(Entity):
             The id of a tag to filter by.
         collection_id (int)
             Get experiments in this collection.
+        page_size (int)
+            The number of Experiments requested per page (defaults to 50).
+        serializer_groups (str or list)
+            The serializer groups to request, for example 'default'.
+            Requesting fewer groups returns smaller payloads.
 
         Returns
         -------
@@ -411,6 +470,8 @@ class User(Entity):
             created_at_to=created_at_to,
             tag_id=tag_id,
             collection_id=collection_id,
+            page_size=page_size,
+            serializer_groups=serializer_groups,
             extraParams=extraParams,
         )
 
@@ -423,6 +484,8 @@ class User(Entity):
         tag_id=UNSPECIFIED,
         collection_id=UNSPECIFIED,
         extraParams={},
+        page_size=UNSPECIFIED,
+        serializer_groups=UNSPECIFIED,
     ):
         """
         Retrieve a list of a User's Protocols
@@ -445,6 +508,11 @@ class User(Entity):
             The id of a tag to filter by.
         collection_id (int)
             Get protocols in this collection.
+        page_size (int)
+            The number of Protocols requested per page (defaults to 50).
+        serializer_groups (str or list)
+            The serializer groups to request, for example 'default'.
+            Requesting fewer groups returns smaller payloads.
 
         Returns
         -------
@@ -470,10 +538,12 @@ class User(Entity):
             created_at_to=created_at_to,
             tag_id=tag_id,
             collection_id=collection_id,
+            page_size=page_size,
+            serializer_groups=serializer_groups,
             extraParams=extraParams,
         )
 
-    def getResources(self, count=UNSPECIFIED, search_query=UNSPECIFIED, resource_category_id=UNSPECIFIED, tag_id=UNSPECIFIED, extraParams={}):
+    def getResources(self, count=UNSPECIFIED, search_query=UNSPECIFIED, resource_category_id=UNSPECIFIED, tag_id=UNSPECIFIED, extraParams={}, page_size=UNSPECIFIED, serializer_groups=UNSPECIFIED):
         """
         Retrieve a list of a User's Resources
         across all Workspaces on Labstep,
@@ -489,6 +559,11 @@ class User(Entity):
             Search for Resources in a particular category.
         tag_id (int)
             The id of a tag to filter by.
+        page_size (int)
+            The number of Resources requested per page (defaults to 50).
+        serializer_groups (str or list)
+            The serializer groups to request, for example 'default'.
+            Requesting fewer groups returns smaller payloads.
 
         Returns
         -------
@@ -511,6 +586,8 @@ class User(Entity):
             search_query=search_query,
             tag_id=tag_id,
             resource_category_id=resource_category_id,
+            page_size=page_size,
+            serializer_groups=serializer_groups,
             extraParams=extraParams,
         )
 
@@ -582,7 +659,7 @@ class User(Entity):
             self, count=count, search_query=search_query, extraParams=extraParams
         )
 
-    def getResourceItems(self, count=UNSPECIFIED, search_query=UNSPECIFIED, extraParams={}):
+    def getResourceItems(self, count=UNSPECIFIED, search_query=UNSPECIFIED, extraParams={}, page_size=UNSPECIFIED, serializer_groups=UNSPECIFIED):
         """
         Retrieve a list of a user's ResourceItems on Labstep,
         which can be filtered using the parameters:
@@ -593,6 +670,11 @@ class User(Entity):
             The number of ResourceItems to retrieve.
         search_query (str)
             Search for ResourceItems with this 'name'.
+        page_size (int)
+            The number of ResourceItems requested per page (defaults to 50).
+        serializer_groups (str or list)
+            The serializer groups to request, for example 'default'.
+            Requesting fewer groups returns smaller payloads.
 
         Returns
         -------
@@ -608,7 +690,7 @@ class User(Entity):
         import labstep.entities.resourceItem.repository as resourceItemRepository
 
         return resourceItemRepository.getResourceItems(
-            self, count=count, search_query=search_query, extraParams=extraParams
+            self, count=count, search_query=search_query, page_size=page_size, serializer_groups=serializer_groups, extraParams=extraParams
         )
 
     def getOrderRequests(
@@ -755,6 +837,211 @@ class User(Entity):
             self, count=count, search_query=search_query, extraParams=extraParams
         )
 
+    # iterMany()
+
+    def iterExperiments(
+        self,
+        count=UNSPECIFIED,
+        search_query=UNSPECIFIED,
+        created_at_from=UNSPECIFIED,
+        created_at_to=UNSPECIFIED,
+        tag_id=UNSPECIFIED,
+        collection_id=UNSPECIFIED,
+        prefetch=False,
+        extraParams={},
+        page_size=UNSPECIFIED,
+        serializer_groups=UNSPECIFIED,
+    ):
+        """
+        Iterate over Experiments across all Workspaces on Labstep
+        without loading them all into memory.
+
+        Experiments are yielded page by page as the pages arrive,
+        so memory use stays flat regardless of how many there are.
+        Accepts the same filters as getExperiments.
+
+        Parameters
+        ----------
+        count (int)
+            The maximum number of Experiments to yield.
+        prefetch (bool)
+            Fetch the next page in the background while the
+            current one is being processed.
+        page_size (int)
+            The number of Experiments requested per page (defaults to 50).
+        serializer_groups (str or list)
+            The serializer groups to request, for example 'default'.
+            Requesting fewer groups returns smaller payloads.
+
+        Returns
+        -------
+        Iterator[:class:`~labstep.entities.experiment.model.Experiment`]
+            A generator of Labstep Experiments.
+
+        Example
+        -------
+        ::
+
+            for experiment in user.iterExperiments(prefetch=True):
+                print(experiment.name)
+        """
+        import labstep.entities.experiment.repository as experimentRepository
+
+        return experimentRepository.iterExperiments(
+            self,
+            count=count,
+            search_query=search_query,
+            created_at_from=created_at_from,
+            created_at_to=created_at_to,
+            tag_id=tag_id,
+            collection_id=collection_id,
+            prefetch=prefetch,
+            page_size=page_size,
+            serializer_groups=serializer_groups,
+            extraParams=extraParams,
+        )
+
+    def iterProtocols(
+        self,
+        count=UNSPECIFIED,
+        search_query=UNSPECIFIED,
+        created_at_from=UNSPECIFIED,
+        created_at_to=UNSPECIFIED,
+        tag_id=UNSPECIFIED,
+        collection_id=UNSPECIFIED,
+        prefetch=False,
+        extraParams={},
+        page_size=UNSPECIFIED,
+        serializer_groups=UNSPECIFIED,
+    ):
+        """
+        Iterate over Protocols across all Workspaces on Labstep
+        without loading them all into memory.
+        Accepts the same filters as getProtocols.
+
+        Parameters
+        ----------
+        count (int)
+            The maximum number of Protocols to yield.
+        prefetch (bool)
+            Fetch the next page in the background while the
+            current one is being processed.
+        page_size (int)
+            The number of Protocols requested per page (defaults to 50).
+        serializer_groups (str or list)
+            The serializer groups to request, for example 'default'.
+            Requesting fewer groups returns smaller payloads.
+
+        Returns
+        -------
+        Iterator[:class:`~labstep.entities.protocol.model.Protocol`]
+            A generator of Labstep Protocols.
+
+        Example
+        -------
+        ::
+
+            for protocol in user.iterProtocols(search_query='PCR'):
+                print(protocol.name)
+        """
+        import labstep.entities.protocol.repository as protocolRepository
+
+        return protocolRepository.iterProtocols(
+            self,
+            count=count,
+            search_query=search_query,
+            created_at_from=created_at_from,
+            created_at_to=created_at_to,
+            tag_id=tag_id,
+            collection_id=collection_id,
+            prefetch=prefetch,
+            page_size=page_size,
+            serializer_groups=serializer_groups,
+            extraParams=extraParams,
+        )
+
+    def iterResources(self, count=UNSPECIFIED, search_query=UNSPECIFIED, resource_category_id=UNSPECIFIED, tag_id=UNSPECIFIED, prefetch=False, extraParams={}, page_size=UNSPECIFIED, serializer_groups=UNSPECIFIED):
+        """
+        Iterate over Resources across all Workspaces on Labstep
+        without loading them all into memory.
+        Accepts the same filters as getResources.
+
+        Parameters
+        ----------
+        count (int)
+            The maximum number of Resources to yield.
+        prefetch (bool)
+            Fetch the next page in the background while the
+            current one is being processed.
+        page_size (int)
+            The number of Resources requested per page (defaults to 50).
+        serializer_groups (str or list)
+            The serializer groups to request, for example 'default'.
+            Requesting fewer groups returns smaller payloads.
+
+        Returns
+        -------
+        Iterator[:class:`~labstep.entities.resource.model.Resource`]
+            A generator of Labstep Resources.
+
+        Example
+        -------
+        ::
+
+            for resource in user.iterResources(resource_category_id=123):
+                print(resource.name)
+        """
+        import labstep.entities.resource.repository as resourceRepository
+
+        return resourceRepository.iterResources(
+            self,
+            count=count,
+            search_query=search_query,
+            resource_category_id=resource_category_id,
+            tag_id=tag_id,
+            prefetch=prefetch,
+            page_size=page_size,
+            serializer_groups=serializer_groups,
+            extraParams=extraParams,
+        )
+
+    def iterResourceItems(self, count=UNSPECIFIED, search_query=UNSPECIFIED, prefetch=False, extraParams={}, page_size=UNSPECIFIED, serializer_groups=UNSPECIFIED):
+        """
+        Iterate over ResourceItems across all Workspaces on Labstep
+        without loading them all into memory.
+        Accepts the same filters as getResourceItems.
+
+        Parameters
+        ----------
+        count (int)
+            The maximum number of ResourceItems to yield.
+        prefetch (bool)
+            Fetch the next page in the background while the
+            current one is being processed.
+        page_size (int)
+            The number of ResourceItems requested per page (defaults to 50).
+        serializer_groups (str or list)
+            The serializer groups to request, for example 'default'.
+            Requesting fewer groups returns smaller payloads.
+
+        Returns
+        -------
+        Iterator[:class:`~labstep.entities.resourceItem.model.ResourceItem`]
+            A generator of ResourceItem objects.
+
+        Example
+        -------
+        ::
+
+            for item in user.iterResourceItems(prefetch=True):
+                print(item.name)
+        """
+        import labstep.entities.resourceItem.repository as resourceItemRepository
+
+        return resourceItemRepository.iterResourceItems(
+            self, count=count, search_query=search_query, prefetch=prefetch, page_size=page_size, serializer_groups=serializer_groups, extraParams=extraParams
+        )
+
     # newEntity()
 
     def newExperiment(self, name, entry=UNSPECIFIED, template_id=UNSPECIFIED,extraParams={}):
@@ -982,14 +1269,22 @@ class User(Entity):
 
         return workspaceRepository.newWorkspace(self, name, extraParams=extraParams)
 
-    def newFile(self, filepath=UNSPECIFIED, rawData=UNSPECIFIED, extraParams={}):
+    def newFile(self, filepath=UNSPECIFIED, rawData=UNSPECIFIED, extraParams={}, progress=UNSPECIFIED):
         """
         Upload a file to the Labstep entity Data.
 
+        The file is streamed from disk, so memory use
+        does not depend on the size of the file.
+
         Parameters
         ----------
         filepath (str)
             The filepath to the file to attach.
+        rawData (bytes or file)
+            The contents of the file, if not uploading from a filepath.
+        progress (function)
+            Optionally called as progress(bytesSent, totalBytes)
+            while the file uploads.
 
         Example
         -------
@@ -999,7 +1294,43 @@ class User(Entity):
         """
         import labstep.entities.file.repository as fileRepository
 
-        return fileRepository.newFile(self, filepath, rawData=rawData, extraParams=extraParams)
+        return fileRepository.newFile(self, filepath, rawData=rawData, extraParams=extraParams, progress=progress)
+
+    def newFiles(self, filepaths, concurrency=UNSPECIFIED, deduplicate=True, extraParams={}):
+        """
+        Upload several files to the active Workspace at once.
+
+        The contents of each file are hashed locally and files already
+        uploaded to the Workspace from this machine are not uploaded
+        again. The rest are uploaded concurrently.
+
+        Parameters
+        ----------
+        filepaths (list)
+            The paths of the files to upload.
+        concurrency (int)
+            The number of files hashed and uploaded at once, defaults
+            to labstep.config.upload.uploadWorkers.
+        deduplicate (bool)
+            Skip files whose contents were already uploaded with the same
+            extraParams. The index of uploaded files is kept for each host,
+            user and Workspace in labstep.config.upload.fileIndexPath.
+
+        Returns
+        -------
+        List[:class:`~labstep.entities.file.model.File`]
+            The Files, in the same order as filepaths.
+
+        Example
+        -------
+        ::
+
+            files = user.newFiles(glob.glob('/plate-reader/output/*.csv'), concurrency=8)
+        """
+        import labstep.entities.file.repository as fileRepository
+
+        return fileRepository.newFiles(
+            self, filepaths, concurrency=concurrency, deduplicate=deduplicate, extraParams=extraParams)
 
     def newCollection(self, name, type="experiment", extraParams={}):
         """
@@ -1056,9 +1387,9 @@ class User(Entity):
         """
         # FIXME Refactor
         headers = getHeaders(self)
-        url = url_join(configService.getHost(), "/api/generic/",
+        url = url_join(getHost(self), "/api/generic/",
                        "share-link", 'accept', token)
-        requestService.post(url, headers=headers)
+        getRequestService(self).post(url, headers=headers)
         return None
 
     def getJupyterInstance(self, jupyterInstanceGuid):
@@ -7,14 +7,16 @@ from labstep.constants import UNSPECIFIED
 from labstep.entities.user.model import User
 from labstep.service.config import configService
 from labstep.service.helpers import url_join
-from labstep.service.request import requestService
+from labstep.service.client import getClient
 
 
-def getUser(username, apikey):
-    url = url_join(configService.getHost(), f"api/generic/user/{username}")
-    response = requestService.get(url, headers={"apikey": apikey})
-    user = json.loads(response.content)
-    return User(user)
+def getUser(username, apikey, client=UNSPECIFIED):
+    client = getClient() if client is UNSPECIFIED else client
+    url = url_join(client.host, f"api/generic/user/{username}")
+    response = client.requestService.get(url, headers={"apikey": apikey})
+    user = User(json.loads(response.content))
+    user.__client__ = client
+    return user
 
 
 def newUser(
@@ -38,22 +40,27 @@ def newUser(
     params = dict(
         filter(lambda field: field[1] is not UNSPECIFIED, params.items()))
 
-    response = requestService.post(url=url, json=params, headers=None)
+    response = getClient().requestService.post(url=url, json=params, headers=None)
     return User(json.loads(response.content))
 
 
-def authenticate(username, apikey):
-    url = url_join(configService.getHost(), "api/generic/user/info")
-    response = requestService.get(url, headers={"apikey": apikey})
+def authenticate(username, apikey, client=UNSPECIFIED):
+    client = getClient() if client is UNSPECIFIED else client
+    url = url_join(client.host, "api/generic/user/info")
+    response = client.requestService.get(url, headers={"apikey": apikey})
     user = json.loads(response.content)
     user["api_key"] = apikey
-    return User(user)
+    user = User(user)
+    user.__client__ = client
+    return user
 
-def authenticateWithToken(token):
-    url = url_join(configService.getHost(), "api/generic/user/info")
-    response = requestService.get(url, headers={"Authorization": f"Bearer {token}"})
-    user = json.loads(response.content)
-    return User(user)
+def authenticateWithToken(token, client=UNSPECIFIED):
+    client = getClient() if client is UNSPECIFIED else client
+    url = url_join(client.host, "api/generic/user/info")
+    response = client.requestService.get(url, headers={"Authorization": f"Bearer {token}"})
+    user = User(json.loads(response.content))
+    user.__client__ = client
+    return user
 
 
 def login(username, password):
@@ -61,14 +68,14 @@ def login(username, password):
         'Login via password has been deprecated. Please use labstep.authenticate with an API key instead.')
     params = {"username": username, "password": password}
     url = url_join(configService.getHost(), "/public-api/user/login")
-    response = requestService.post(url=url, json=params, headers={})
+    response = getClient().requestService.post(url=url, json=params, headers={})
     return User(json.loads(response.content))
 
 
-def impersonate(username, apikey):
-    user = getUser(username, apikey)
-    url = url_join(configService.getHost(), "api/generic/token/impersonate")
-    response = requestService.post(
+def impersonate(username, apikey, client=UNSPECIFIED):
+    user = getUser(username, apikey, client=client)
+    url = url_join(user.__client__.host, "api/generic/token/impersonate")
+    response = user.__client__.requestService.post(
         url, json={'guid': user.guid}, headers={"apikey": apikey})
     token = json.loads(response.content)['uuid']
     user.api_key = token
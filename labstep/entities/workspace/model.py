@@ -76,6 +76,8 @@ class Workspace(EntityWithComments):
         tag_id=UNSPECIFIED,
         collection_id=UNSPECIFIED,
         extraParams={},
+        page_size=UNSPECIFIED,
+        serializer_groups=UNSPECIFIED,
     ):
         """
         Retrieve a list of Experiments within this specific Workspace,
@@ -97,6 +99,11 @@ class Workspace(EntityWithComments):
             The id of a tag to filter by.
         collection_id (int)
             Get experiments in this collection.
+        page_size (int)
+            The number of Experiments requested per page (defaults to 50).
+        serializer_groups (str or list)
+            The serializer groups to request, for example 'default'.
+            Requesting fewer groups returns smaller payloads.
 
         Returns
         -------
@@ -124,6 +131,8 @@ class Workspace(EntityWithComments):
             created_at_to=created_at_to,
             tag_id=tag_id,
             collection_id=collection_id,
+            page_size=page_size,
+            serializer_groups=serializer_groups,
             extraParams=extraParams,
         )
 
@@ -136,6 +145,8 @@ class Workspace(EntityWithComments):
         tag_id=UNSPECIFIED,
         collection_id=UNSPECIFIED,
         extraParams={},
+        page_size=UNSPECIFIED,
+        serializer_groups=UNSPECIFIED,
     ):
         """
         Retrieve a list of Protocols within this specific Workspace,
@@ -157,6 +168,11 @@ class Workspace(EntityWithComments):
             The id of a tag to filter by.
         collection_id (int)
             Get protocols in this collection.
+        page_size (int)
+            The number of Protocols requested per page (defaults to 50).
+        serializer_groups (str or list)
+            The serializer groups to request, for example 'default'.
+            Requesting fewer groups returns smaller payloads.
 
         Returns
         -------
@@ -184,10 +200,12 @@ class Workspace(EntityWithComments):
             created_at_to=created_at_to,
             tag_id=tag_id,
             collection_id=collection_id,
+            page_size=page_size,
+            serializer_groups=serializer_groups,
             extraParams=extraParams,
         )
 
-    def getResources(self, count=UNSPECIFIED, search_query=UNSPECIFIED, resource_category_id=UNSPECIFIED, tag_id=UNSPECIFIED, extraParams={}):
+    def getResources(self, count=UNSPECIFIED, search_query=UNSPECIFIED, resource_category_id=UNSPECIFIED, tag_id=UNSPECIFIED, extraParams={}, page_size=UNSPECIFIED, serializer_groups=UNSPECIFIED):
         """
         Retrieve a list of Resources within this specific Workspace,
         which can be filtered using the parameters:
@@ -202,6 +220,11 @@ class Workspace(EntityWithComments):
             Search for Resources in a particular category.
         tag_id (int)
             The id of a tag to filter by.
+        page_size (int)
+            The number of Resources requested per page (defaults to 50).
+        serializer_groups (str or list)
+            The serializer groups to request, for example 'default'.
+            Requesting fewer groups returns smaller payloads.
 
         Returns
         -------
@@ -220,7 +243,7 @@ class Workspace(EntityWithComments):
         extraParams = {"group_id": self.id, **extraParams}
 
         return resourceRepository.getResources(
-            self.__user__, count=count, search_query=search_query, resource_category_id=resource_category_id, tag_id=tag_id, extraParams=extraParams
+            self.__user__, count=count, search_query=search_query, resource_category_id=resource_category_id, tag_id=tag_id, page_size=page_size, serializer_groups=serializer_groups, extraParams=extraParams
         )
 
     def getResourceCategorys(
@@ -291,7 +314,7 @@ class Workspace(EntityWithComments):
             self.__user__, count, search_query, extraParams=extraParams
         )
 
-    def getResourceItems(self, count=UNSPECIFIED, search_query=UNSPECIFIED, extraParams={}):
+    def getResourceItems(self, count=UNSPECIFIED, search_query=UNSPECIFIED, extraParams={}, page_size=UNSPECIFIED, serializer_groups=UNSPECIFIED):
         """
         Retrieve a list of ResourceItems in a workspace on Labstep.
 
@@ -301,6 +324,11 @@ class Workspace(EntityWithComments):
             The number of ResourceItems to retrieve.
         search_query (str)
             Search for ResourceItems with this 'name'.
+        page_size (int)
+            The number of ResourceItems requested per page (defaults to 50).
+        serializer_groups (str or list)
+            The serializer groups to request, for example 'default'.
+            Requesting fewer groups returns smaller payloads.
 
         Returns
         -------
@@ -317,7 +345,7 @@ class Workspace(EntityWithComments):
         extraParams = {"group_id": self.id, **extraParams}
 
         return resourceItemRepository.getResourceItems(
-            self.__user__, count=count, search_query=search_query, extraParams=extraParams
+            self.__user__, count=count, search_query=search_query, page_size=page_size, serializer_groups=serializer_groups, extraParams=extraParams
         )
 
     def getOrderRequests(
@@ -544,6 +572,298 @@ class Workspace(EntityWithComments):
             self.__user__, count, search_query, extraParams=extraParams
         )
 
+    # iterMany()
+
+    def iterExperiments(
+        self,
+        count=UNSPECIFIED,
+        search_query=UNSPECIFIED,
+        created_at_from=UNSPECIFIED,
+        created_at_to=UNSPECIFIED,
+        tag_id=UNSPECIFIED,
+        collection_id=UNSPECIFIED,
+        prefetch=False,
+        extraParams={},
+        page_size=UNSPECIFIED,
+        serializer_groups=UNSPECIFIED,
+    ):
+        """
+        Iterate over Experiments within this specific Workspace
+        without loading them all into memory.
+
+        Experiments are yielded page by page as the pages arrive,
+        so memory use stays flat regardless of how many there are.
+        Accepts the same filters as getExperiments.
+
+        Parameters
+        ----------
+        count (int)
+            The maximum number of Experiments to yield.
+        prefetch (bool)
+            Fetch the next page in the background while the
+            current one is being processed.
+        page_size (int)
+            The number of Experiments requested per page (defaults to 50).
+        serializer_groups (str or list)
+            The serializer groups to request, for example 'default'.
+            Requesting fewer groups returns smaller payloads.
+
+        Returns
+        -------
+        Iterator[:class:`~labstep.entities.experiment.model.Experiment`]
+            A generator of Labstep Experiments.
+
+        Example
+        -------
+        ::
+
+            for experiment in workspace.iterExperiments(prefetch=True):
+                print(experiment.name)
+        """
+        import labstep.entities.experiment.repository as experimentRepository
+
+        extraParams = {"group_id": self.id, **extraParams}
+
+        return experimentRepository.iterExperiments(
+            self.__user__,
+            count=count,
+            search_query=search_query,
+            created_at_from=created_at_from,
+            created_at_to=created_at_to,
+            tag_id=tag_id,
+            collection_id=collection_id,
+            prefetch=prefetch,
+            page_size=page_size,
+            serializer_groups=serializer_groups,
+            extraParams=extraParams,
+        )
+
+    def iterProtocols(
+        self,
+        count=UNSPECIFIED,
+        search_query=UNSPECIFIED,
+        created_at_from=UNSPECIFIED,
+        created_at_to=UNSPECIFIED,
+        tag_id=UNSPECIFIED,
+        collection_id=UNSPECIFIED,
+        prefetch=False,
+        extraParams={},
+        page_size=UNSPECIFIED,
+        serializer_groups=UNSPECIFIED,
+    ):
+        """
+        Iterate over Protocols within this specific Workspace
+        without loading them all into memory.
+        Accepts the same filters as getProtocols.
+
+        Parameters
+        ----------
+        count (int)
+            The maximum number of Protocols to yield.
+        prefetch (bool)
+            Fetch the next page in the background while the
+            current one is being processed.
+        page_size (int)
+            The number of Protocols requested per page (defaults to 50).
+        serializer_groups (str or list)
+            The serializer groups to request, for example 'default'.
+            Requesting fewer groups returns smaller payloads.
+
+        Returns
+        -------
+        Iterator[:class:`~labstep.entities.protocol.model.Protocol`]
+            A generator of Labstep Protocols.
+
+        Example
+        -------
+        ::
+
+            for protocol in workspace.iterProtocols(search_query='PCR'):
+                print(protocol.name)
+        """
+        import labstep.entities.protocol.repository as protocolRepository
+
+        extraParams = {"group_id": self.id, **extraParams}
+
+        return protocolRepository.iterProtocols(
+            self.__user__,
+            count=count,
+            search_query=search_query,
+            created_at_from=created_at_from,
+            created_at_to=created_at_to,
+            tag_id=tag_id,
+            collection_id=collection_id,
+            prefetch=prefetch,
+            page_size=page_size,
+            serializer_groups=serializer_groups,
+            extraParams=extraParams,
+        )
+
+    def iterResources(self, count=UNSPECIFIED, search_query=UNSPECIFIED, resource_category_id=UNSPECIFIED, tag_id=UNSPECIFIED, prefetch=False, extraParams={}, page_size=UNSPECIFIED, serializer_groups=UNSPECIFIED):
+        """
+        Iterate over Resources within this specific Workspace
+        without loading them all into memory.
+        Accepts the same filters as getResources.
+
+        Parameters
+        ----------
+        count (int)
+            The maximum number of Resources to yield.
+        prefetch (bool)
+            Fetch the next page in the background while the
+            current one is being processed.
+        page_size (int)
+            The number of Resources requested per page (defaults to 50).
+        serializer_groups (str or list)
+            The serializer groups to request, for example 'default'.
+            Requesting fewer groups returns smaller payloads.
+
+        Returns
+        -------
+        Iterator[:class:`~labstep.entities.resource.model.Resource`]
+            A generator of Labstep Resources.
+
+        Example
+        -------
+        ::
+
+            for resource in workspace.iterResources(resource_category_id=123):
+                print(resource.name)
+        """
+        import labstep.entities.resource.repository as resourceRepository
+
+        extraParams = {"group_id": self.id, **extraParams}
+
+        return resourceRepository.iterResources(
+            self.__user__,
+            count=count,
+            search_query=search_query,
+            resource_category_id=resource_category_id,
+            tag_id=tag_id,
+            prefetch=prefetch,
+            page_size=page_size,
+            serializer_groups=serializer_groups,
+            extraParams=extraParams,
+        )
+
+    def iterResourceItems(self, count=UNSPECIFIED, search_query=UNSPECIFIED, prefetch=False, extraParams={}, page_size=UNSPECIFIED, serializer_groups=UNSPECIFIED):
+        """
+        Iterate over ResourceItems within this specific Workspace
+        without loading them all into memory.
+        Accepts the same filters as getResourceItems.
+
+        Parameters
+        ----------
+        count (int)
+            The maximum number of ResourceItems to yield.
+        prefetch (bool)
+            Fetch the next page in the background while the
+            current one is being processed.
+        page_size (int)
+            The number of ResourceItems requested per page (defaults to 50).
+        serializer_groups (str or list)
+            The serializer groups to request, for example 'default'.
+            Requesting fewer groups returns smaller payloads.
+
+        Returns
+        -------
+        Iterator[:class:`~labstep.entities.resourceItem.model.ResourceItem`]
+            A generator of ResourceItem objects.
+
+        Example
+        -------
+        ::
+
+            for item in workspace.iterResourceItems(prefetch=True):
+                print(item.name)
+        """
+        import labstep.entities.resourceItem.repository as resourceItemRepository
+
+        extraParams = {"group_id": self.id, **extraParams}
+
+        return resourceItemRepository.iterResourceItems(
+            self.__user__, count=count, search_query=search_query, prefetch=prefetch, page_size=page_size, serializer_groups=serializer_groups, extraParams=extraParams
+        )
+
+    # export()
+
+    def exportExperiments(self, root_path, incremental=False, verify=False, workers=UNSPECIFIED, extraParams={}):
+        """
+        Export all the Experiments in this Workspace to a folder.
+
+        A manifest (labstep-manifest.json) recording the updated_at and
+        file hashes of every exported Experiment is kept in the folder.
+        In incremental mode Experiments that have not changed since the
+        last export are skipped, and the folders of deleted Experiments
+        are removed (unless extraParams filter the listing, as the
+        Experiments left out may not have been deleted). Each Experiment
+        is exported to a staging folder and only replaces the previous
+        copy once its export has succeeded.
+
+        Parameters
+        ----------
+        root_path (str)
+            The path to the folder to export to.
+        incremental (bool)
+            Only export Experiments that changed since the last export.
+        verify (bool)
+            When exporting incrementally, also check the hashes of
+            previously exported files and re-export on any mismatch.
+        workers (int)
+            The number of parallel exports, defaults to
+            labstep.config.export.exportWorkers.
+
+        Example
+        -------
+        ::
+
+            workspace = user.getWorkspace(17000)
+            workspace.exportExperiments('/backups/experiments', incremental=True)
+        """
+        import labstep.entities.workspace.repository as workspaceRepository
+        from labstep.entities.experiment.model import Experiment
+
+        return workspaceRepository.exportWorkspaceEntities(
+            self.iterExperiments(prefetch=True, extraParams=extraParams),
+            root_path, Experiment.__entityName__, incremental=incremental, verify=verify,
+            workers=workers, removeMissing=not extraParams
+        )
+
+    def exportProtocols(self, root_path, incremental=False, verify=False, workers=UNSPECIFIED, extraParams={}):
+        """
+        Export all the Protocols in this Workspace to a folder.
+
+        Works like exportExperiments, including the incremental mode.
+
+        Parameters
+        ----------
+        root_path (str)
+            The path to the folder to export to.
+        incremental (bool)
+            Only export Protocols that changed since the last export.
+        verify (bool)
+            When exporting incrementally, also check the hashes of
+            previously exported files and re-export on any mismatch.
+        workers (int)
+            The number of parallel exports, defaults to
+            labstep.config.export.exportWorkers.
+
+        Example
+        -------
+        ::
+
+            workspace = user.getWorkspace(17000)
+            workspace.exportProtocols('/backups/protocols', incremental=True)
+        """
+        import labstep.entities.workspace.repository as workspaceRepository
+        from labstep.entities.protocol.model import Protocol
+
+        return workspaceRepository.exportWorkspaceEntities(
+            self.iterProtocols(prefetch=True, extraParams=extraParams),
+            root_path, Protocol.__entityName__, incremental=incremental, verify=verify,
+            workers=workers, removeMissing=not extraParams
+        )
+
     def sendInvites(self, emails, message):
         """
         Send invites to a Labstep Workspace via email.
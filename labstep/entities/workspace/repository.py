@@ -2,8 +2,13 @@
 # -*- coding: utf-8 -*-
 # Author: Labstep <dev@labstep.com>
 
+import shutil
+from pathlib import Path
+from pathvalidate import sanitize_filepath
 from labstep.entities.workspace.model import Workspace
 import labstep.generic.entity.repository as entityRepository
+import labstep.service.taskGraph as taskGraph
+from labstep.service.exportManifest import ExportManifest, STAGING_NAME
 from labstep.constants import UNSPECIFIED
 
 
@@ -24,3 +29,61 @@ def newWorkspace(user, name, extraParams={}):
 def editWorkspace(workspace, name=UNSPECIFIED, deleted_at=UNSPECIFIED, extraParams={}):
     params = {"name": name, "deleted_at": deleted_at, **extraParams}
     return entityRepository.editEntity(workspace, params)
+
+
+def exportWorkspaceEntities(entities, rootPath, entityName, incremental=False, verify=False,
+                            workers=UNSPECIFIED, removeMissing=True):
+    taskGraph.run(exportWorkspaceEntitiesTree, entities, rootPath, entityName,
+                  incremental, verify, removeMissing, workers=workers)
+
+    # only removed once empty, as other exports may be using it
+    try:
+        Path(rootPath).joinpath(STAGING_NAME).rmdir()
+    except OSError:
+        pass
+
+
+def exportWorkspaceEntitiesTree(entities, rootPath, entityName, incremental, verify, removeMissing):
+    manifest = ExportManifest(rootPath)
+    ids = []
+
+    for entity in entities:
+        ids.append(entity.id)
+        if incremental and manifest.isUnchanged(entity, verify=verify):
+            continue
+        taskGraph.submit(exportWorkspaceEntity, entity, rootPath, manifest)
+
+    # entities missing from the full listing have been deleted on Labstep
+    if incremental and removeMissing:
+        manifest.removeMissing(entityName, ids)
+
+
+def exportWorkspaceEntity(entity, rootPath, manifest):
+    # Exported to a staging folder first, so that if the export
+    # fails the previous copy is left as it was.
+    stagingDir = manifest.getStagingFolder(entity)
+    shutil.rmtree(stagingDir, ignore_errors=True)
+
+    entity.export(stagingDir)
+
+    taskGraph.afterChildren(replaceWorkspaceEntity,
+                            entity, rootPath, stagingDir, manifest)
+
+
+def replaceWorkspaceEntity(entity, rootPath, stagingDir, manifest):
+    folderName = sanitize_filepath(
+        entityRepository.getExportFolderName(entity))
+    entityDir = Path(rootPath).joinpath(folderName)
+
+    previousDir = manifest.getFolder(entity)
+    if previousDir is not None and previousDir != entityDir:
+        shutil.rmtree(previousDir, ignore_errors=True)
+
+    # swap the new copy in, then delete the old one
+    oldDir = stagingDir.joinpath('.previous')
+    if entityDir.exists():
+        entityDir.rename(oldDir)
+    stagingDir.joinpath(folderName).rename(entityDir)
+    shutil.rmtree(stagingDir, ignore_errors=True)
+
+    manifest.record(entity, entityDir)
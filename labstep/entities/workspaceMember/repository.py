@@ -5,8 +5,8 @@
 from labstep.entities.workspaceMember.model import WorkspaceMember
 import labstep.generic.entity.repository as entityRepository
 from labstep.service.helpers import url_join, getHeaders
-from labstep.service.config import configService
-from labstep.service.request import requestService
+from labstep.service.client import getHost
+from labstep.service.client import getRequestService
 from labstep.constants import UNSPECIFIED
 
 
@@ -69,7 +69,7 @@ def setMemberWorkspaceRole(member, workspace_role_name: str):
 
 
 def removeMember(member):
-    url = url_join(configService.getHost(), 'api/generic',
+    url = url_join(getHost(member.__user__), 'api/generic',
                    'user-group', str(member.id))
     headers = getHeaders(member.__user__)
-    return requestService.delete(url, headers)
+    return getRequestService(member.__user__).delete(url, headers)
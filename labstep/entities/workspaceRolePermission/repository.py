@@ -5,9 +5,9 @@
 from labstep.entities.workspaceRolePermission.model import WorkspaceRolePermission
 from labstep.generic.entity.repository import getEntities, newEntity, editEntity, deleteEntity
 from labstep.constants import UNSPECIFIED
-from labstep.service.request import requestService
+from labstep.service.client import getRequestService
 from labstep.service.helpers import url_join, getHeaders, handleString
-from labstep.service.config import configService
+from labstep.service.client import getHost
 import json
 
 
@@ -62,11 +62,11 @@ def setWorkspaceRolePermission(workspaceRole, entityClass, action, permission_se
 
     headers = getHeaders(workspaceRole.__user__)
     url = url_join(
-        configService.getHost(),
+        getHost(workspaceRole.__user__),
         "api/generic/",
         WorkspaceRolePermission.__entityName__,
     )
-    response = requestService.post(url, json=params, headers=headers)
+    response = getRequestService(workspaceRole.__user__).post(url, json=params, headers=headers)
     json_response = json.loads(response.content)
 
     return WorkspaceRolePermission(json_response, workspaceRole.__user__)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+"""
+Asyncio variants of :mod:`labstep.generic.entity.repository`.
+
+These return the same entity classes as their synchronous
+counterparts, so they can be mixed freely. For example::
+
+    import asyncio
+    import labstep.generic.entity.asyncRepository as asyncRepository
+    from labstep.entities.experiment.model import Experiment
+
+    async def main(user, ids):
+        return await asyncio.gather(*[
+            asyncRepository.getEntity(user, Experiment, id) for id in ids
+        ])
+"""
+
+import labstep.generic.entity.repository as entityRepository
+from labstep.service.asyncRequest import asyncRequestService
+
+# Each function runs its synchronous counterpart on the pool of
+# asyncRequestService, so caching, pagination and error handling
+# are shared with labstep.generic.entity.repository.
+
+
+async def getLegacyEntity(user, entityClass, id):
+    return await asyncRequestService.run(
+        entityRepository.getLegacyEntity, user, entityClass, id)
+
+
+async def getEntity(user, entityClass, id, *args, **kwargs):
+    return await asyncRequestService.run(
+        entityRepository.getEntity, user, entityClass, id, *args, **kwargs)
+
+
+async def filterEntities(user, entityClass, filter, *args, **kwargs):
+    return await asyncRequestService.run(
+        entityRepository.filterEntities, user, entityClass, filter, *args, **kwargs)
+
+
+async def getEntities(user, entityClass, count, *args, **kwargs):
+    return await asyncRequestService.run(
+        entityRepository.getEntities, user, entityClass, count, *args, **kwargs)
+
+
+async def getEntityCount(user, entityClass, *args, **kwargs):
+    return await asyncRequestService.run(
+        entityRepository.getEntityCount, user, entityClass, *args, **kwargs)
+
+
+async def newEntity(user, entityClass, fields):
+    return await asyncRequestService.run(
+        entityRepository.newEntity, user, entityClass, fields)
+
+
+async def newEntities(user, entityClass, items):
+    return await asyncRequestService.run(
+        entityRepository.newEntities, user, entityClass, items)
+
+
+async def linkEntities(user, entity1, entity2):
+    return await asyncRequestService.run(
+        entityRepository.linkEntities, user, entity1, entity2)
+
+
+async def editEntity(entity, fields):
+    return await asyncRequestService.run(
+        entityRepository.editEntity, entity, fields)
+
+
+async def deleteEntity(entity):
+    return await asyncRequestService.run(
+        entityRepository.deleteEntity, entity)
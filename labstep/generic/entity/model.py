@@ -9,17 +9,41 @@ from labstep.constants import UNSPECIFIED
 
 
 class Entity:
+    """
+    The fields of an entity are kept once, in the JSON it was
+    fetched with (`__data__`), and looked up when accessed.
+    Attributes set on the entity take precedence over its fields
+    until the entity is next updated.
+    """
+
+    __slots__ = ('__data__', '__user__')
 
     def __init__(self, data, user):
-        self.id = None
         self.__user__ = user
         update(self, data)
 
+    def __getattr__(self, name):
+        # Only called for names not found on the instance or its class.
+        # Dunder lookups (from copy, pickle, etc.) never come from the
+        # JSON, and must not recurse while __data__ is unset.
+        if name.startswith('__'):
+            raise AttributeError(name)
+        data = self.__data__
+        if name in data:
+            return data[name]
+        if name == 'id':
+            return None
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'")
+
+    def __dir__(self):
+        return sorted(set(super().__dir__()) | set(self.__data__))
+
     def __repr__(self):
-        all_attributes = self.__dict__
-        entity_attributes = {
-            k: v for k, v in all_attributes.items() if not (k.startswith("__"))
-        }
+        entity_attributes = {'id': None, **self.__data__}
+        entity_attributes.update({
+            k: v for k, v in getattr(self, '__dict__', {}).items() if not (k.startswith("__"))
+        })
         pp = pprint.PrettyPrinter(indent=1)
         return pp.pformat(entity_attributes)
 
@@ -35,7 +59,7 @@ class Entity:
             type(self), "__hasGuid__", None) else 'id'
 
         data = entityRepository.getEntity(
-            self.__user__, type(self), self[identifier]).__data__
+            self.__user__, type(self), self[identifier], useCache=False).__data__
 
         self.__init__(data, self.__user__)
         return self
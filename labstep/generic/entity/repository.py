@@ -3,20 +3,27 @@
 # Author: Labstep <dev@labstep.com>
 
 import json
+import logging
 from pathlib import Path
 from pathvalidate import sanitize_filepath
 from labstep.entities.export.model import Export
 from labstep.generic.entityList.model import EntityList
-from labstep.service.config import configService
+from labstep.service.client import getHost
 from labstep.service.helpers import (
     filterUnspecified,
     url_join,
     getHeaders,
+    handleSerializerGroups,
 )
-from labstep.service.request import requestService
+from labstep.service.client import getRequestService
+from labstep.service.concurrency import mapConcurrently, prefetchIterator
+from labstep.service.entityCache import getEntityCache, invalidateEntity
 from labstep.config.export import entityNameInFolderName
+import labstep.config.pagination as paginationConfig
 from labstep.constants import UNSPECIFIED
 
+logger = logging.getLogger(__name__)
+
 
 def getEntityProperty(entity, attribute, entityClass=None):
     if attribute not in entity.__data__:
@@ -30,13 +37,13 @@ def getEntityProperty(entity, attribute, entityClass=None):
 
 def getLegacyEntity(user, entityClass, id):
     headers = getHeaders(user=user)
-    url = url_join(configService.getHost(), "/api/generic/",
+    url = url_join(getHost(user), "/api/generic/",
                    entityClass.__entityName__, str(id))
-    response = requestService.get(url, headers=headers)
+    response = getRequestService(user).get(url, headers=headers)
     return entityClass(json.loads(response.content), user)
 
 
-def getEntity(user, entityClass, id, isDeleted="both", useGuid=False, extraParams={}):
+def getEntity(user, entityClass, id, isDeleted="both", useGuid=False, extraParams={}, useCache=True):
     if getattr(entityClass, "__isLegacy__", None):
         return getLegacyEntity(user, entityClass, id)
 
@@ -48,43 +55,92 @@ def getEntity(user, entityClass, id, isDeleted="both", useGuid=False, extraParam
     if not getattr(entityClass, "__noDelete__", None):
         params['is_deleted']=isDeleted
 
+    cache = getEntityCache(user)
+    if cache is not None:
+        variant = tuple(sorted((key, str(value)) for key, value in params.items()
+                               if key not in ('get_single', identifier)))
+        data = cache.get(entityClass.__entityName__, id, variant) if useCache else None
+        if data is not None:
+            return entityClass(data, user)
+
     headers = getHeaders(user=user)
-    url = url_join(configService.getHost(), "/api/generic/",
+    url = url_join(getHost(user), "/api/generic/",
                    entityClass.__entityName__)
-    response = requestService.get(url, headers=headers, params=params)
-    return entityClass(json.loads(response.content), user)
+    response = getRequestService(user).get(url, headers=headers, params=params)
+    data = json.loads(response.content)
+
+    if cache is not None:
+        cache.set(entityClass.__entityName__, data, variant)
+
+    return entityClass(data, user)
+
 
+def filterEntities(user, entityClass, filter, count=UNSPECIFIED, pageSize=UNSPECIFIED, concurrency=UNSPECIFIED, serializerGroups=UNSPECIFIED):
+    if concurrency is UNSPECIFIED:
+        concurrency = paginationConfig.pageConcurrency
+
+    if pageSize is UNSPECIFIED:
+        pageSize = paginationConfig.pageSize
+
+    params = {"serializerGroups": handleSerializerGroups(serializerGroups)}
 
-def filterEntities(user, entityClass, filter, count=UNSPECIFIED, pageSize=50):
-    page = 1
     headers = getHeaders(user=user)
-    url = url_join(configService.getHost(), "/api/generic/",
+    url = url_join(getHost(user), "/api/generic/",
                    entityClass.__entityName__, "filter")
-    #print(f'Fetching page {page}')
-    response = requestService.post(
-        url, headers=headers, json={"filter": filter, "page": page, "skip_total": 1, "count": pageSize, "group_id": user.activeWorkspace})
-
-    content = json.loads(response.content)
-    entities = content['items']
-    entityCount = len(content['items'])
 
-    while (entityCount == pageSize):
-        if count is not UNSPECIFIED and entityCount >= count:
+    def getPage(page):
+        if page > 1:
+            logger.debug('Fetching page %s', page)
+        response = getRequestService(user).post(
+            url, headers=headers, json={"filter": filter, "page": page, "count": pageSize, "skip_total": 1, "group_id": user.activeWorkspace}, params=params)
+        return json.loads(response.content)['items']
+
+    entities = getPage(1)
+    lastPage = entities
+    nextPage = 2
+
+    # Pages are independent, so fetch them in windows of `concurrency`
+    # and stop at the first page that comes back short.
+    while len(lastPage) == pageSize:
+        if count is not UNSPECIFIED and len(entities) >= count:
             break
-        page = page + 1
-        print(f'Fetching page {page}')
-        response = requestService.post(
-            url, headers=headers, json={"filter": filter, "page": page, "count": pageSize, "skip_total": 1, "group_id": user.activeWorkspace})
-        content = json.loads(response.content)
-        entities.extend(content['items'])
-        entityCount = len(content['items'])
+        pages = range(nextPage, nextPage + concurrency)
+        for lastPage in mapConcurrently(getPage, pages, concurrency):
+            entities.extend(lastPage)
+            if len(lastPage) < pageSize:
+                break
+        nextPage += concurrency
 
     return EntityList(entities, entityClass, user)
 
 
-def getEntities(user, entityClass, count, filterParams={}):
+def getEntities(user, entityClass, count, filterParams={}, concurrency=UNSPECIFIED, pageSize=UNSPECIFIED, serializerGroups=UNSPECIFIED):
+    if concurrency is UNSPECIFIED:
+        concurrency = paginationConfig.pageConcurrency
+
+    if concurrency > 1:
+        return getEntitiesConcurrently(
+            user, entityClass, count, filterParams, concurrency,
+            pageSize=pageSize, serializerGroups=serializerGroups)
+
+    items = []
+    for page in getEntityPages(user, entityClass, count, filterParams,
+                               pageSize=pageSize, serializerGroups=serializerGroups):
+        items.extend(page)
+
+    return EntityList(items, entityClass, user)
+
+
+def getEntityPages(user, entityClass, count, filterParams={}, pageSize=UNSPECIFIED, serializerGroups=UNSPECIFIED):
+    """
+    Walks the cursor pagination of a listing, yielding the raw
+    items of each page as soon as it arrives.
+    """
+    if pageSize is UNSPECIFIED:
+        pageSize = paginationConfig.pageSize
+
     countParameter = min(
-        count, 50) if count is not UNSPECIFIED else UNSPECIFIED
+        count, pageSize) if count is not UNSPECIFIED else pageSize
 
     if getattr(entityClass, "__unSearchable__", None):
         searchParams = {"cursor": -1, "count": countParameter}
@@ -92,32 +148,110 @@ def getEntities(user, entityClass, count, filterParams={}):
         searchParams = {"search": 1, "cursor": -1, "count": countParameter}
 
     params = {**searchParams, **filterParams}
+    if serializerGroups is not UNSPECIFIED:
+        params["serializerGroups"] = handleSerializerGroups(serializerGroups)
 
     headers = getHeaders(user=user)
-    url = url_join(configService.getHost(), "/api/generic/",
+    url = url_join(getHost(user), "/api/generic/",
                    entityClass.__entityName__)
-    response = requestService.get(url, params=params, headers=headers)
+    response = getRequestService(user).get(url, params=params, headers=headers)
     resp = json.loads(response.content)
-    items = resp["items"]
+    fetched = len(resp["items"])
+    yield resp["items"]
 
     while resp["next_cursor"] != '-1':
         if count is not UNSPECIFIED:
-            remainingItems = count - len(items)
-            params["count"] = min(remainingItems, 50)
+            remainingItems = count - fetched
+            params["count"] = min(remainingItems, pageSize)
             if remainingItems <= 0:
                 break
 
         params["cursor"] = resp["next_cursor"]
-        response = requestService.get(url, headers=headers, params=params)
+        response = getRequestService(user).get(url, headers=headers, params=params)
         resp = json.loads(response.content)
-        items.extend(resp["items"])
+        fetched += len(resp["items"])
+        yield resp["items"]
 
-    return EntityList(items, entityClass, user)
+
+def iterEntities(user, entityClass, count, filterParams={}, prefetch=False, pageSize=UNSPECIFIED, serializerGroups=UNSPECIFIED):
+    """
+    Lazily iterates over a listing one page at a time,
+    so only the current page is held in memory.
+
+    With prefetch the next page is requested in the background
+    while the current one is being consumed.
+    """
+    pages = getEntityPages(user, entityClass, count, filterParams,
+                           pageSize=pageSize, serializerGroups=serializerGroups)
+
+    if prefetch:
+        pages = prefetchIterator(pages)
+
+    for page in pages:
+        for item in page:
+            yield entityClass(item, user)
+
+
+def getEntitiesConcurrently(user, entityClass, count, filterParams, concurrency, pageSize=UNSPECIFIED, serializerGroups=UNSPECIFIED):
+    """
+    Fetches the pages of a listing in parallel.
+
+    The total is requested up front with getEntityCount, which
+    lets every page be addressed directly instead of waiting on
+    the previous page's cursor.
+
+    This relies on the listing honouring the `page` parameter. The
+    first two pages are fetched before the rest, and if the server
+    returns the same items for both, the listing is walked with its
+    cursor instead.
+    """
+    if pageSize is UNSPECIFIED:
+        pageSize = paginationConfig.pageSize
+
+    total = getEntityCount(user, entityClass, filterParams)
+    if count is not UNSPECIFIED:
+        total = min(total, count)
+
+    searchParams = {} if getattr(
+        entityClass, "__unSearchable__", None) else {"search": 1}
+
+    headers = getHeaders(user=user)
+    url = url_join(getHost(user), "/api/generic/",
+                   entityClass.__entityName__)
+
+    def getPage(page):
+        params = {**searchParams, **filterParams,
+                  "page": page, "count": pageSize}
+        if serializerGroups is not UNSPECIFIED:
+            params["serializerGroups"] = handleSerializerGroups(serializerGroups)
+        response = getRequestService(user).get(url, headers=headers, params=params)
+        return json.loads(response.content)["items"]
+
+    pageCount = -(-total // pageSize)
+    items = getPage(1)
+
+    if pageCount > 1:
+        secondPage = getPage(2)
+        if secondPage and [item.get('id') for item in secondPage] == \
+                [item.get('id') for item in items[:len(secondPage)]]:
+            logger.debug('%s listing ignores page, using its cursor',
+                         entityClass.__entityName__)
+            items = []
+            for page in getEntityPages(user, entityClass, count, filterParams,
+                                       pageSize=pageSize, serializerGroups=serializerGroups):
+                items.extend(page)
+            return EntityList(items, entityClass, user)
+
+        items.extend(secondPage)
+        for pageItems in mapConcurrently(getPage, range(3, pageCount + 1), concurrency):
+            items.extend(pageItems)
+
+    return EntityList(items[:total], entityClass, user)
 
 
 def newEntity(user, entityClass, fields):
     headers = getHeaders(user=user)
-    url = url_join(configService.getHost(), "/api/generic/",
+    url = url_join(getHost(user), "/api/generic/",
                    entityClass.__entityName__)
 
     if "group_id" not in fields and getattr(
@@ -128,29 +262,31 @@ def newEntity(user, entityClass, fields):
     if hasattr(entityClass, '__isTemplate__'):
         fields["is_template"] = 1
 
-    response = requestService.post(url, headers=headers, json=fields)
-    return entityClass(json.loads(response.content), user)
+    response = getRequestService(user).post(url, headers=headers, json=fields)
+    entity = entityClass(json.loads(response.content), user)
+    invalidateEntity(entity)
+    return entity
 
 
 def linkEntities(user, entity1, entity2):
     headers = getHeaders(user)
     url = url_join(
-        configService.getHost(),
+        getHost(user),
         "api/generic/",
         entity1.__entityName__,
         str(entity1.id),
         entity2.__entityName__,
         str(entity2.id),
     )
-    response = requestService.put(url, headers=headers)
+    response = getRequestService(user).put(url, headers=headers)
     return json.loads(response.content)
 
 
 def newEntities(user, entityClass, items):
     headers = getHeaders(user=user)
-    url = url_join(configService.getHost(), "/api/generic/",
+    url = url_join(getHost(user), "/api/generic/",
                    entityClass.__entityName__, "batch")
-    response = requestService.post(
+    response = getRequestService(user).post(
         url, headers=headers, json={"items": items, "group_id": user.activeWorkspace})
     entities = json.loads(response.content)
     return EntityList(entities, entityClass, user)
@@ -161,9 +297,10 @@ def editEntity(entity, fields):
         entity, "__hasGuid__", None) and hasattr(entity, 'guid') else entity.id
 
     headers = getHeaders(entity.__user__)
-    url = url_join(configService.getHost(), "/api/generic/",
+    url = url_join(getHost(entity.__user__), "/api/generic/",
                    entity.__entityName__, str(identifier))
-    response = requestService.put(url, json=fields, headers=headers)
+    response = getRequestService(entity.__user__).put(url, json=fields, headers=headers)
+    invalidateEntity(entity)
     entity.__init__(json.loads(response.content), entity.__user__)
     return entity
 
@@ -173,9 +310,25 @@ def deleteEntity(entity):
         entity, "__hasGuid__", None) and hasattr(entity, 'guid') else entity.id
 
     headers = getHeaders(entity.__user__)
-    url = url_join(configService.getHost(), "/api/generic/",
+    url = url_join(getHost(entity.__user__), "/api/generic/",
                    entity.__entityName__, str(identifier))
-    return requestService.delete(url, headers=headers)
+    response = getRequestService(entity.__user__).delete(url, headers=headers)
+    invalidateEntity(entity)
+    return response
+
+
+def getExportFolderName(entity):
+    if entityNameInFolderName and hasattr(
+            entity, 'name') and entity.name is not None:
+        santitisedName = sanitize_filepath(
+            entity.name.replace('/', ' ').replace('\\', ' '))[:50].strip()
+        folderName = f"{entity.id} - {santitisedName}"
+        if len(folderName) > 255:
+            folderName = str(entity.id)
+    else:
+        folderName = str(entity.id)
+
+    return folderName
 
 
 def exportEntity(entity, rootPath, folderName=UNSPECIFIED):
@@ -183,15 +336,7 @@ def exportEntity(entity, rootPath, folderName=UNSPECIFIED):
     from labstep.entities.file.model import File
 
     if folderName is UNSPECIFIED:
-        if entityNameInFolderName and hasattr(
-                entity, 'name') and entity.name is not None:
-            santitisedName = sanitize_filepath(
-                entity.name.replace('/', ' ').replace('\\', ' '))[:50].strip()
-            folderName = f"{entity.id} - {santitisedName}"
-            if len(folderName) > 255:
-                folderName = str(entity.id)
-        else:
-            folderName = str(entity.id)
+        folderName = getExportFolderName(entity)
 
     entityDir = Path(rootPath).joinpath(sanitize_filepath(folderName))
     entityDir.mkdir(parents=True, exist_ok=True)
@@ -216,7 +361,7 @@ def exportEntity(entity, rootPath, folderName=UNSPECIFIED):
 
 def getEntityCount(user, entityClass, filterParams={}):
     headers = getHeaders(user=user)
-    url = url_join(configService.getHost(), "/api/generic/",
+    url = url_join(getHost(user), "/api/generic/",
                    entityClass.__entityName__)
-    response = requestService.get(url, headers=headers, params={'get_count':1,**filterParams})
+    response = getRequestService(user).get(url, headers=headers, params={'get_count':1,**filterParams})
     return json.loads(response.content)
\ No newline at end of file
@@ -1,11 +1,225 @@
+import threading
+import weakref
+from contextlib import contextmanager
+from labstep.constants import UNSPECIFIED
+
+
+MISSING = object()
+
+# The lists with indexes by id, which are told when one of their
+# entities is updated. Indexes are built and changed under the lock.
+indexedLists = weakref.WeakValueDictionary()
+indexLock = threading.RLock()
+
+
+def getPath(entity, path, default=None):
+    """
+    Returns
+    -------
+        The value at a dotted path such as 'resource.id',
+        or default if any part of it is missing.
+    """
+    value = entity
+    for key in path.split('.'):
+        if value is None:
+            return default
+        if isinstance(value, dict):
+            value = value.get(key, default)
+        else:
+            value = getattr(value, key, default)
+        if value is default:
+            return default
+    return value
+
+
+def isHashable(value):
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
+
+
+@contextmanager
+def updatingIndexes(entity):
+    """
+    Moves an entity updated inside the block to the index
+    entries for its new values, in every list that indexed it.
+    """
+    with indexLock:
+        entityLists = [entityList for entityList in list(indexedLists.values())
+                       if entityList._unindex(entity)]
+        yield
+        for entityList in entityLists:
+            entityList._index(entity)
+
+
+def invalidatesIndexes(method):
+    def wrapper(self, *args, **kwargs):
+        self.reindex()
+        return method(self, *args, **kwargs)
+    wrapper.__name__ = method.__name__
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
 class EntityList(list):
+    """
+    A list of entities that can be searched by any attribute.
+
+    Lookups build a hash index of the attribute the first time it is
+    searched, so repeated lookups take constant time. Indexes are
+    dropped whenever the list is changed. Entities in the list that are
+    updated from Labstep (by edit, update or the bulk operations of any
+    list) are moved to their new place in the indexes. Call
+    :meth:`reindex` after setting the attributes of entities in the
+    list yourself.
+    """
+
     def __init__(self, items, entityClass, user):
         super().__init__(map(lambda x: entityClass(x, user), items))
         self.__searchKey__ = getattr(entityClass, '__searchKey__', 'name')
+        self.__entityClass__ = entityClass
+        self.__user__ = user
+        self.__indexes__ = {}
+        self.__positions__ = {}
+
+    def _getIndex(self, path):
+        return self._getIndexEntry(path)[0]
+
+    def _getIndexEntry(self, path):
+        """
+        Returns
+        -------
+            (index, missing) where index maps each value to the entities
+            with it and missing is the first entity without the attribute.
+        """
+        entry = self.__indexes__.get(path)
+        if entry is None:
+            with indexLock:
+                if not self.__indexes__:
+                    self.__positions__ = {
+                        id(entity): position for position, entity in enumerate(self)}
+                    indexedLists[id(self)] = self
+
+                index = {}
+                missing = None
+                for entity in self:
+                    value = getPath(entity, path, MISSING)
+                    if value is MISSING:
+                        if missing is None:
+                            missing = entity
+                        value = None
+                    # Lists and dicts never equal a hashable key.
+                    if isHashable(value):
+                        index.setdefault(value, []).append(entity)
+                entry = self.__indexes__[path] = (index, missing)
+        return entry
+
+    def _unindex(self, entity):
+        """
+        Removes an entity that is about to be updated from the indexes.
+
+        Returns
+        -------
+        bool
+            True if the entity should be added back with :meth:`_index`.
+        """
+        if id(entity) not in self.__positions__:
+            return False
+
+        # The same entity is in the list more than once.
+        if len(self.__positions__) != len(self):
+            self.reindex()
+            return False
+
+        for path, (index, missing) in list(self.__indexes__.items()):
+            value = getPath(entity, path, MISSING)
+            if value is MISSING:
+                # Finding the next entity without the attribute needs a scan.
+                del self.__indexes__[path]
+            elif isHashable(value):
+                bucket = [other for other in index.get(value, []) if other is not entity]
+                if bucket:
+                    index[value] = bucket
+                else:
+                    index.pop(value, None)
+        return True
+
+    def _index(self, entity):
+        """
+        Adds an entity removed by :meth:`_unindex` back
+        to the indexes once it has been updated.
+        """
+        positions = self.__positions__
+        position = positions[id(entity)]
+
+        for path, (index, missing) in list(self.__indexes__.items()):
+            value = getPath(entity, path, MISSING)
+            if value is MISSING:
+                del self.__indexes__[path]
+            elif isHashable(value):
+                bucket = index.setdefault(value, [])
+                # Keep the matches in the order of the list.
+                at = len(bucket)
+                while at and positions[id(bucket[at - 1])] > position:
+                    at -= 1
+                bucket.insert(at, entity)
+
+    def _fromEntities(self, entities):
+        entityList = EntityList([], self.__entityClass__, self.__user__)
+        list.extend(entityList, entities)
+        return entityList
+
+    def reindex(self):
+        """
+        Drops the indexes, so they are rebuilt on the next lookup.
+        """
+        self.__indexes__ = {}
+        self.__positions__ = {}
+
+    def getAll(self, key, searchKey=None):
+        """
+        Returns every entity whose attribute matches a value.
+        Entities without the attribute match None.
+
+        Parameters
+        ----------
+        key
+            The value to search for.
+        searchKey (str)
+            The attribute to search, which can be a dotted path
+            such as 'resource.id'. Defaults to 'name'.
+
+        Returns
+        -------
+        :class:`~labstep.generic.entityList.model.EntityList`
+            The matching entities, in the order they appear in the list.
+        """
+        searchKey = searchKey or self.__searchKey__
+
+        if not isHashable(key):
+            return self._fromEntities(
+                entity for entity in self if getPath(entity, searchKey) == key)
+
+        return self._fromEntities(self._getIndex(searchKey).get(key, []))
 
     def get(self, key, searchKey=None):
+        """
+        Returns the first entity whose attribute matches a value,
+        see :meth:`getAll`, or None if there is none.
+
+        Raises AttributeError if searchKey is the name of an attribute
+        (not a dotted path) that an entity in the list does not have.
+        """
         searchKey = searchKey or self.__searchKey__
-        hits = [entity for entity in self if getattr(entity, searchKey) == key]
+
+        index, missing = self._getIndexEntry(searchKey)
+        if missing is not None and '.' not in searchKey:
+            # Raises the AttributeError
+            getattr(missing, searchKey)
+
+        hits = index.get(key, []) if isHashable(key) else self.getAll(key, searchKey)
 
         if len(hits) == 0:
             return None
@@ -17,3 +231,186 @@ class EntityList(list):
             print(f'Warning: multiple matches found for "{key}"')
 
             return hits[0]
+
+    def groupBy(self, searchKey):
+        """
+        Groups the entities by the value of an attribute.
+
+        Parameters
+        ----------
+        searchKey (str)
+            The attribute to group by, which can be a dotted path
+            such as 'resource.id'.
+
+        Returns
+        -------
+        dict
+            Maps each value to an EntityList of the entities with it.
+            Entities whose value is a list or dict are left out.
+        """
+        return {value: self._fromEntities(entities)
+                for value, entities in self._getIndex(searchKey).items()}
+
+    def indexBy(self, searchKey):
+        """
+        Maps the value of an attribute to the entity with it.
+
+        Parameters
+        ----------
+        searchKey (str)
+            The attribute to index by, such as 'id' or 'guid'.
+
+        Returns
+        -------
+        dict
+            Maps each value to the first entity with it.
+        """
+        return {value: entities[0]
+                for value, entities in self._getIndex(searchKey).items()}
+
+    def filter(self, function):
+        """
+        Returns
+        -------
+        :class:`~labstep.generic.entityList.model.EntityList`
+            The entities for which function returns True.
+        """
+        return self._fromEntities(entity for entity in self if function(entity))
+
+    def delete(self, concurrency=UNSPECIFIED):
+        """
+        Deletes every entity in the list, several at a time.
+        Failures do not stop the other entities being deleted.
+
+        Parameters
+        ----------
+        concurrency (int)
+            The number of requests to make at once. Defaults
+            to labstep.config.bulk.bulkWorkers.
+
+        Returns
+        -------
+        :class:`~labstep.generic.entityList.repository.BulkResult`
+            The entities that were deleted and those that failed.
+
+        Example
+        -------
+        ::
+
+            experiments = user.getExperiments(search_query='Old')
+            result = experiments.delete()
+            for experiment, error in result.failed:
+                print(experiment.id, error)
+        """
+        import labstep.generic.entityList.repository as entityListRepository
+
+        return entityListRepository.deleteEntities(self, concurrency)
+
+    def edit(self, concurrency=UNSPECIFIED, **fields):
+        """
+        Calls edit with the same fields on every entity in the list,
+        several at a time, see :meth:`delete`.
+
+        Example
+        -------
+        ::
+
+            items = user.getResourceItems(search_query='Buffer')
+            items.edit(status='unavailable')
+        """
+        import labstep.generic.entityList.repository as entityListRepository
+
+        return entityListRepository.editEntities(self, fields, concurrency)
+
+    def addTag(self, name, concurrency=UNSPECIFIED):
+        """
+        Tags every entity in the list, creating the tag
+        if none exists, see :meth:`delete`.
+        """
+        import labstep.generic.entityList.repository as entityListRepository
+
+        return entityListRepository.tagEntities(self, name, concurrency)
+
+    def addToCollection(self, collection_id, concurrency=UNSPECIFIED):
+        """
+        Adds every entity in the list to a collection, see :meth:`delete`.
+        """
+        import labstep.generic.entityList.repository as entityListRepository
+
+        return entityListRepository.addEntitiesToCollection(self, collection_id, concurrency)
+
+    def shareWith(self, workspace_id, permission='view', concurrency=UNSPECIFIED):
+        """
+        Shares every entity in the list with a workspace,
+        see :meth:`delete`.
+
+        Parameters
+        ----------
+        workspace_id (int)
+            The id of the workspace to share with.
+        permission (str)
+            Permission to share with. Can be 'view' or 'edit'.
+        """
+        import labstep.generic.entityList.repository as entityListRepository
+
+        return entityListRepository.shareEntitiesWith(
+            self, workspace_id, permission, concurrency)
+
+    def toDataFrame(self, columns=UNSPECIFIED, parse_dates=True):
+        """
+        Returns a DataFrame with a row for every entity,
+        built from the JSON the entities were fetched with.
+
+        Parameters
+        ----------
+        columns (list or dict)
+            The paths of the fields to include, such as 'name',
+            'resource.name' or 'metadata_thread.metadatas[*].label',
+            or a dict mapping column names to paths.
+            Defaults to every field, with nested objects
+            flattened into dotted columns.
+        parse_dates (bool or list)
+            Columns to parse as dates. True parses every
+            column whose name ends in '_at'. Columns with
+            values that are not dates are left as strings.
+
+        Returns
+        -------
+        pandas.DataFrame
+
+        Example
+        -------
+        ::
+
+            items = user.getResourceItems(count=1000)
+            df = items.toDataFrame(columns=['id', 'name', 'resource.name', 'created_at'])
+        """
+        from labstep.service.entityTable import toDataFrame
+
+        return toDataFrame(self, columns=columns, parseDates=parse_dates)
+
+    def toArrow(self, columns=UNSPECIFIED, parse_dates=True):
+        """
+        Returns a pyarrow Table with a row for every entity,
+        see :meth:`toDataFrame`. Requires the pyarrow package.
+
+        Returns
+        -------
+        pyarrow.Table
+        """
+        from labstep.service.entityTable import toArrow
+
+        return toArrow(self, columns=columns, parseDates=parse_dates)
+
+    append = invalidatesIndexes(list.append)
+    extend = invalidatesIndexes(list.extend)
+    insert = invalidatesIndexes(list.insert)
+    remove = invalidatesIndexes(list.remove)
+    pop = invalidatesIndexes(list.pop)
+    clear = invalidatesIndexes(list.clear)
+    sort = invalidatesIndexes(list.sort)
+    reverse = invalidatesIndexes(list.reverse)
+    __setitem__ = invalidatesIndexes(list.__setitem__)
+    __delitem__ = invalidatesIndexes(list.__delitem__)
+    __iadd__ = invalidatesIndexes(list.__iadd__)
+    __imul__ = invalidatesIndexes(list.__imul__)
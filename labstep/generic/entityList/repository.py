@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+import labstep.config.bulk as bulkConfig
+from labstep.service.concurrency import mapConcurrently
+from labstep.constants import UNSPECIFIED
+
+
+class BulkResult:
+    """
+    The outcome of a bulk operation on an EntityList.
+
+    Attributes
+    ----------
+    succeeded (EntityList)
+        The entities the operation succeeded for.
+    failed (list)
+        (entity, exception) for every entity it failed for.
+    results (list)
+        What the operation returned for each entity,
+        or the exception it raised, in the order of the list.
+    """
+
+    def __init__(self, entityList, outcomes):
+        self.results = [error if error is not None else result
+                        for entity, result, error in outcomes]
+        self.succeeded = entityList._fromEntities(
+            entity for entity, result, error in outcomes if error is None)
+        self.failed = [(entity, error)
+                       for entity, result, error in outcomes if error is not None]
+
+    @property
+    def ok(self):
+        return not self.failed
+
+    def __len__(self):
+        return len(self.results)
+
+    def __repr__(self):
+        return f'BulkResult(succeeded={len(self.succeeded)}, failed={len(self.failed)})'
+
+
+def runOnEntities(entityList, function, concurrency=UNSPECIFIED):
+    """
+    Calls function on every entity of the list from a pool of threads,
+    carrying on past failures.
+
+    Returns
+    -------
+    :class:`~labstep.generic.entityList.repository.BulkResult`
+    """
+    if concurrency is UNSPECIFIED:
+        concurrency = bulkConfig.bulkWorkers
+
+    def attempt(entity):
+        try:
+            return entity, function(entity), None
+        except Exception as e:
+            return entity, None, e
+
+    # Entities updated in place mark the indexes of every list stale.
+    outcomes = mapConcurrently(attempt, entityList, concurrency)
+    return BulkResult(entityList, outcomes)
+
+
+def deleteEntities(entityList, concurrency=UNSPECIFIED):
+    return runOnEntities(entityList, lambda entity: entity.delete(), concurrency)
+
+
+def editEntities(entityList, fields, concurrency=UNSPECIFIED):
+    return runOnEntities(entityList, lambda entity: entity.edit(**fields), concurrency)
+
+
+def tagEntities(entityList, name, concurrency=UNSPECIFIED):
+    import labstep.entities.tag.repository as tagRepository
+
+    if len(entityList) == 0:
+        return BulkResult(entityList, [])
+
+    # Every entity gets the same tag, so it is looked up (or created) once.
+    first = entityList[0]
+    tag = tagRepository.getOrCreateTag(first.__user__, name, type(first))
+
+    return runOnEntities(
+        entityList, lambda entity: tagRepository.addTagTo(entity, tag), concurrency)
+
+
+def addEntitiesToCollection(entityList, collectionId, concurrency=UNSPECIFIED):
+    return runOnEntities(
+        entityList, lambda entity: entity.addToCollection(collectionId), concurrency)
+
+
+def shareEntitiesWith(entityList, workspaceId, permission, concurrency=UNSPECIFIED):
+    return runOnEntities(
+        entityList, lambda entity: entity.shareWith(workspaceId, permission), concurrency)
@@ -9,4 +9,4 @@ from labstep.generic.entityWithAssign.model import EntityWithAssign
 
 
 class EntityPrimary(EntityWithComments, EntityWithSharing, EntityWithTags, EntityWithAssign):
-    pass
+    __slots__ = ()
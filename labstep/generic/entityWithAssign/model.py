@@ -4,6 +4,8 @@ import labstep.entities.collaborator.repository as collaboratorRepository
 
 
 class EntityWithAssign(Entity):
+    __slots__ = ()
+
     def assign(self,user_id,extraParams={}):
         """
         Assign a user to a Labstep Entity as a Collaborator.
@@ -7,6 +7,7 @@ from labstep.constants import UNSPECIFIED
 
 
 class EntityWithComments(Entity):
+    __slots__ = ()
 
     def addComment(self, body, filepath=UNSPECIFIED, extraParams={}):
         """
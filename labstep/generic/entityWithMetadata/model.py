@@ -7,6 +7,8 @@ from labstep.constants import UNSPECIFIED
 
 
 class EntityWithMetadata(Entity):
+    __slots__ = ()
+
     def addMetadata(
         self,
         fieldName,
@@ -6,6 +6,7 @@ from labstep.generic.entity.model import Entity
 
 
 class EntityWithSharing(Entity):
+    __slots__ = ()
     __hasParentGroup__ = True
 
     def getPermissions(self):
@@ -6,6 +6,8 @@ from labstep.generic.entity.model import Entity
 
 
 class EntityWithTags(Entity):
+    __slots__ = ()
+
     def addTag(self, name):
         """
         Add a tag to the Entity (creates a
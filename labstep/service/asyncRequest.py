@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+import labstep.service.request as request
+import labstep.config.session as sessionConfig
+from labstep.constants import UNSPECIFIED
+
+
+class AsyncRequestService:
+    """
+    Asyncio counterpart of :class:`RequestService`.
+
+    Each call is handed to a bounded thread pool so that a single
+    event loop can keep many requests in flight at once, while
+    reusing the session, retries and error handling of the
+    synchronous service.
+
+    By default the pool has as many threads as the session keeps
+    connections (labstep.config.session.poolMaxsize), so requests
+    do not queue for a connection.
+    """
+
+    def __init__(self, concurrency=UNSPECIFIED):
+        self.concurrency = concurrency
+        self._executor = None
+
+    def setConcurrency(self, concurrency):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self.concurrency = concurrency
+
+    def getExecutor(self):
+        if self._executor is None:
+            concurrency = sessionConfig.poolMaxsize \
+                if self.concurrency is UNSPECIFIED else self.concurrency
+            self._executor = ThreadPoolExecutor(
+                max_workers=concurrency, thread_name_prefix='labstep')
+        return self._executor
+
+    async def run(self, method, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.getExecutor(), functools.partial(method, *args, **kwargs))
+
+    async def get(self, url, headers, params=None, useCache=True, stream=False, requestService=UNSPECIFIED):
+        return await self.run(getService(requestService).get, url, headers,
+                              params=params, useCache=useCache, stream=stream)
+
+    async def post(self, url, headers, json=None, files=None, data=None, params=None, requestService=UNSPECIFIED):
+        return await self.run(getService(requestService).post, url, headers,
+                              json=json, files=files, data=data, params=params)
+
+    async def put(self, url, headers, json=None, requestService=UNSPECIFIED):
+        return await self.run(getService(requestService).put, url, headers, json=json)
+
+    async def delete(self, url, headers, json=None, requestService=UNSPECIFIED):
+        return await self.run(getService(requestService).delete, url, headers, json=json)
+
+
+def getService(requestService):
+    return request.requestService if requestService is UNSPECIFIED else requestService
+
+
+asyncRequestService = AsyncRequestService()
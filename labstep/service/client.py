@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+import labstep.service.request as request
+from labstep.service.config import configService
+from labstep.service.request import RequestService, createSession
+from labstep.constants import UNSPECIFIED
+
+
+class Client:
+    """
+    Holds the host, user agent, session, retry policy and HTTP cache
+    a User makes requests with.
+
+    Every Client has its own session and connection pool, so jobs
+    using different Clients do not compete for connections, and Users
+    of Clients with different hosts can be used side by side in one
+    process. A Client can be shared by any number of threads.
+
+    Parameters
+    ----------
+    host (str)
+        The Labstep API to connect to. Defaults to the
+        host set with labstep.service.config.configService.
+    user_agent (str)
+        The User-Agent header to send.
+    pool_connections (int)
+        The number of hosts to keep connection pools for.
+    pool_maxsize (int)
+        The maximum number of connections kept open to each host.
+        Set this to at least the number of threads making requests.
+    timeout (float)
+        Seconds to wait for the server before giving up on a request.
+    max_retries (int)
+        The number of times to retry requests that fail with
+        a server error.
+    keep_alive (bool)
+        Reuse connections between requests.
+
+    Example
+    -------
+    ::
+
+        import labstep
+        from labstep.service.client import Client
+
+        client = Client(pool_maxsize=64, timeout=120)
+        user = labstep.authenticate(apikey='MY_API_KEY', client=client)
+
+        staging = Client(host='https://api-staging.example.com')
+        stagingUser = staging.authenticate(apikey='MY_STAGING_API_KEY')
+    """
+
+    def __init__(self, host=UNSPECIFIED, user_agent=UNSPECIFIED,
+                 pool_connections=UNSPECIFIED, pool_maxsize=UNSPECIFIED,
+                 timeout=UNSPECIFIED, max_retries=UNSPECIFIED, keep_alive=True):
+        self._host = host
+        self._userAgent = user_agent
+        self.requestService = RequestService(createSession(
+            poolConnections=pool_connections, poolMaxsize=pool_maxsize,
+            timeout=timeout, maxRetries=max_retries, keepAlive=keep_alive))
+
+    @property
+    def host(self):
+        return configService.getHost() if self._host is UNSPECIFIED else self._host
+
+    @property
+    def userAgent(self):
+        return configService.getUserAgent() if self._userAgent is UNSPECIFIED else self._userAgent
+
+    def enableCache(self, path=UNSPECIFIED, maxSize=UNSPECIFIED, maxAge=UNSPECIFIED):
+        """
+        Cache the responses to this Client's GET requests on disk,
+        see :meth:`~labstep.service.request.RequestService.enableCache`.
+        """
+        return self.requestService.enableCache(path=path, maxSize=maxSize, maxAge=maxAge)
+
+    def authenticate(self, username=UNSPECIFIED, apikey=UNSPECIFIED):
+        """
+        Returns a User authenticated against this Client's host,
+        whose requests are all made through this Client.
+        """
+        from labstep.entities.user.facade import authenticate
+
+        return authenticate(username, apikey, client=self)
+
+
+class DefaultClient(Client):
+    """
+    The Client used by Users that were not given one,
+    backed by the module level request service.
+    """
+
+    def __init__(self):
+        self._host = UNSPECIFIED
+        self._userAgent = UNSPECIFIED
+
+    @property
+    def requestService(self):
+        return request.requestService
+
+
+defaultClient = DefaultClient()
+
+
+def getClient(user=None):
+    client = getattr(user, '__client__', None)
+    return client if client is not None else defaultClient
+
+
+def getRequestService(user=None):
+    return getClient(user).requestService
+
+
+def getHost(user=None):
+    return getClient(user).host
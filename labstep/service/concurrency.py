@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+def mapConcurrently(function, items, concurrency):
+    """
+    Apply function to each item using a bounded pool of threads.
+
+    Returns
+    -------
+        The results in the same order as items. The first
+        exception raised by a call is re-raised.
+    """
+    items = list(items)
+
+    if concurrency <= 1 or len(items) <= 1:
+        return [function(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(items)),
+                            thread_name_prefix='labstep') as executor:
+        return list(executor.map(function, items))
+
+
+def prefetchIterator(iterator):
+    """
+    Yields from iterator while its next item is
+    produced in a background thread.
+    """
+    iterator = iter(iterator)
+    exhausted = object()
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix='labstep') as executor:
+        future = executor.submit(next, iterator, exhausted)
+        while True:
+            item = future.result()
+            if item is exhausted:
+                return
+            future = executor.submit(next, iterator, exhausted)
+            yield item
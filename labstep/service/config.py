@@ -3,36 +3,123 @@
 # Author: Labstep <dev@labstep.com>
 
 import os
-from dotenv import load_dotenv
-from labstep.constants import VERSION
-
-load_dotenv()
+import threading
+from labstep.constants import VERSION, UNSPECIFIED
 
 
 class ConfigService:
-    host = 'https://api.labstep.com'
+    """
+    The host and user agent used by default, resolved the first time
+    they are needed rather than when labstep is imported.
+
+    On first use the .env file (if any) is loaded into the environment
+    and LABSTEP_API_URL is read. Values set with :func:`configure`,
+    setHost or setUserAgent take precedence over the environment.
+    """
+
+    defaultHost = 'https://api.labstep.com'
 
     def __init__(self):
+        self._host = UNSPECIFIED
+        self._userAgent = UNSPECIFIED
+        self._dotenvPath = UNSPECIFIED
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def load(self):
+        """
+        Loads the .env file and reads the environment, once.
+        """
+        if self._loaded:
+            return
+
+        with self._lock:
+            if self._loaded:
+                return
+
+            from dotenv import load_dotenv
+
+            if self._dotenvPath is UNSPECIFIED:
+                load_dotenv()
+            else:
+                load_dotenv(dotenv_path=self._dotenvPath)
+
+            envApiUrl = os.getenv("LABSTEP_API_URL")
+
+            if self._host is UNSPECIFIED and envApiUrl is not None:
+                self._host = envApiUrl
+                print('Connecting to Labstep API at: ', envApiUrl)
 
-        self.userAgent = f"Python SDK {VERSION}"
-        envApiUrl = os.getenv("LABSTEP_API_URL")
+            self._loaded = True
 
-        if envApiUrl is not None:
-            self.host = envApiUrl
-            print('Connecting to Labstep API at: ', envApiUrl)
+    def reload(self, dotenvPath=UNSPECIFIED):
+        """
+        Reads the .env file and the environment again
+        the next time a setting is needed.
+        """
+        with self._lock:
+            self._dotenvPath = dotenvPath
+            self._loaded = False
+
+    def getEnv(self, name, default=None):
+        """
+        Returns an environment variable, after loading the .env file.
+        """
+        self.load()
+        return os.getenv(name, default)
 
     def setHost(self, host):
-        self.host = host
+        self._host = host
         print('Connecting to Labstep API at: ', host)
 
     def getHost(self):
-        return self.host
+        self.load()
+        return self.defaultHost if self._host is UNSPECIFIED else self._host
 
     def setUserAgent(self, userAgent):
-        self.userAgent = userAgent
+        self._userAgent = userAgent
 
     def getUserAgent(self):
-        return self.userAgent
+        if self._userAgent is UNSPECIFIED:
+            return f"Python SDK {VERSION}"
+        return self._userAgent
 
 
 configService = ConfigService()
+
+
+def configure(host=UNSPECIFIED, user_agent=UNSPECIFIED, dotenv_path=UNSPECIFIED):
+    """
+    Sets the defaults used by Users that were not given a
+    :class:`~labstep.service.client.Client` with their own.
+
+    Nothing is read from disk until the first request is made,
+    so this can be called before or instead of loading a .env file.
+
+    Parameters
+    ----------
+    host (str)
+        The Labstep API to connect to. Defaults to
+        the LABSTEP_API_URL environment variable, or
+        https://api.labstep.com if that is not set.
+    user_agent (str)
+        The User-Agent header to send.
+    dotenv_path (str)
+        The .env file to load environment variables from,
+        instead of searching for one from the working directory.
+
+    Example
+    -------
+    ::
+
+        import labstep
+
+        labstep.configure(host='https://api-staging.example.com')
+        user = labstep.authenticate('myaccount@labstep.com', 'MY_API_KEY')
+    """
+    if dotenv_path is not UNSPECIFIED:
+        configService.reload(dotenv_path)
+    if host is not UNSPECIFIED:
+        configService.setHost(host)
+    if user_agent is not UNSPECIFIED:
+        configService.setUserAgent(user_agent)
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+"""
+Streaming downloads of files to disk.
+
+When the server supports `Range` requests the file is split into
+parts of `labstep.config.download.partSize` bytes which are fetched
+concurrently into a `.part` file. The completed parts are recorded in
+a `.part.json` file next to it, so an interrupted download resumes
+where it stopped. Files of a single part, and files from servers that
+do not support `Range`, are streamed in a single request.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+import requests
+import labstep.config.download as downloadConfig
+import labstep.service.request as request
+from labstep.service.request import RequestException
+from labstep.service.concurrency import mapConcurrently
+from labstep.constants import UNSPECIFIED
+
+CHUNK_SIZE = 1024 * 1024  # bytes
+MAX_RETRIES = 5
+
+TRANSIENT_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.ChunkedEncodingError,
+    requests.exceptions.Timeout,
+)
+
+
+class ChecksumError(Exception):
+    def __init__(self, filepath, expected, actual):
+        super().__init__(
+            f"Checksum mismatch for {filepath}: expected {expected}, got {actual}")
+        self.expected = expected
+        self.actual = actual
+
+
+class SignedUrl:
+    """
+    A download URL that can be swapped for a fresh one once it expires.
+    """
+
+    def __init__(self, url, refreshUrl=UNSPECIFIED, requestService=UNSPECIFIED):
+        self.url = url
+        self.refreshUrl = refreshUrl
+        self.requestService = request.requestService \
+            if requestService is UNSPECIFIED else requestService
+        self._lock = threading.Lock()
+
+    def refresh(self, expiredUrl):
+        with self._lock:
+            # Another thread may already have refreshed it.
+            if self.url == expiredUrl:
+                self.url = self.refreshUrl()
+            return self.url
+
+    def open(self, headers):
+        url = self.url
+        try:
+            return self.requestService.get(url, headers=headers, stream=True)
+        except RequestException as e:
+            if e.status_code != 403 or self.refreshUrl is UNSPECIFIED:
+                raise
+            return self.requestService.get(self.refresh(url), headers=headers, stream=True)
+
+
+def getPartPath(filepath):
+    filepath = Path(filepath)
+    return filepath.with_name(filepath.name + '.part')
+
+
+def getStatePath(filepath):
+    filepath = Path(filepath)
+    return filepath.with_name(filepath.name + '.part.json')
+
+
+def getRangeSize(response):
+    """
+    Returns
+    -------
+        The total size of the file from the Content-Range header of a
+        206 response, or None if the server did not honour the Range.
+    """
+    if response.status_code != 206:
+        return None
+    total = response.headers.get('Content-Range', '').rpartition('/')[2]
+    return int(total) if total.isdigit() else None
+
+
+class OrderedDigest:
+    """
+    Hashes the parts of a file as they are written, in whatever order
+    they arrive. Data after the first gap is held in memory until the
+    gap is filled, which is about one part per worker as parts are
+    fetched in order. Parts completed by an earlier, interrupted
+    download are read back from the part file when their turn comes.
+    """
+
+    def __init__(self, algorithm, partPath, onDisk):
+        self.digest = hashlib.new(algorithm)
+        self.partPath = partPath
+        self.onDisk = dict(onDisk)
+        self.position = 0
+        self.pending = {}
+        self._lock = threading.Lock()
+
+    def update(self, position, chunk):
+        with self._lock:
+            self.pending[position] = chunk
+            self._advance()
+
+    def hexdigest(self):
+        with self._lock:
+            self._advance()
+            return self.digest.hexdigest()
+
+    def _advance(self):
+        while True:
+            if self.position in self.pending:
+                chunk = self.pending.pop(self.position)
+                self.digest.update(chunk)
+                self.position += len(chunk)
+            elif self.position in self.onDisk:
+                end = self.onDisk.pop(self.position)
+                with open(self.partPath, 'rb') as f:
+                    f.seek(self.position)
+                    while self.position <= end:
+                        chunk = f.read(min(CHUNK_SIZE, end + 1 - self.position))
+                        self.digest.update(chunk)
+                        self.position += len(chunk)
+            else:
+                return
+
+
+def downloadToPath(url, filepath, headers=None, progress=UNSPECIFIED,
+                   checksum=UNSPECIFIED, algorithm='sha256',
+                   workers=UNSPECIFIED, refreshUrl=UNSPECIFIED,
+                   requestService=UNSPECIFIED):
+    """
+    Streams a file to disk without holding it in memory.
+
+    The data is written to a `.part` file next to the target which is
+    only renamed once the download is complete (and the checksum, if
+    given, matches), so a failed download never leaves a truncated
+    file at the target path.
+
+    Parameters
+    ----------
+    url (str)
+        The URL to download.
+    filepath (str)
+        The path to write the file to.
+    progress (function)
+        Called as progress(bytesDownloaded, totalBytes) as data arrives,
+        possibly from several threads. totalBytes is None if unknown.
+    checksum (str)
+        The expected hex digest of the file.
+    algorithm (str)
+        The hashlib algorithm used for the checksum.
+    workers (int)
+        The number of parts fetched at once, defaults to
+        labstep.config.download.downloadWorkers.
+    refreshUrl (function)
+        Returns a new URL when the current one is rejected
+        with a 403, for example because a signed URL expired.
+    requestService (RequestService)
+        The service to send the requests with.
+
+    Returns
+    -------
+    str
+        The hex digest of the downloaded file.
+    """
+    if workers is UNSPECIFIED:
+        workers = downloadConfig.downloadWorkers
+
+    headers = headers or {}
+    source = SignedUrl(url, refreshUrl, requestService)
+    partPath = getPartPath(filepath)
+
+    try:
+        response = source.open({**headers, 'Range': 'bytes=0-0'})
+    except RequestException as e:
+        # Empty files cannot satisfy any range.
+        if e.status_code != 416:
+            raise
+        response = source.open(headers)
+
+    size = getRangeSize(response)
+
+    if size is not None and size > downloadConfig.partSize:
+        response.close()
+        actual = downloadRanges(source, headers, filepath, size,
+                                response.headers.get('ETag'), progress,
+                                workers, algorithm)
+        getStatePath(filepath).unlink(missing_ok=True)
+    else:
+        # A server that ignores the Range has already sent the whole file.
+        if response.status_code == 206:
+            response.close()
+            response = source.open(headers)
+        getStatePath(filepath).unlink(missing_ok=True)
+        actual = streamToPath(response, partPath, progress, algorithm)
+
+    if checksum is not UNSPECIFIED and actual != checksum.lower():
+        partPath.unlink(missing_ok=True)
+        raise ChecksumError(filepath, checksum, actual)
+
+    os.replace(partPath, filepath)
+    return actual
+
+
+def streamToPath(response, partPath, progress, algorithm):
+    digest = hashlib.new(algorithm)
+
+    try:
+        length = response.headers.get('Content-Length')
+        total = int(length) if length is not None else None
+        downloaded = 0
+
+        with open(partPath, 'wb') as out:
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                out.write(chunk)
+                digest.update(chunk)
+                downloaded += len(chunk)
+                if progress is not UNSPECIFIED:
+                    progress(downloaded, total)
+    except BaseException:
+        partPath.unlink(missing_ok=True)
+        raise
+    finally:
+        response.close()
+
+    return digest.hexdigest()
+
+
+def downloadRanges(source, headers, filepath, size, etag, progress, workers,
+                   algorithm):
+    """
+    Returns
+    -------
+    str
+        The hex digest of the downloaded file.
+    """
+    partPath = getPartPath(filepath)
+    statePath = getStatePath(filepath)
+    partSize = downloadConfig.partSize
+
+    state = None
+    if statePath.exists() and partPath.exists():
+        with open(statePath) as f:
+            state = json.load(f)
+
+    # Start over if the file changed since the partial download.
+    if state is None or state['size'] != size or state['etag'] != etag \
+            or state['partSize'] != partSize:
+        state = {'size': size, 'etag': etag,
+                 'partSize': partSize, 'parts': []}
+        with open(partPath, 'wb') as out:
+            out.truncate(size)
+
+    parts = [
+        (index, start, min(start + partSize, size) - 1)
+        for index, start in enumerate(range(0, size, partSize))
+    ]
+    completed = set(state['parts'])
+    digest = OrderedDigest(algorithm, partPath, [
+        (start, end) for index, start, end in parts if index in completed])
+    lock = threading.Lock()
+    downloaded = sum(end - start + 1
+                     for index, start, end in parts if index in completed)
+
+    def report(length):
+        nonlocal downloaded
+        with lock:
+            downloaded += length
+            done = downloaded
+        if progress is not UNSPECIFIED:
+            progress(done, size)
+
+    def complete(index):
+        with lock:
+            state['parts'].append(index)
+            tmpPath = statePath.with_name(statePath.name + '.tmp')
+            with open(tmpPath, 'w') as out:
+                json.dump(state, out)
+            os.replace(tmpPath, statePath)
+
+    def fetchPart(part):
+        index, start, end = part
+        position = start
+        failures = 0
+
+        with open(partPath, 'r+b') as out:
+            while position <= end:
+                try:
+                    response = source.open(
+                        {**headers, 'Range': f'bytes={position}-{end}'})
+                    try:
+                        if response.status_code != 206:
+                            raise RequestException(
+                                response.status_code, 'Range request was not honoured')
+                        out.seek(position)
+                        for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                            out.write(chunk)
+                            digest.update(position, chunk)
+                            position += len(chunk)
+                            failures = 0
+                            report(len(chunk))
+                        if position <= end:
+                            raise requests.exceptions.ChunkedEncodingError(
+                                'Connection closed before the part was complete')
+                    finally:
+                        response.close()
+                except TRANSIENT_ERRORS:
+                    failures += 1
+                    if failures > MAX_RETRIES:
+                        raise
+
+        complete(index)
+
+    mapConcurrently(fetchPart,
+                    [part for part in parts if part[0] not in completed],
+                    workers)
+
+    return digest.hexdigest()
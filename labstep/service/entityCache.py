@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_TTL = 300  # seconds
+DEFAULT_MAX_SIZE = 1000
+
+
+class EntityCache:
+    """
+    Identity map of entity payloads keyed by entity name and id / guid.
+
+    Entries expire after `ttl` seconds and the least recently used
+    entries are evicted once `maxSize` is reached. Payloads are copied
+    in and out so entities built from the cache can be mutated freely.
+
+    A write can change entities other than the one written, such as
+    the parent of a new comment, so as a request service hook the
+    cache drops every entry after any request that is not a GET.
+    """
+
+    def __init__(self, ttl=DEFAULT_TTL, maxSize=DEFAULT_MAX_SIZE):
+        self.ttl = ttl
+        self.maxSize = maxSize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, entityName, identifier, variant=()):
+        key = (entityName, str(identifier), variant)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry[1])
+
+    def set(self, entityName, data, variant=()):
+        expiresAt = time.monotonic() + self.ttl
+        data = copy.deepcopy(data)
+        with self._lock:
+            for identifier in (data.get('id'), data.get('guid')):
+                if identifier is None:
+                    continue
+                key = (entityName, str(identifier), variant)
+                self._entries[key] = (expiresAt, data)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.maxSize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, entityName, *identifiers):
+        identifiers = {str(identifier)
+                       for identifier in identifiers if identifier is not None}
+        with self._lock:
+            for key in [key for key in self._entries
+                        if key[0] == entityName and key[1] in identifiers]:
+                del self._entries[key]
+
+    def expireAll(self):
+        with self._lock:
+            self._entries.clear()
+
+    def afterRequest(self, event):
+        if event.method != 'GET':
+            self.expireAll()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def getStats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+        }
+
+
+def getEntityCache(user):
+    return getattr(user, '_entityCache', None)
+
+
+def invalidateEntity(entity):
+    cache = getEntityCache(entity.__user__)
+    if cache is not None:
+        cache.invalidate(entity.__entityName__,
+                         entity['id'], entity['guid'])
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+"""
+Builds tables from the JSON of a list of entities.
+
+Columns are read straight from each entity's `__data__` and handed to
+pandas or pyarrow as whole columns. A column is a dotted path into the
+JSON, for example 'resource.name', 'metadata_thread.metadatas[*].label'
+(a list with the label of every metadata) or 'tags[0].name'.
+
+Large listings can be converted a page at a time from the streaming
+iterators, so only one chunk of entities is held in memory::
+
+    from labstep.service.entityTable import iterDataFrames
+
+    for df in iterDataFrames(user.iterResourceItems(), chunkSize=1000):
+        df.to_csv('items.csv', mode='a', index=False)
+"""
+
+import re
+from datetime import datetime
+from itertools import islice
+from labstep.constants import UNSPECIFIED
+
+PATH_TOKEN = re.compile(r'([^.\[\]]+)|\[(\*|-?\d+)\]')
+
+WILDCARD = object()
+
+
+def parsePath(path):
+    """
+    Returns
+    -------
+        The keys and list indexes of a dotted path,
+        with WILDCARD for [*].
+    """
+    keys = []
+    for name, index in PATH_TOKEN.findall(path):
+        if name:
+            keys.append(name)
+        elif index == '*':
+            keys.append(WILDCARD)
+        else:
+            keys.append(int(index))
+    return keys
+
+
+def getValue(data, keys):
+    for i, key in enumerate(keys):
+        if data is None:
+            return None
+        if key is WILDCARD:
+            if not isinstance(data, list):
+                return None
+            rest = keys[i + 1:]
+            return [getValue(item, rest) for item in data]
+        if isinstance(key, int):
+            if not isinstance(data, list) or not -len(data) <= key < len(data):
+                return None
+            data = data[key]
+        elif isinstance(data, dict):
+            data = data.get(key)
+        else:
+            return None
+    return data
+
+
+def getPayload(entity):
+    return entity if isinstance(entity, dict) else entity.__data__
+
+
+def getDefaultPaths(payloads):
+    """
+    Returns
+    -------
+        The path of every field of the payloads, in the order
+        they first appear, with nested objects flattened.
+    """
+    paths = {}
+
+    def addPaths(data, prefix):
+        for key, value in data.items():
+            path = f'{prefix}{key}'
+            if isinstance(value, dict) and value:
+                addPaths(value, f'{path}.')
+            else:
+                paths[path] = None
+
+    for payload in payloads:
+        addPaths(payload, '')
+
+    return list(paths)
+
+
+def parseDateColumn(values):
+    """
+    Returns
+    -------
+    list
+        The values parsed as ISO 8601 dates, or the values as they
+        were if any of them is not a date, so that a column is never
+        a mix of dates and strings.
+    """
+    parsed = []
+    for value in values:
+        if isinstance(value, str):
+            try:
+                value = datetime.fromisoformat(value)
+            except ValueError:
+                return values
+        parsed.append(value)
+    return parsed
+
+
+def getColumns(entities, columns=UNSPECIFIED, parseDates=True):
+    """
+    Returns
+    -------
+    dict
+        Maps each column name to the list of its values.
+
+    Parameters
+    ----------
+    entities (iterable)
+        Entities, or the JSON dicts they were made from.
+    columns (list or dict)
+        The paths of the columns to include, or a dict mapping
+        column names to paths. Defaults to every field, with nested
+        objects flattened into columns such as 'resource.name'.
+    parseDates (bool or list)
+        Columns to parse as ISO 8601 dates. True parses every column
+        whose name ends in '_at'. A column with a value that is not
+        a date is left as it is.
+    """
+    payloads = [getPayload(entity) for entity in entities]
+
+    if columns is UNSPECIFIED:
+        columns = getDefaultPaths(payloads)
+    if not isinstance(columns, dict):
+        columns = {path: path for path in columns}
+
+    if parseDates is True:
+        parseDates = [name for name in columns if name.endswith('_at')]
+    elif not parseDates:
+        parseDates = []
+
+    table = {}
+    for name, path in columns.items():
+        keys = parsePath(path)
+        if len(keys) == 1:
+            key = keys[0]
+            values = [payload.get(key) for payload in payloads]
+        else:
+            values = [getValue(payload, keys) for payload in payloads]
+        if name in parseDates:
+            values = parseDateColumn(values)
+        table[name] = values
+
+    return table
+
+
+def toDataFrame(entities, columns=UNSPECIFIED, parseDates=True):
+    """
+    Returns
+    -------
+    pandas.DataFrame
+        One row per entity, see :func:`getColumns`.
+    """
+    import pandas
+
+    table = getColumns(entities, columns, parseDates)
+    df = pandas.DataFrame(table)
+
+    for name, values in table.items():
+        if df[name].dtype == object and any(isinstance(value, datetime) for value in values):
+            df[name] = pandas.to_datetime(df[name], utc=True)
+
+    return df
+
+
+def toArrow(entities, columns=UNSPECIFIED, parseDates=True):
+    """
+    Returns
+    -------
+    pyarrow.Table
+        One row per entity, see :func:`getColumns`.
+        Requires the pyarrow package.
+    """
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError('toArrow requires pyarrow: pip install pyarrow')
+
+    return pyarrow.Table.from_pydict(getColumns(entities, columns, parseDates))
+
+
+def iterChunks(entities, chunkSize):
+    entities = iter(entities)
+    while True:
+        chunk = list(islice(entities, chunkSize))
+        if not chunk:
+            return
+        yield chunk
+
+
+def iterDataFrames(entities, chunkSize=1000, columns=UNSPECIFIED, parseDates=True):
+    """
+    Yields a DataFrame for every chunkSize entities,
+    for example from `user.iterExperiments()`.
+
+    Without explicit columns, the columns of each chunk
+    are those of the entities in it.
+    """
+    for chunk in iterChunks(entities, chunkSize):
+        yield toDataFrame(chunk, columns, parseDates)
+
+
+def iterRecordBatches(entities, chunkSize=1000, columns=UNSPECIFIED, parseDates=True):
+    """
+    Yields a pyarrow.RecordBatch for every chunkSize entities,
+    for example to write to a parquet file as they are fetched.
+    Pass columns so that every batch has the same schema.
+    """
+    for chunk in iterChunks(entities, chunkSize):
+        for batch in toArrow(chunk, columns, parseDates).to_batches():
+            yield batch
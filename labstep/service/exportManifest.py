@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from pathlib import Path
+
+MANIFEST_NAME = 'labstep-manifest.json'
+STAGING_NAME = '.labstep-staging'
+
+
+def hashFile(path, chunkSize=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunkSize), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ExportManifest:
+    """
+    Records what was exported to a folder, so that later exports
+    can skip entities that have not changed.
+
+    For every entity the manifest keeps its `updated_at`, the folder
+    it was exported to and a sha256 hash of each exported file. Entries
+    are keyed by entity name and id, so several kinds of entity can be
+    exported to the same folder.
+    """
+
+    def __init__(self, rootPath):
+        self.rootPath = Path(rootPath)
+        self.path = self.rootPath.joinpath(MANIFEST_NAME)
+        self._lock = threading.Lock()
+        self.entries = {}
+
+        if self.path.exists():
+            with open(self.path) as f:
+                self.entries = json.load(f)['entities']
+
+    def isUnchanged(self, entity, verify=False):
+        entry = self.entries.get(getKey(entity))
+
+        if entry is None or entry['updated_at'] != entity['updated_at']:
+            return False
+
+        entityDir = self.rootPath.joinpath(entry['folder'])
+
+        for relativePath, fileHash in entry['files'].items():
+            filepath = entityDir.joinpath(relativePath)
+            if not filepath.exists():
+                return False
+            if verify and hashFile(filepath) != fileHash:
+                return False
+
+        return True
+
+    def getFolder(self, entity):
+        entry = self.entries.get(getKey(entity))
+        return None if entry is None else self.rootPath.joinpath(entry['folder'])
+
+    def getStagingFolder(self, entity):
+        """
+        Returns
+        -------
+            The folder an entity is exported to before it replaces
+            the previous copy, inside the root so it can be moved.
+        """
+        return self.rootPath.joinpath(
+            STAGING_NAME, f'{entity.__entityName__}-{entity.id}')
+
+    def record(self, entity, entityDir):
+        entityDir = Path(entityDir)
+        files = {
+            str(filepath.relative_to(entityDir)): hashFile(filepath)
+            for filepath in sorted(entityDir.rglob('*')) if filepath.is_file()
+        }
+
+        with self._lock:
+            self.entries[getKey(entity)] = {
+                'updated_at': entity['updated_at'],
+                'folder': str(entityDir.relative_to(self.rootPath)),
+                'files': files,
+            }
+            self.save()
+
+    def removeMissing(self, entityName, ids):
+        """
+        Deletes the folders of the entities of one kind
+        that are no longer in ids.
+        """
+        prefix = f'{entityName}:'
+        keys = {f'{prefix}{id}' for id in ids}
+
+        with self._lock:
+            for key in [key for key in self.entries
+                        if key.startswith(prefix) and key not in keys]:
+                shutil.rmtree(self.rootPath.joinpath(
+                    self.entries[key]['folder']), ignore_errors=True)
+                del self.entries[key]
+            self.save()
+
+    def save(self):
+        self.rootPath.mkdir(parents=True, exist_ok=True)
+        tmpPath = self.path.with_name(self.path.name + '.tmp')
+        with open(tmpPath, 'w') as out:
+            json.dump({'entities': self.entries}, out, indent=2)
+        os.replace(tmpPath, self.path)
+
+
+def getKey(entity):
+    return f'{entity.__entityName__}:{entity.id}'
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+import json
+import threading
+from pathlib import Path
+from urllib.parse import urlparse
+from pathvalidate import sanitize_filename
+import labstep.config.upload as uploadConfig
+from labstep.service.client import getHost
+
+
+class FileIndex:
+    """
+    A local record of the files uploaded to a workspace, keyed by
+    the sha256 hash of their contents and the extra parameters
+    they were uploaded with.
+
+    Entries are appended one JSON line at a time, so an interrupted
+    bulk upload keeps everything that was recorded before it stopped.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path).expanduser()
+        self._lock = threading.Lock()
+        self.entries = {}
+
+        if self.path.exists():
+            with open(self.path) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A partly written last line.
+                        continue
+                    key = getKey(entry['hash'], entry.get('params', {}))
+                    self.entries[key] = entry['file']
+
+    def get(self, fileHash, params={}):
+        return self.entries.get(getKey(fileHash, params))
+
+    def add(self, fileHash, fileData, params={}):
+        line = json.dumps({'hash': fileHash, 'params': params, 'file': fileData},
+                          default=str)
+        with self._lock:
+            self.entries[getKey(fileHash, params)] = fileData
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, 'a') as out:
+                out.write(line + '\n')
+
+
+def getKey(fileHash, params):
+    return fileHash, json.dumps(params, sort_keys=True, default=str)
+
+
+def getFileIndex(user):
+    """
+    Returns
+    -------
+    :class:`~labstep.service.fileIndex.FileIndex`
+        The index of the user's active workspace, kept apart
+        for every host and user so that they never share uploads.
+    """
+    host = sanitize_filename(urlparse(getHost(user)).netloc, replacement_text='_')
+    return FileIndex(Path(uploadConfig.fileIndexPath).joinpath(
+        host, str(user.id), f'{user.activeWorkspace}.jsonl'))
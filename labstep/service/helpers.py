@@ -1,11 +1,12 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 # Author: Labstep <dev@labstep.com>
-import pandas
+from collections.abc import Mapping
+from contextlib import nullcontext
 from datetime import datetime
 from time import gmtime, strftime
 from labstep.constants import UNSPECIFIED
-from labstep.service.config import configService
+from labstep.generic.entityList.model import updatingIndexes
 
 
 def url_join(*args):
@@ -94,35 +95,64 @@ def handleKeyword(string):
         return string.lower().replace(" ", "_")
 
 
+def handleSerializerGroups(groups):
+    """
+    Returns
+    -------
+    string
+        The serializer groups as the comma separated
+        string expected by the API.
+    """
+    if groups is None:
+        return None
+    if groups is UNSPECIFIED:
+        return UNSPECIFIED
+    if isinstance(groups, str):
+        return groups
+
+    return ','.join(groups)
+
+
 def update(entity, newData):
     """
     Returns
     -------
     the updated entity
     """
-    entity.__data__ = newData
-    for key in newData:
-        try:
-            setattr(entity, key, newData[key])
-        except:
-            pass
+    if getattr(entity, '__data__', None) is None:
+        updating = nullcontext()
+    else:
+        updating = updatingIndexes(entity)
+
+    with updating:
+        entity.__data__ = newData
+        # Fields are read from __data__, so only attributes set
+        # on the entity that the new data replaces need clearing.
+        attributes = getattr(entity, '__dict__', None)
+        if attributes:
+            for key in newData:
+                attributes.pop(key, None)
     return entity
 
 
 def getHeaders(user=None):
+    from labstep.service.client import getClient
+
+    userAgent = getClient(user).userAgent
+
     if user is None:
         return {
-            "User-Agent": configService.getUserAgent()
+            "User-Agent": userAgent
         }
     elif hasattr(user,'api_key'):
         return {
             "apikey": user.api_key,
-            "User-Agent": configService.getUserAgent()
+            "User-Agent": userAgent
         }
     else:
         return {
             "Authorization": "Bearer " + user.token,
-            "User-Agent": configService.getUserAgent()
+            "User-Agent": userAgent
         }
 
 
@@ -151,39 +181,193 @@ def getCellValue(cell):
     return cell['value']
 
 
+def getIndexOrder(key):
+    try:
+        return (0, int(key))
+    except (TypeError, ValueError):
+        return (1, str(key))
+
+
+DEFAULT_SHEET = 'Sheet1'
+
+
+def getDataTable(data, sheet=DEFAULT_SHEET):
+    """
+    Returns
+    -------
+        The dataTable of a sheet of a multi-sheet table,
+        or of a single sheet table.
+    """
+    if 'sheets' in data:
+        return data['sheets'][sheet]['data']['dataTable']
+    return data['data']['dataTable']
+
+
 def dataTableToDataFrame(dataTable):
+    """
+    Converts a dataTable to a DataFrame, using its first row as the header.
+
+    Rows and columns are ordered by index and missing cells are NaN, so
+    sparse dataTables keep their layout. Each column is built as a whole
+    so pandas infers its dtype, numbers are not turned into objects.
+
+    Every cell is its own {'value': ...} dict, so reading them is a loop
+    over the cells in Python. This was faster than handing the nested
+    dicts to DataFrame.from_dict.
+    """
+    # Imported here so that pandas only loads when tables are used
+    import pandas
+
+    rows = {str(rowKey): row for (rowKey, row) in getKeyValues(dataTable)}
+    header = {str(columnKey): getCellValue(cell)
+              for (columnKey, cell) in getKeyValues(rows.pop('0', {}))}
+
+    rowKeys = sorted(rows, key=getIndexOrder)
 
-    values = {
-        str(rowKey): {
-            str(columnKey): getCellValue(cell)
-            for (columnKey, cell) in getKeyValues(row)
-        } for (rowKey, row) in getKeyValues(dataTable)
-    }
+    columns = {}
+    for position, rowKey in enumerate(rowKeys):
+        for (columnKey, cell) in getKeyValues(rows[rowKey]):
+            columnKey = str(columnKey)
+            if columnKey not in columns:
+                columns[columnKey] = [None] * len(rowKeys)
+            columns[columnKey][position] = getCellValue(cell)
 
-    header = values.pop('0')
+    for columnKey in header:
+        columns.setdefault(columnKey, [None] * len(rowKeys))
 
-    df = pandas.DataFrame(values).T.rename(columns=header)
+    columnKeys = sorted(columns, key=getIndexOrder)
 
-    df = df.reset_index(drop=True)
+    df = pandas.DataFrame({columnKey: pandas.Series(columns[columnKey])
+                           for columnKey in columnKeys},
+                          index=pandas.RangeIndex(len(rowKeys)))
 
-    return df
+    return df.rename(columns=header)
+
+
+def getCellValues(series):
+    """
+    Returns
+    -------
+        The values of the column as JSON serialisable
+        Python objects, with None for missing values.
+    """
+    import pandas
+
+    if pandas.api.types.is_datetime64_any_dtype(series):
+        values = [None if value is pandas.NaT else value.isoformat()
+                  for value in series]
+    else:
+        values = series.tolist()
+
+    missing = series.isna()
+    if missing.any():
+        for position in missing.to_numpy().nonzero()[0]:
+            values[position] = None
+
+    return values
 
 
 def dataFrameToDataTable(df):
+    """
+    Converts a DataFrame to a table's data, with the column names
+    as the first row, so rowCount is len(df) + 1. Missing values are
+    left out of the dataTable, and a row with no values is kept empty.
 
+    Values are read a column at a time by pandas, but each cell still
+    needs its own {'value': ...} dict, built in Python.
+    """
     headers = {'0': {str(colInd): {'value': colName}
                      for colInd, colName in enumerate(df.columns)}}
 
-    dataTable = {
-        str(int(rowInd)+1): {str(colInd): {'value': row[colName]} for colInd, colName in enumerate(df.columns)} for rowInd, row in df.iterrows()
-    }
+    dataTable = {str(rowInd + 1): {} for rowInd in range(len(df))}
+    rows = list(dataTable.values())
 
-    data = {"rowCount": int(df.index[-1]) + 2, "columnCount": len(
+    for colInd in range(len(df.columns)):
+        colKey = str(colInd)
+        for row, value in zip(rows, getCellValues(df.iloc[:, colInd])):
+            if value is not None:
+                row[colKey] = {'value': value}
+
+    data = {"rowCount": len(df) + 1, "columnCount": len(
         df.columns), "colHeaderData": {}, "data": {"dataTable": {**headers, **dataTable}}}
 
     return data
 
 
+class DataFrameSheets(Mapping):
+    """
+    The sheets of a table as a read-only dict of DataFrames.
+
+    Each sheet is converted the first time it is accessed
+    and kept, so reading one sheet of a workbook with many
+    does not convert the others.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        self._dataFrames = {}
+
+    def __getitem__(self, sheet):
+        if sheet not in self._dataFrames:
+            if sheet not in self:
+                raise KeyError(sheet)
+            self._dataFrames[sheet] = dataTableToDataFrame(
+                getDataTable(self.data, sheet))
+        return self._dataFrames[sheet]
+
+    def __iter__(self):
+        if 'sheets' in self.data:
+            return iter(self.data['sheets'])
+        return iter([DEFAULT_SHEET])
+
+    def __len__(self):
+        return len(self.data['sheets']) if 'sheets' in self.data else 1
+
+    def __contains__(self, sheet):
+        if 'sheets' in self.data:
+            return sheet in self.data['sheets']
+        return sheet == DEFAULT_SHEET
+
+    def __repr__(self):
+        return f'DataFrameSheets({list(self)})'
+
+
+def dataFramesToData(dataFrames, data=None):
+    """
+    Converts a dict of DataFrames to the data of a multi-sheet table.
+
+    Parameters
+    ----------
+    dataFrames (dict)
+        Maps sheet names to DataFrames.
+    data (dict)
+        The current data of the table. Its other sheets, and the
+        settings of the sheets being replaced, are kept. A single
+        sheet table becomes a sheet called 'Sheet1'.
+    """
+    if not data:
+        data = {}
+    elif 'sheets' not in data:
+        data = {'sheets': {DEFAULT_SHEET: {**data, 'name': DEFAULT_SHEET, 'index': 0}}}
+
+    sheets = {sheetName: dict(sheet) for sheetName, sheet in data.get('sheets', {}).items()}
+
+    for sheetName, df in dataFrames.items():
+        sheetData = dataFrameToDataTable(df)
+        sheets[sheetName] = {
+            **sheets.get(sheetName, {}),
+            'name': sheetName,
+            'rowCount': sheetData['rowCount'],
+            'columnCount': sheetData['columnCount'],
+            'data': sheetData['data'],
+        }
+
+    for index, sheet in enumerate(sheets.values()):
+        sheet.setdefault('index', index)
+
+    return {**data, 'sheetCount': len(sheets), 'sheets': sheets}
+
+
 def linearToCartesianCoordinates(position, number_of_columns):
 
     mod = position % number_of_columns
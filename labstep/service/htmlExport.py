@@ -6,17 +6,18 @@ from labstep.service.helpers import (
     url_join,
     getHeaders,
 )
-from labstep.service.config import configService
-from labstep.service.request import requestService
-from bs4 import BeautifulSoup
+from labstep.service.client import getHost
+from labstep.service.client import getRequestService
 import json
 import glob
 import base64
-from PIL import Image
 
 
 class HTMLExportService:
     def convert_tiff_to_png(self, tiff_path, png_path):
+        # Imported here so that Pillow only loads when exporting
+        from PIL import Image
+
         with Image.open(tiff_path) as img:
             img.save(png_path, format='PNG')
 
@@ -36,12 +37,14 @@ class HTMLExportService:
             "type": "html_file" if withImages else "html"
         }
 
-        url = url_join(configService.getHost(), 'api/generic', 'entity-export')
-        response = requestService.post(url, json=body, headers=headers)
+        url = url_join(getHost(entity.__user__), 'api/generic', 'entity-export')
+        response = getRequestService(entity.__user__).post(url, json=body, headers=headers)
 
         return json.loads(response.content)['html']
 
     def insertFilepaths(self, rootDir, html):
+        # Imported here so that BeautifulSoup only loads when exporting
+        from bs4 import BeautifulSoup
 
         soup = BeautifulSoup(html, 'html.parser')
 
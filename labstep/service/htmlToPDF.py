@@ -2,7 +2,7 @@
 # -*- coding: utf-8 -*-
 # Author: Labstep <dev@labstep.com>
 
-from labstep.service.request import requestService
+from labstep.service.client import getRequestService
 from labstep.constants import UNSPECIFIED
 import json
 
@@ -34,7 +34,7 @@ def htmlToPDF(authenticatedUser, html=UNSPECIFIED,file_id=UNSPECIFIED,returnFile
         body["file_id"] = file_id
 
     url = "https://pdf-generator.labstep.com"
-    response = requestService.post(url, json=body, headers=headers)
+    response = getRequestService(authenticatedUser).post(url, json=body, headers=headers)
 
     fileID = json.loads(response.content)["file_id"]
     file = authenticatedUser.getFile(fileID)
@@ -3,7 +3,7 @@
 # Author: Labstep <dev@labstep.com>
 
 import json
-from labstep.service.request import requestService
+from labstep.service.client import getRequestService
 
 
 class HTMLToProseMirrorService:
@@ -25,7 +25,7 @@ class HTMLToProseMirrorService:
         body = {"html": html}
 
         url = "https://html-converter.labstep.com"
-        response = requestService.post(url, json=body, headers=headers)
+        response = getRequestService(authenticatedUser).post(url, json=body, headers=headers)
         return json.loads(response.content)
 
 
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+DEFAULT_PATH = os.path.join('~', '.labstep', 'http-cache.sqlite')
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024  # bytes
+DEFAULT_MAX_AGE = 24 * 60 * 60  # seconds
+
+# Fraction of the time since an entity last changed that a cached copy
+# is trusted without revalidation (the usual Last-Modified heuristic).
+HEURISTIC_FRACTION = 0.1
+
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+class HTTPCache:
+    """
+    Disk-backed cache of JSON GET responses stored in SQLite.
+
+    Responses carrying an ETag or Last-Modified header are revalidated
+    with a conditional request once stale. Freshness is estimated from
+    the Last-Modified header, or the `updated_at` of the payload, and is
+    capped at `maxAge` seconds. The least recently used responses are
+    evicted once the compressed bodies exceed `maxSize` bytes.
+
+    Responses with no validator and no freshness, such as most listings,
+    could never be reused, so they are not stored.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, maxSize=DEFAULT_MAX_SIZE, maxAge=DEFAULT_MAX_AGE):
+        self.path = Path(path).expanduser()
+        self.maxSize = maxSize
+        self.maxAge = maxAge
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            str(self.path), check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    url TEXT,
+                    headers TEXT,
+                    body BLOB,
+                    size INTEGER,
+                    fresh_until REAL,
+                    accessed_at REAL
+                )""")
+        # Kept up to date as responses are stored, so the table is
+        # only scanned again when it looks to have outgrown maxSize.
+        self._size = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def getKey(self, url, headers, params):
+        credentials = {k: v for k, v in (headers or {}).items()
+                       if k.lower() in ('apikey', 'authorization')}
+        raw = json.dumps([url, params or {}, credentials],
+                         sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def lookup(self, key):
+        """
+        Returns
+        -------
+            (response, isFresh) or None if nothing is stored.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT url, headers, body, fresh_until FROM responses WHERE key = ?",
+                (key,)).fetchone()
+            if row is None:
+                return None
+            with self._connection:
+                self._connection.execute(
+                    "UPDATE responses SET accessed_at = ? WHERE key = ?",
+                    (time.time(), key))
+
+        url, headers, body, freshUntil = row
+        return self.toResponse(url, json.loads(headers), zlib.decompress(body)), freshUntil > time.time()
+
+    def store(self, key, response):
+        if 'json' not in response.headers.get('Content-Type', ''):
+            return
+
+        lifetime = self.getFreshnessLifetime(response)
+        if lifetime == 0 and not self.getValidators(response):
+            return
+
+        headers = {name: response.headers[name]
+                   for name in STORED_HEADERS if name in response.headers}
+        body = zlib.compress(response.content)
+        freshUntil = time.time() + lifetime
+
+        with self._lock, self._connection:
+            replaced = self._connection.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, response.url, json.dumps(headers), body, len(body), freshUntil, time.time()))
+            self._size += len(body) - (replaced[0] if replaced else 0)
+            if self._size > self.maxSize:
+                self.evict()
+
+    def refresh(self, key, response):
+        """
+        Marks a stored response as fresh again after a 304 Not Modified.
+        """
+        freshUntil = time.time() + self.getFreshnessLifetime(response)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE responses SET fresh_until = ?, accessed_at = ? WHERE key = ?",
+                (freshUntil, time.time(), key))
+
+    def expireAll(self):
+        """
+        Forces every stored response to be revalidated before reuse,
+        called whenever the SDK writes to the API.
+        """
+        with self._lock, self._connection:
+            self._connection.execute("UPDATE responses SET fresh_until = 0")
+
+    def clear(self):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+            self._size = 0
+
+    def evict(self):
+        total = self._connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        rows = self._connection.execute(
+            "SELECT key, size FROM responses ORDER BY accessed_at")
+        evicted = []
+        for key, size in rows:
+            if total <= self.maxSize:
+                break
+            evicted.append((key,))
+            total -= size
+        self._connection.executemany(
+            "DELETE FROM responses WHERE key = ?", evicted)
+        self._size = total
+
+    def getFreshnessLifetime(self, response):
+        lastModified = getLastModified(response)
+        if lastModified is None:
+            return 0
+        age = max(time.time() - lastModified, 0)
+        return min(age * HEURISTIC_FRACTION, self.maxAge)
+
+    def getValidators(self, cachedResponse):
+        validators = {}
+        if 'ETag' in cachedResponse.headers:
+            validators['If-None-Match'] = cachedResponse.headers['ETag']
+        if 'Last-Modified' in cachedResponse.headers:
+            validators['If-Modified-Since'] = cachedResponse.headers['Last-Modified']
+        return validators
+
+    def toResponse(self, url, headers, content):
+        response = Response()
+        response.status_code = 200
+        response.url = url
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = content
+        response.fromCache = True
+        return response
+
+
+def getLastModified(response):
+    """
+    Returns
+    -------
+        The time the payload last changed as a timestamp, taken from
+        the Last-Modified header or the `updated_at` of the payload.
+    """
+    if 'Last-Modified' in response.headers:
+        try:
+            return parsedate_to_datetime(response.headers['Last-Modified']).timestamp()
+        except (TypeError, ValueError):
+            pass
+
+    try:
+        updatedAt = json.loads(response.content).get('updated_at')
+        return datetime.strptime(updatedAt, '%Y-%m-%dT%H:%M:%S%z').timestamp()
+    except (AttributeError, TypeError, ValueError):
+        return None
@@ -7,6 +7,7 @@ import os
 import labstep.generic.entity.repository as entityRepository
 from labstep.entities.experimentProtocol.model import ExperimentProtocol
 from labstep.entities.protocolVersion.model import ProtocolVersion
+from labstep.service.config import configService
 
 
 def getParent():
@@ -14,6 +15,8 @@ def getParent():
     Get Parent based on Jupyter environment variables.
 
     """
+    configService.load()
+
     if ('LABSTEP_API_KEY' not in os.environ.keys()):
         raise Exception("Not in jupyter")
 
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+"""
+Instrumentation of the requests made by the SDK.
+
+A hook is any object with `beforeRequest(event)` and / or
+`afterRequest(event)` methods, added to a request service with
+`addHook`. :class:`Metrics` is a hook that keeps per endpoint counters
+and latency histograms, for example::
+
+    from labstep.service.metrics import enableMetrics
+
+    metrics = enableMetrics(user)
+    experiments = user.getExperiments(count=500)
+    print(metrics.toPrometheus())
+"""
+
+import re
+import threading
+import time
+from urllib.parse import urlparse
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, float('inf'))
+
+IDENTIFIER = re.compile(
+    r'^(\d+|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})$', re.I)
+
+
+class RequestEvent:
+    """
+    Describes one request, passed to the hooks before it is sent and
+    again once it has finished (or been answered from the cache).
+    """
+
+    def __init__(self, method, url, params=None):
+        self.method = method
+        self.url = url
+        self.params = params or {}
+        self.endpoint = getEndpoint(url)
+        self.operation = getOperation(self.params)
+        self.startedAt = time.perf_counter()
+        self.elapsed = None
+        self.response = None
+        self.error = None
+        self.retries = 0
+        self.fromCache = False
+
+    @property
+    def statusCode(self):
+        if self.response is not None:
+            return self.response.status_code
+        return getattr(self.error, 'status_code', None)
+
+    @property
+    def bytesSent(self):
+        request = getattr(self.response, 'request', None)
+        body = getattr(request, 'body', None)
+        if body is None:
+            return 0
+        try:
+            return len(body)
+        except TypeError:
+            return 0
+
+    @property
+    def bytesReceived(self):
+        if self.response is None:
+            return 0
+        # Streamed bodies have not been read yet.
+        if getattr(self.response, '_content_consumed', True) is False:
+            return int(self.response.headers.get('Content-Length', 0))
+        return len(self.response.content or b'')
+
+
+def getEndpoint(url):
+    """
+    Returns
+    -------
+        The path of url with ids and guids replaced by {id},
+        so requests for different entities are grouped together.
+    """
+    path = urlparse(url).path
+    return '/'.join('{id}' if IDENTIFIER.match(segment) else segment
+                    for segment in path.split('/'))
+
+
+def getOperation(params):
+    if params.get('get_single'):
+        return 'single'
+    if params.get('get_count'):
+        return 'count'
+    if 'cursor' in params or 'page' in params:
+        return 'list'
+    return ''
+
+
+class EndpointStats:
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.retries = 0
+        self.cacheHits = 0
+        self.bytesSent = 0
+        self.bytesReceived = 0
+        self.latencySum = 0.0
+        self.latencyBuckets = [0] * len(LATENCY_BUCKETS)
+        self.statusCodes = {}
+
+    def toDict(self):
+        return {
+            'count': self.count,
+            'errors': self.errors,
+            'retries': self.retries,
+            'cacheHits': self.cacheHits,
+            'bytesSent': self.bytesSent,
+            'bytesReceived': self.bytesReceived,
+            'latencySum': self.latencySum,
+            'latencyBuckets': dict(zip(LATENCY_BUCKETS, self.latencyBuckets)),
+            'statusCodes': dict(self.statusCodes),
+        }
+
+
+class Metrics:
+    """
+    Per endpoint counters, byte totals and latency histograms
+    of the requests seen by the request services it is added to.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.endpoints = {}
+
+    def afterRequest(self, event):
+        key = (event.method, event.endpoint, event.operation)
+
+        with self._lock:
+            stats = self.endpoints.setdefault(key, EndpointStats())
+            stats.count += 1
+            stats.retries += event.retries
+            stats.bytesSent += event.bytesSent
+            stats.bytesReceived += event.bytesReceived
+            if event.error is not None:
+                stats.errors += 1
+            if event.fromCache or event.statusCode == 304:
+                stats.cacheHits += 1
+            status = str(event.statusCode)
+            stats.statusCodes[status] = stats.statusCodes.get(status, 0) + 1
+            stats.latencySum += event.elapsed
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if event.elapsed <= bound:
+                    stats.latencyBuckets[i] += 1
+
+    def reset(self):
+        with self._lock:
+            self.endpoints = {}
+
+    def toDict(self):
+        """
+        Returns
+        -------
+        dict
+            The stats of every endpoint, keyed by
+            'METHOD /path' plus the operation if any.
+        """
+        with self._lock:
+            return {
+                ' '.join(filter(None, key)): stats.toDict()
+                for key, stats in sorted(self.endpoints.items())
+            }
+
+    def toPrometheus(self):
+        """
+        Returns
+        -------
+        str
+            The metrics in the Prometheus text exposition format.
+        """
+        counters = [
+            ('labstep_requests_total', 'Requests made', 'count'),
+            ('labstep_request_errors_total', 'Requests that failed', 'errors'),
+            ('labstep_request_retries_total', 'Retries of throttled requests', 'retries'),
+            ('labstep_cache_hits_total', 'Requests answered from the cache', 'cacheHits'),
+            ('labstep_request_bytes_sent_total', 'Request body bytes sent', 'bytesSent'),
+            ('labstep_response_bytes_received_total', 'Response body bytes received', 'bytesReceived'),
+        ]
+
+        with self._lock:
+            endpoints = sorted(self.endpoints.items())
+
+            lines = []
+            for name, description, attribute in counters:
+                lines += [f'# HELP {name} {description}', f'# TYPE {name} counter']
+                for key, stats in endpoints:
+                    lines.append(f'{name}{{{getLabels(key)}}} {getattr(stats, attribute)}')
+
+            name = 'labstep_request_duration_seconds'
+            lines += [f'# HELP {name} Request latency',
+                      f'# TYPE {name} histogram']
+            for key, stats in endpoints:
+                labels = getLabels(key)
+                for bound, count in zip(LATENCY_BUCKETS, stats.latencyBuckets):
+                    le = '+Inf' if bound == float('inf') else bound
+                    lines.append(f'{name}_bucket{{{labels},le="{le}"}} {count}')
+                lines.append(f'{name}_sum{{{labels}}} {stats.latencySum}')
+                lines.append(f'{name}_count{{{labels}}} {stats.count}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def getLabels(key):
+    method, endpoint, operation = key
+    return f'method="{method}",endpoint="{endpoint}",operation="{operation}"'
+
+
+class OpenTelemetryHook:
+    """
+    Records every request as an OpenTelemetry span.
+    Requires the opentelemetry-api package.
+    """
+
+    def __init__(self, tracer=None):
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            raise ImportError(
+                'OpenTelemetryHook requires opentelemetry-api: pip install opentelemetry-api')
+
+        self._trace = trace
+        self.tracer = tracer if tracer is not None else trace.get_tracer('labstep')
+        self._spans = {}
+        self._lock = threading.Lock()
+
+    def beforeRequest(self, event):
+        span = self.tracer.start_span(
+            f'{event.method} {event.endpoint}',
+            kind=self._trace.SpanKind.CLIENT,
+            attributes={'http.method': event.method, 'http.url': event.url,
+                        'labstep.operation': event.operation})
+        with self._lock:
+            self._spans[id(event)] = span
+
+    def afterRequest(self, event):
+        with self._lock:
+            span = self._spans.pop(id(event), None)
+        if span is None:
+            return
+        if event.statusCode is not None:
+            span.set_attribute('http.status_code', event.statusCode)
+        span.set_attribute('labstep.retries', event.retries)
+        span.set_attribute('labstep.from_cache', event.fromCache)
+        if event.error is not None:
+            span.record_exception(event.error)
+            span.set_status(self._trace.Status(self._trace.StatusCode.ERROR))
+        span.end()
+
+
+def enableMetrics(user=None):
+    """
+    Adds a new :class:`Metrics` to the request service of user
+    (or the shared one) and returns it.
+    """
+    from labstep.service.client import getRequestService
+
+    metrics = Metrics()
+    getRequestService(user).addHook(metrics)
+    return metrics
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+import io
+import mimetypes
+import os
+import uuid
+from labstep.constants import UNSPECIFIED
+
+# Percent encoded in Content-Disposition parameters, as browsers and
+# urllib3 do, so a file name cannot break out of its header.
+HEADER_ESCAPES = {10: '%0A', 13: '%0D', 34: '%22'}
+
+
+class MultipartEncoder:
+    """
+    A multipart/form-data body that is read lazily from its parts.
+
+    Passing an instance as `data` to requests streams the body with
+    a known Content-Length, so files are read from disk a block at a
+    time instead of being copied into memory first.
+
+    Parameters
+    ----------
+    fields (dict)
+        Form fields, sent before the files. None values are skipped
+        and lists are sent as repeated fields, as in requests.
+    files (dict)
+        Maps field names to (filename, fileobj) tuples. The file
+        objects must be seekable, see :func:`isSeekable`.
+    progress (function)
+        Called as progress(bytesSent, totalBytes) as the body is read.
+    """
+
+    def __init__(self, fields, files, progress=UNSPECIFIED):
+        self.boundary = uuid.uuid4().hex
+        self.contentType = f'multipart/form-data; boundary={self.boundary}'
+        self.progress = progress
+        self.sent = 0
+        self._parts = []
+
+        for name, values in fields.items():
+            if isinstance(values, (str, bytes)) or not hasattr(values, '__iter__'):
+                values = [values]
+            for value in values:
+                if value is None:
+                    continue
+                if not isinstance(value, bytes):
+                    value = str(value).encode('utf-8')
+                self._addBytes(self._getHeader(name) + value + b'\r\n')
+
+        for name, (filename, fileobj) in files.items():
+            contentType = mimetypes.guess_type(
+                filename)[0] or 'application/octet-stream'
+            self._addBytes(self._getHeader(name, filename, contentType))
+            self._parts.append(
+                (fileobj, getRemainingSize(fileobj), fileobj.tell()))
+            self._addBytes(b'\r\n')
+
+        self._addBytes(f'--{self.boundary}--\r\n'.encode('utf-8'))
+        self.length = sum(size for part, size, start in self._parts)
+        self._current = 0
+
+    def _getHeader(self, name, filename=None, contentType=None):
+        disposition = f'form-data; {formatHeaderParam("name", name)}'
+        if filename is not None:
+            disposition += f'; {formatHeaderParam("filename", filename)}'
+        header = f'--{self.boundary}\r\nContent-Disposition: {disposition}\r\n'
+        if contentType is not None:
+            header += f'Content-Type: {contentType}\r\n'
+        return (header + '\r\n').encode('utf-8')
+
+    def _addBytes(self, data):
+        self._parts.append((io.BytesIO(data), len(data), 0))
+
+    def __len__(self):
+        return self.length
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self.length - self.sent
+
+        chunks = []
+        while size > 0 and self._current < len(self._parts):
+            part = self._parts[self._current][0].read(size)
+            if not part:
+                self._current += 1
+                continue
+            chunks.append(part)
+            size -= len(part)
+
+        data = b''.join(chunks)
+        self.sent += len(data)
+        if data and self.progress is not UNSPECIFIED:
+            self.progress(self.sent, self.length)
+        return data
+
+    def rewind(self):
+        """
+        Starts the body again from the beginning, so that
+        a throttled upload can be retried.
+        """
+        for part, size, start in self._parts:
+            part.seek(start)
+        self._current = 0
+        self.sent = 0
+
+
+def formatHeaderParam(name, value):
+    if isinstance(value, bytes):
+        value = value.decode('utf-8')
+    return f'{name}="{str(value).translate(HEADER_ESCAPES)}"'
+
+
+def isSeekable(fileobj):
+    """
+    Returns
+    -------
+    bool
+        Whether the size of the rest of the file can be found
+        and the file read again, which streaming it requires.
+    """
+    try:
+        return fileobj.seekable()
+    except (AttributeError, OSError, ValueError):
+        return False
+
+
+def getRemainingSize(fileobj):
+    try:
+        return os.fstat(fileobj.fileno()).st_size - fileobj.tell()
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        position = fileobj.tell()
+        fileobj.seek(0, os.SEEK_END)
+        size = fileobj.tell() - position
+        fileobj.seek(position)
+        return size
@@ -19,7 +19,7 @@ def ping():
     headers = getHeaders()
 
     url = url_join(configService.getHost(), 'ping')
-    response = requestService.get(url, headers=headers)
+    response = requestService.get(url, headers=headers, useCache=False)
 
     return json.loads(response.content)
 
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+"""
+Client side throttling of requests to the Labstep API.
+
+Every set of credentials gets one :class:`RateLimiter`, shared by all
+threads making requests as that user. It combines an optional token
+bucket (a fixed requests per second ceiling) with an AIMD limit on the
+number of requests in flight: the limit grows by one for every round of
+successful requests and halves whenever the API answers 429 or 503, so
+it settles just below the throughput the API will sustain.
+
+Only the API's own overload responses lower the limit. Slow requests
+do not, as uploads, exports and downloads are slow without the API
+being overloaded.
+"""
+
+import random
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import labstep.config.rateLimit as rateLimitConfig
+
+THROTTLE_DECREASE = 0.5
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = max(burst, 1)
+        self.tokens = self.capacity
+        self.updatedAt = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity,
+                                  self.tokens + (now - self.updatedAt) * self.rate)
+                self.updatedAt = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                delay = (1 - self.tokens) / self.rate
+            time.sleep(delay)
+
+
+class AIMDLimiter:
+    def __init__(self, initial, maximum, minimum=1):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.inFlight = 0
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        with self._condition:
+            while self.inFlight >= int(self.limit):
+                self._condition.wait()
+            self.inFlight += 1
+
+    def release(self, throttled=False):
+        with self._condition:
+            self.inFlight -= 1
+
+            if throttled:
+                self.limit = max(self.minimum, self.limit * THROTTLE_DECREASE)
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+
+            self._condition.notify_all()
+
+
+class RateLimiter:
+    def __init__(self, requestsPerSecond=None, burst=1,
+                 initialConcurrency=8, maxConcurrency=64):
+        self.bucket = TokenBucket(requestsPerSecond, burst) \
+            if requestsPerSecond else None
+        self.concurrency = AIMDLimiter(initialConcurrency, maxConcurrency)
+
+    @contextmanager
+    def slot(self):
+        """
+        Waits for a free slot and yields a dict in which the caller
+        records whether the request was throttled.
+        """
+        if self.bucket is not None:
+            self.bucket.acquire()
+        self.concurrency.acquire()
+
+        outcome = {'throttled': False}
+        try:
+            yield outcome
+        finally:
+            self.concurrency.release(throttled=outcome['throttled'])
+
+
+def getRetryDelay(attempt, retryAfter=None):
+    """
+    Returns
+    -------
+        Seconds to wait before retry number `attempt`: exponential
+        backoff with full jitter, but never less than Retry-After.
+    """
+    backoff = min(rateLimitConfig.backoffMax,
+                  rateLimitConfig.backoffBase * 2 ** attempt)
+    delay = random.uniform(0, backoff)
+    return max(delay, parseRetryAfter(retryAfter) or 0)
+
+
+def parseRetryAfter(value):
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+    try:
+        retryAt = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max((retryAt - datetime.now(timezone.utc)).total_seconds(), 0)
+
+
+_limiters = {}
+_limitersLock = threading.Lock()
+
+
+def getRateLimiter(headers):
+    """
+    Returns
+    -------
+        The RateLimiter shared by every request with the same
+        credentials, or None for requests without credentials
+        (such as downloads from signed URLs).
+    """
+    credentials = tuple(sorted(
+        (k.lower(), v) for k, v in (headers or {}).items()
+        if k.lower() in ('apikey', 'authorization')))
+
+    if not credentials:
+        return None
+
+    with _limitersLock:
+        if credentials not in _limiters:
+            _limiters[credentials] = RateLimiter(
+                requestsPerSecond=rateLimitConfig.requestsPerSecond,
+                burst=rateLimitConfig.burst,
+                initialConcurrency=rateLimitConfig.initialConcurrency,
+                maxConcurrency=rateLimitConfig.maxConcurrency,
+            )
+        return _limiters[credentials]
+
+
+def resetRateLimiters():
+    """
+    Forgets the learnt limits, for example after changing
+    labstep.config.rateLimit.
+    """
+    with _limitersLock:
+        _limiters.clear()
@@ -4,18 +4,27 @@
 # TODO Implement routing name
 # Example: url = url_join(configService.getHost(), "api/generic/share-link/email")
 
-import os
+import time
+from http.cookiejar import DefaultCookiePolicy
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+from labstep.service.config import configService
 from labstep.service.helpers import boolToString, filterUnspecified
+from labstep.service.rateLimit import getRateLimiter, getRetryDelay
+import labstep.config.rateLimit as rateLimitConfig
+import labstep.config.session as sessionConfig
+from labstep.service.metrics import RequestEvent
+from labstep.service.multipart import isSeekable
+from labstep.constants import UNSPECIFIED
 
 DEFAULT_TIMEOUT = 60  # seconds
 
 
 class RequestException(requests.exceptions.RequestException):
-    def __init__(self, status_code, message):
-        super().__init__(f"Request Error {status_code}: {message}")
+    def __init__(self, status_code, message, response=None):
+        super().__init__(
+            f"Request Error {status_code}: {message}", response=response)
         self.status_code = status_code
         self.message = message
 
@@ -27,12 +36,21 @@ def handleError(response, *args, **kwargs):
         The error code and error message if the
         status code of the request is not 200.
     """
+    if response.status_code == 304 and 'If-None-Match' in response.request.headers:
+        return
+    if response.status_code == 304 and 'If-Modified-Since' in response.request.headers:
+        return
+    if response.status_code == 206 and 'Range' in response.request.headers:
+        return
     if response.status_code != 200:
-        print(
-            """Get the latest version of the SDK by running:
+        # Throttled requests are retried by RequestService.send
+        if response.status_code != 429:
+            print(
+                """Get the latest version of the SDK by running:
         pip install labstep --upgrade"""
-        )
-        raise RequestException(response.status_code, response.content)
+            )
+        raise RequestException(
+            response.status_code, response.content, response=response)
     return
 
 
@@ -46,48 +64,272 @@ class TimeoutHTTPAdapter(HTTPAdapter):
 
     def send(self, request, **kwargs):
         timeout = kwargs.get("timeout")
-        if ("DISABLE_SSL_VERIFY" in os.environ.keys() and os.environ["DISABLE_SSL_VERIFY"] == "1"):
+        if configService.getEnv("DISABLE_SSL_VERIFY") == "1":
             kwargs['verify'] = False
         if timeout is None:
             kwargs["timeout"] = self.timeout
         return super().send(request, **kwargs)
 
 
-http = requests.Session()
+def createSession(poolConnections=UNSPECIFIED, poolMaxsize=UNSPECIFIED,
+                  timeout=UNSPECIFIED, maxRetries=UNSPECIFIED, keepAlive=True):
+    """
+    Returns
+    -------
+        A requests Session with retries, timeouts and error handling,
+        and a connection pool of poolMaxsize connections per host.
+        Cookies are not stored, as the API authenticates with headers,
+        so the session can be shared freely between threads.
+    """
+    options = {
+        "poolConnections": sessionConfig.poolConnections,
+        "poolMaxsize": sessionConfig.poolMaxsize,
+        "timeout": sessionConfig.timeout,
+        "maxRetries": sessionConfig.maxRetries,
+        **filterUnspecified({"poolConnections": poolConnections, "poolMaxsize": poolMaxsize,
+                             "timeout": timeout, "maxRetries": maxRetries}),
+    }
+
+    session = requests.Session()
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    if not keepAlive:
+        session.headers["Connection"] = "close"
 
-retry_strategy = Retry(
-    total=3,
-    status_forcelist=[501, 502, 503, 504],
-    raise_on_status=False
-)
-# Mount it for both http and https usage
-adapter = TimeoutHTTPAdapter(timeout=60, max_retries=retry_strategy)
-http.hooks["response"] = [handleError]
-http.mount("https://", adapter)
-http.mount("http://", adapter)
+    retry_strategy = Retry(
+        total=options["maxRetries"],
+        status_forcelist=[501, 502, 503, 504],
+        backoff_factor=0.5,
+        raise_on_status=False
+    )
+    # Mount it for both http and https usage
+    adapter = TimeoutHTTPAdapter(timeout=options["timeout"], max_retries=retry_strategy,
+                                 pool_connections=options["poolConnections"],
+                                 pool_maxsize=options["poolMaxsize"])
+    session.hooks["response"] = [handleError]
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+http = createSession()
+
+# Hooks run for the requests of every RequestService
+globalHooks = []
 
 
 class RequestService:
-    def get(self, url, headers, params=None):
+    httpCache = None
+
+    def __init__(self, session=None):
+        self._session = session
+        self.hooks = []
+
+    @property
+    def session(self):
+        # Services without a session of their own share the module one
+        return self._session if self._session is not None else http
+
+    def enableCache(self, path=UNSPECIFIED, maxSize=UNSPECIFIED, maxAge=UNSPECIFIED):
+        """
+        Cache JSON responses to GET requests on disk between runs.
+
+        Parameters
+        ----------
+        path (str)
+            The SQLite file to store responses in
+            (defaults to ~/.labstep/http-cache.sqlite).
+        maxSize (int)
+            The maximum size of the cache in bytes.
+        maxAge (int)
+            The longest time in seconds a response is reused
+            without revalidating it with the server.
+        """
+        from labstep.service.httpCache import HTTPCache
+
+        options = filterUnspecified(
+            {"path": path, "maxSize": maxSize, "maxAge": maxAge})
+        self.httpCache = HTTPCache(**options)
+        return self.httpCache
+
+    def disableCache(self):
+        self.httpCache = None
+
+    def addHook(self, hook):
+        """
+        Adds an object whose beforeRequest(event) and afterRequest(event)
+        methods, if it has them, are called around every request with a
+        :class:`~labstep.service.metrics.RequestEvent`.
+        """
+        self.hooks.append(hook)
+        return hook
+
+    def removeHook(self, hook):
+        self.hooks.remove(hook)
+
+    def runHooks(self, stage, event):
+        for hook in self.hooks + globalHooks:
+            callback = getattr(hook, stage, None)
+            if callback is not None:
+                callback(event)
+
+    def get(self, url, headers, params=None, useCache=True, stream=False):
+        params = boolToString(filterUnspecified(params))
+
+        if stream:
+            return self.send('GET', url, headers, params=params, stream=True)
+
+        if self.httpCache is None or not useCache:
+            return self.send('GET', url, headers, params=params)
+
+        key = self.httpCache.getKey(url, headers, params)
+        cached = self.httpCache.lookup(key)
+
+        if cached is None:
+            response = self.send('GET', url, headers, params=params)
+            self.httpCache.store(key, response)
+            return response
+
+        cachedResponse, isFresh = cached
+        if isFresh:
+            if self.hooks or globalHooks:
+                event = RequestEvent('GET', url, params)
+                event.response, event.fromCache = cachedResponse, True
+                self.runHooks('beforeRequest', event)
+                event.elapsed = time.perf_counter() - event.startedAt
+                self.runHooks('afterRequest', event)
+            return cachedResponse
+
+        validators = self.httpCache.getValidators(cachedResponse)
+        response = self.send('GET', url, {**(headers or {}), **validators},
+                             params=params)
 
-        response = http.get(url, headers=headers,
-                            params=boolToString(
-                                filterUnspecified(params)))
+        if response.status_code == 304:
+            self.httpCache.refresh(key, cachedResponse)
+            return cachedResponse
+
+        self.httpCache.store(key, response)
         return response
 
     def post(self, url, headers, json=None, files=None, data=None, params=None):
-        response = http.post(
-            url, headers=headers, json=filterUnspecified(json), files=files, data=data, params=filterUnspecified(params)
+        self.expireCache()
+        response = self.send(
+            'POST', url, headers, json=filterUnspecified(json), files=files, data=data, params=filterUnspecified(params)
         )
         return response
 
     def put(self, url, headers, json=None):
-        response = http.put(url, headers=headers, json=filterUnspecified(json))
+        self.expireCache()
+        response = self.send('PUT', url, headers, json=filterUnspecified(json))
         return response
 
     def delete(self, url, headers, json=None):
-        response = http.delete(url, headers=headers, json=json)
+        self.expireCache()
+        response = self.send('DELETE', url, headers, json=json)
         return response
 
+    def send(self, method, url, headers, **kwargs):
+        """
+        Sends a request through the rate limiter shared by all requests
+        with the same credentials, retrying it when throttled (429)
+        after the Retry-After delay or a jittered exponential backoff.
+        """
+        if not self.hooks and not globalHooks:
+            return self.sendThrottled(method, url, headers, None, **kwargs)
+
+        event = RequestEvent(method, url, kwargs.get('params'))
+        self.runHooks('beforeRequest', event)
+        try:
+            event.response = self.sendThrottled(
+                method, url, headers, event, **kwargs)
+            return event.response
+        except Exception as e:
+            event.error = e
+            event.response = getattr(e, 'response', None)
+            raise
+        finally:
+            event.elapsed = time.perf_counter() - event.startedAt
+            event.retries += getRetryCount(event.response)
+            self.runHooks('afterRequest', event)
+
+    def sendThrottled(self, method, url, headers, event, **kwargs):
+        send = getattr(self.session, method.lower())
+        limiter = getRateLimiter(headers)
+
+        if limiter is None:
+            return send(url, headers=headers, **kwargs)
+
+        # Sending reads the files of the body, so they are put back
+        # where they started before a retry. Bodies that can't be
+        # rewound are not retried.
+        fileobjs = getFileObjects(kwargs)
+        positions = [fileobj.tell() if isSeekable(fileobj) else None
+                     for fileobj in fileobjs]
+
+        attempt = 0
+        while True:
+            with limiter.slot() as outcome:
+                try:
+                    return send(url, headers=headers, **kwargs)
+                except RequestException as e:
+                    if e.status_code in (429, 503):
+                        outcome['throttled'] = True
+                    if e.status_code != 429 or attempt >= rateLimitConfig.maxRetries \
+                            or None in positions:
+                        raise
+                    retryAfter = e.response.headers.get(
+                        'Retry-After') if e.response is not None else None
+
+            time.sleep(getRetryDelay(attempt, retryAfter))
+            attempt += 1
+            if event is not None:
+                event.retries += 1
+
+            body = kwargs.get('data')
+            if hasattr(body, 'rewind'):
+                body.rewind()
+            for fileobj, position in zip(fileobjs, positions):
+                fileobj.seek(position)
+
+    def expireCache(self):
+        if self.httpCache is not None:
+            self.httpCache.expireAll()
+
+
+def getFileObjects(kwargs):
+    """
+    Returns
+    -------
+        The file objects read when sending a request, from `files`
+        or a `data` stream other than a MultipartEncoder.
+    """
+    files = kwargs.get('files') or {}
+    if isinstance(files, dict):
+        files = files.items()
+
+    fileobjs = []
+    for name, value in files:
+        fileobj = value[1] if isinstance(value, (tuple, list)) else value
+        if hasattr(fileobj, 'read'):
+            fileobjs.append(fileobj)
+
+    data = kwargs.get('data')
+    if hasattr(data, 'read') and not hasattr(data, 'rewind'):
+        fileobjs.append(data)
+
+    return fileobjs
+
+
+def getRetryCount(response):
+    """
+    Returns
+    -------
+        The number of times urllib3 retried the request
+        after a server error, if known.
+    """
+    retries = getattr(getattr(response, 'raw', None), 'retries', None)
+    history = getattr(retries, 'history', None)
+    return len(history) if isinstance(history, tuple) else 0
+
 
 requestService = RequestService()
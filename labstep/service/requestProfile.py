@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+"""
+Finds redundant requests made within a block of code.
+
+Inside a `profileRequests` block every request is recorded with the
+stack it was made from. Identical requests made more than once, and
+runs of similar requests for one entity at a time (the N+1 pattern,
+for example calling `update()` on every item of a list), are reported
+when the block ends. A budget makes the block fail as soon as it
+makes more requests than expected, for example in CI. Responses served
+from the HTTP cache never reach the server, so they are not recorded::
+
+    from labstep.service.requestProfile import profileRequests
+
+    with profileRequests(budget=20) as profile:
+        for experiment in user.getExperiments(count=10):
+            experiment.getComments()
+
+    print(profile.report())
+"""
+
+import os
+import threading
+import traceback
+from contextlib import contextmanager
+import labstep.service.request as request
+from labstep.constants import UNSPECIFIED
+
+LABSTEP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Frames that say nothing about why a request was made
+INTERNAL_DIRS = tuple(os.path.join(LABSTEP_DIR, name) + os.sep
+                      for name in ('service', 'generic'))
+INTERNAL_MODULES = ('requests', 'urllib3', 'concurrent', 'threading.py', 'contextlib.py')
+
+
+class RequestBudgetExceeded(Exception):
+    def __init__(self, budget, profile):
+        super().__init__(
+            f"More than {budget} requests were made in this block.\n{profile.report()}")
+        self.budget = budget
+        self.profile = profile
+
+
+class RedundantRequestsFound(Exception):
+    def __init__(self, profile):
+        super().__init__(f"Redundant requests were made.\n{profile.report()}")
+        self.profile = profile
+
+
+class RequestRecord:
+    def __init__(self, event, stack):
+        self.method = event.method
+        self.url = event.url
+        self.endpoint = event.endpoint
+        self.operation = event.operation
+        self.params = tuple(sorted((str(k), str(v))
+                            for k, v in event.params.items()))
+        self.stack = stack
+        self.callSite = getCallSite(stack)
+
+
+class RequestProfile:
+    """
+    The requests recorded by a `profileRequests` block.
+
+    Parameters
+    ----------
+    budget (int)
+        The maximum number of requests allowed.
+    threshold (int)
+        The number of similar requests from one call site
+        reported as a likely N+1 pattern.
+    """
+
+    def __init__(self, budget=UNSPECIFIED, threshold=5):
+        self.budget = budget
+        self.threshold = threshold
+        self.records = []
+        self._lock = threading.Lock()
+
+    def beforeRequest(self, event):
+        if event.fromCache:
+            return
+        record = RequestRecord(event, traceback.extract_stack()[:-1])
+        with self._lock:
+            self.records.append(record)
+            count = len(self.records)
+        if self.budget is not UNSPECIFIED and count > self.budget:
+            raise RequestBudgetExceeded(self.budget, self)
+
+    @property
+    def count(self):
+        return len(self.records)
+
+    def getFindings(self):
+        """
+        Returns
+        -------
+        list
+            A dict for every problem found, with its `kind`
+            ('repeated' or 'n+1'), the number of requests, the
+            endpoint and the call site that made them.
+        """
+        with self._lock:
+            records = list(self.records)
+
+        findings = []
+
+        identical = groupBy(records, lambda r: (r.method, r.url, r.params))
+        for (method, url, params), group in identical.items():
+            if len(group) > 1:
+                findings.append({
+                    'kind': 'repeated',
+                    'count': len(group),
+                    'method': method,
+                    'endpoint': group[0].endpoint,
+                    'callSite': group[0].callSite,
+                    'stack': group[0].stack,
+                })
+
+        similar = groupBy(records, lambda r: (
+            r.method, r.endpoint, r.operation, r.callSite))
+        for (method, endpoint, operation, callSite), group in similar.items():
+            distinct = len({(r.url, r.params) for r in group})
+            if distinct >= self.threshold:
+                findings.append({
+                    'kind': 'n+1',
+                    'count': len(group),
+                    'method': method,
+                    'endpoint': endpoint,
+                    'callSite': callSite,
+                    'stack': group[0].stack,
+                })
+
+        return sorted(findings, key=lambda finding: -finding['count'])
+
+    def report(self):
+        lines = [f'{self.count} requests made']
+        for finding in self.getFindings():
+            description = 'identical requests' if finding['kind'] == 'repeated' \
+                else 'similar requests, one per item'
+            lines.append(
+                f"  {finding['count']} {description} to {finding['method']} {finding['endpoint']}"
+                f" from {finding['callSite']}")
+        return '\n'.join(lines)
+
+
+def getCallSite(stack):
+    """
+    Returns
+    -------
+        The innermost frame of the stack outside the SDK's request
+        machinery, as 'path:line in function'. The service and generic
+        layers are skipped, so a request is attributed to the entity
+        code that asked for it: for example the model property that
+        lazily loaded an attribute through getEntityProperty, or
+        the getComments of the comment repository.
+    """
+    for frame in reversed(stack):
+        if frame.filename.startswith(INTERNAL_DIRS):
+            continue
+        if any(module in frame.filename for module in INTERNAL_MODULES):
+            continue
+        return f'{frame.filename}:{frame.lineno} in {frame.name}'
+    return 'unknown'
+
+
+def groupBy(items, key):
+    groups = {}
+    for item in items:
+        groups.setdefault(key(item), []).append(item)
+    return groups
+
+
+@contextmanager
+def profileRequests(budget=UNSPECIFIED, threshold=5, strict=False):
+    """
+    Records every request made inside the block, from any thread.
+
+    Parameters
+    ----------
+    budget (int)
+        Raise RequestBudgetExceeded as soon as more requests than this
+        are made.
+    threshold (int)
+        The number of similar requests from one call site
+        reported as a likely N+1 pattern.
+    strict (bool)
+        Raise RedundantRequestsFound at the end of the block
+        if there are any findings.
+
+    Returns
+    -------
+    RequestProfile
+    """
+    profile = RequestProfile(budget=budget, threshold=threshold)
+    request.globalHooks.append(profile)
+    try:
+        yield profile
+    finally:
+        request.globalHooks.remove(profile)
+
+    if strict and profile.getFindings():
+        raise RedundantRequestsFound(profile)
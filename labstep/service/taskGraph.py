@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+"""
+A small task graph used to run exports concurrently.
+
+Tasks submitted from inside a running task become its children, and a
+task only counts as done once all of its children are done. Tasks can
+also depend on other tasks, so work that needs a whole subtree to be
+finished (for example writing HTML that links to downloaded files) runs
+last. Outside of a graph, submit simply runs the task straight away, so
+the same code runs sequentially when no pool is in use.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import labstep.config.export as exportConfig
+from labstep.constants import UNSPECIFIED
+
+_local = threading.local()
+
+
+class Task:
+    def __init__(self, fn, args, kwargs, parent):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.parent = parent
+        self.children = []
+        self.dependents = []
+        self.result = None
+        self.done = False
+        # The task itself plus every child that has not finished yet.
+        self.pending = 1
+        self.waitingOn = 0
+
+
+class TaskGraph:
+    def __init__(self, workers):
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix='labstep-export')
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._outstanding = 0
+        self._errors = []
+
+    def submit(self, fn, *args, dependsOn=(), **kwargs):
+        parent = getattr(_local, 'task', None)
+        task = Task(fn, args, kwargs, parent)
+
+        with self._lock:
+            self._outstanding += 1
+            if parent is not None:
+                parent.pending += 1
+                parent.children.append(task)
+            for dependency in dependsOn:
+                if not dependency.done:
+                    task.waitingOn += 1
+                    dependency.dependents.append(task)
+            ready = task.waitingOn == 0
+
+        if ready:
+            self._executor.submit(self._run, task)
+        return task
+
+    def wait(self):
+        with self._lock:
+            while self._outstanding > 0:
+                self._idle.wait()
+        self._executor.shutdown()
+        if self._errors:
+            raise self._errors[0]
+
+    def _run(self, task):
+        _local.graph, _local.task = self, task
+        try:
+            # After the first failure the remaining tasks are skipped,
+            # as the sequential export would have stopped there.
+            if not self._errors:
+                task.result = task.fn(*task.args, **task.kwargs)
+        except BaseException as e:
+            with self._lock:
+                self._errors.append(e)
+        finally:
+            _local.graph, _local.task = None, None
+        self._finish(task)
+
+    def _finish(self, task):
+        while task is not None:
+            with self._lock:
+                task.pending -= 1
+                if task.pending > 0:
+                    return
+                task.done = True
+                ready = []
+                for dependent in task.dependents:
+                    dependent.waitingOn -= 1
+                    if dependent.waitingOn == 0:
+                        ready.append(dependent)
+                self._outstanding -= 1
+                self._idle.notify_all()
+            for dependent in ready:
+                self._executor.submit(self._run, dependent)
+            task = task.parent
+
+
+def submit(fn, *args, dependsOn=(), **kwargs):
+    """
+    Runs fn as a child of the current task, or immediately
+    when called outside of a task graph.
+    """
+    graph = getattr(_local, 'graph', None)
+
+    if graph is not None:
+        return graph.submit(fn, *args, dependsOn=dependsOn, **kwargs)
+
+    task = Task(fn, args, kwargs, None)
+    task.result = fn(*args, **kwargs)
+    task.done = True
+    return task
+
+
+def afterChildren(fn, *args, **kwargs):
+    """
+    Runs fn once every task submitted so far by the
+    current task (and all of their children) is done.
+    """
+    current = getattr(_local, 'task', None)
+    dependsOn = list(current.children) if current is not None else []
+    return submit(fn, *args, dependsOn=dependsOn, **kwargs)
+
+
+def run(fn, *args, workers=UNSPECIFIED, **kwargs):
+    """
+    Runs fn and everything it submits, returning once all of it is done.
+
+    Inside a running graph fn is added as a child task instead,
+    so nested exports share the same pool. The number of workers
+    defaults to labstep.config.export.exportWorkers.
+    """
+    if workers is UNSPECIFIED:
+        workers = exportConfig.exportWorkers
+
+    if getattr(_local, 'graph', None) is not None:
+        submit(fn, *args, **kwargs)
+        return
+
+    if workers <= 1:
+        fn(*args, **kwargs)
+        return
+
+    graph = TaskGraph(workers)
+    graph.submit(fn, *args, **kwargs)
+    graph.wait()
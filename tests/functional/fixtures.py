@@ -30,7 +30,7 @@ from labstep.entities.user.model import User
 from labstep.entities.user.repository import getUser, newUser
 from labstep.entities.workspace.model import Workspace
 from labstep.generic.entity.repository import editEntity, getEntity
-from labstep.service.helpers import configService
+from labstep.service.config import configService
 
 import labstep
 
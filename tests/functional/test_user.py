@@ -110,6 +110,17 @@ class TestUser:
         result = user.getResourceItems(count=10)
         assert result[0].id
 
+    # iterMany()
+    def test_iterExperiments(self, user):
+        user.newExperiment(testString)
+        result = next(user.iterExperiments(count=10, prefetch=True))
+        assert result.id
+
+    def test_iterResources(self, user):
+        user.newResource(testString)
+        result = next(user.iterResources(count=10))
+        assert result.id
+
     def test_getResourceCategorys(self, user):
         user.newResourceCategory(testString)
         result = user.getResourceCategorys(count=10)
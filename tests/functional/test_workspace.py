@@ -56,6 +56,12 @@ class TestWorkspace:
         result = entity.getResourceItems()
         assert result[0].id
 
+    def test_iterExperiments(self, entity, user):
+        user.setWorkspace(entity.id)
+        user.newExperiment(testString)
+        result = list(entity.iterExperiments())
+        assert result[0].id
+
     def test_getResourceCategorys(self, entity, user):
         user.setWorkspace(entity.id)
         user.newResourceCategory(testString)
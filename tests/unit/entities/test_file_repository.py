@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+import io
+import json
+from unittest import mock
+
+import pytest
+
+import labstep.config.upload as uploadConfig
+import labstep.entities.file.repository as fileRepository
+from labstep.constants import UNSPECIFIED
+from labstep.entities.file.model import File
+
+
+def makeUser(id=1, activeWorkspace=1):
+    return mock.Mock(token='token', id=id, activeWorkspace=activeWorkspace,
+                     spec=['token', 'id', 'activeWorkspace'])
+
+
+class TestNewFile:
+    def test_sendsUnseekableStreamsWithRequests(self):
+        class Pipe(io.BytesIO):
+            def seekable(self):
+                return False
+
+        with mock.patch('labstep.service.request.requestService') as requestService:
+            requestService.post.return_value = mock.Mock(
+                content=json.dumps({'0': {'id': 1}}))
+            fileRepository.newFile(makeUser(), rawData=Pipe(b'data'))
+
+        kwargs = requestService.post.call_args.kwargs
+        assert kwargs['data'] == {'group_id': 1}
+        assert kwargs['files']['file'][0] == 'file'
+
+    def test_userNewFileTakesExtraParamsPositionally(self):
+        from labstep.entities.user.model import User
+
+        user = User({'id': 1, 'group': {'id': 1}}, None)
+        with mock.patch.object(fileRepository, 'newFile') as newFile:
+            user.newFile('data.csv', UNSPECIFIED, {'is_external': 1})
+
+        assert newFile.call_args.kwargs['extraParams'] == {'is_external': 1}
+
+
+class TestNewFiles:
+    @pytest.fixture
+    def paths(self, tmp_path):
+        paths = []
+        for name, content in [('a', b'1'), ('b', b'2'), ('c', b'1')]:
+            path = tmp_path.joinpath(f'{name}.csv')
+            path.write_bytes(content)
+            paths.append(str(path))
+        return paths
+
+    @pytest.fixture
+    def uploads(self, tmp_path):
+        uploads = []
+
+        def newFile(user, filepath, extraParams={}):
+            uploads.append(filepath)
+            return File({'id': len(uploads), 'name': filepath}, user)
+
+        with mock.patch.object(fileRepository, 'newFile', side_effect=newFile), \
+                mock.patch.object(uploadConfig, 'fileIndexPath', str(tmp_path.joinpath('index'))):
+            yield uploads
+
+    def test_skipsFilesAlreadyUploaded(self, paths, uploads):
+        user = makeUser()
+
+        files = fileRepository.newFiles(user, paths, concurrency=2)
+        assert sorted(uploads) == paths[:2]
+        assert [file.id for file in files] == [files[0].id, files[1].id, files[0].id]
+
+        uploads.clear()
+        again = fileRepository.newFiles(user, paths[1:], concurrency=2)
+        assert uploads == []
+        assert [file.id for file in again] == [files[1].id, files[0].id]
+
+    def test_indexIsKeptPerUserAndParams(self, paths, uploads):
+        fileRepository.newFiles(makeUser(id=1), paths[:1])
+
+        fileRepository.newFiles(makeUser(id=2), paths[:1])
+        assert len(uploads) == 2
+
+        fileRepository.newFiles(makeUser(id=1), paths[:1], extraParams={'is_external': 1})
+        assert len(uploads) == 3
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+import asyncio
+import json
+from unittest import mock
+
+import labstep.generic.entity.asyncRepository as asyncRepository
+from labstep.entities.experiment.model import Experiment
+from labstep.service.asyncRequest import AsyncRequestService
+from labstep.service.entityCache import EntityCache
+
+
+def response(content):
+    return mock.Mock(content=json.dumps(content))
+
+
+class TestAsyncRepository:
+    def setup_method(self):
+        self.user = mock.Mock(token='token', activeWorkspace=1, spec=['token', 'activeWorkspace'])
+
+    def test_getEntity(self):
+        with mock.patch('labstep.service.request.requestService') as requestService:
+            requestService.get.side_effect = lambda url, headers, params=None, useCache=True, stream=False: response(
+                {'id': params['id'], 'name': f"Experiment {params['id']}"})
+
+            async def getMany():
+                return await asyncio.gather(*[
+                    asyncRepository.getEntity(self.user, Experiment, id) for id in range(5)
+                ])
+
+            experiments = asyncio.run(getMany())
+
+        assert [experiment.id for experiment in experiments] == list(range(5))
+        assert all(isinstance(experiment, Experiment) for experiment in experiments)
+
+    def test_getEntities(self):
+        pages = [
+            {'items': [{'id': 1}, {'id': 2}], 'next_cursor': '2'},
+            {'items': [{'id': 3}], 'next_cursor': '-1'},
+        ]
+        with mock.patch('labstep.service.request.requestService') as requestService:
+            requestService.get.side_effect = [response(page) for page in pages]
+            experiments = asyncio.run(
+                asyncRepository.getEntities(self.user, Experiment, count=10))
+
+        assert [experiment.id for experiment in experiments] == [1, 2, 3]
+
+    def test_getEntity_uses_entity_cache(self):
+        cache = EntityCache(ttl=60)
+
+        with mock.patch('labstep.generic.entity.repository.getEntityCache', return_value=cache), \
+                mock.patch('labstep.service.request.requestService') as requestService:
+            requestService.get.return_value = response({'id': 1, 'name': 'Experiment 1'})
+            for i in range(3):
+                experiment = asyncio.run(asyncRepository.getEntity(self.user, Experiment, 1))
+
+        assert requestService.get.call_count == 1
+        assert experiment.name == 'Experiment 1'
+
+    def test_deleteEntity(self):
+        experiment = Experiment({'id': 1}, self.user)
+
+        with mock.patch('labstep.service.request.requestService') as requestService:
+            asyncio.run(asyncRepository.deleteEntity(experiment))
+
+        assert requestService.delete.call_args.args[0].endswith('/experiment-workflow/1')
+
+
+class TestAsyncRequestService:
+    def test_pool_size_follows_session_config(self):
+        with mock.patch('labstep.config.session.poolMaxsize', 7):
+            service = AsyncRequestService()
+            assert service.getExecutor()._max_workers == 7
+
+        service = AsyncRequestService(concurrency=3)
+        assert service.getExecutor()._max_workers == 3
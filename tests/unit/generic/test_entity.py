@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+import copy
+import pickle
+from unittest import mock
+
+import pytest
+
+from labstep.entities.experimentInventoryField.model import ExperimentInventoryField
+from labstep.entities.protocolVersion.model import ProtocolVersion
+from labstep.entities.resourceItem.model import ResourceItem
+from labstep.generic.entity.model import Entity
+from labstep.generic.entityPrimary.model import EntityPrimary
+
+
+class TestEntity:
+    def setup_method(self):
+        self.user = mock.Mock(token='token', activeWorkspace=1, spec=['token', 'activeWorkspace'])
+
+    def test_fields_are_stored_once(self):
+        data = {'id': 1, 'name': 'Buffer', 'resource': {'id': 2}}
+        item = ResourceItem(data, self.user)
+
+        assert item.__data__ is data
+        assert item.name == 'Buffer'
+        assert item['resource'] == {'id': 2}
+        assert vars(item) == {}
+
+    def test_base_classes_have_no_dict(self):
+        for cls in EntityPrimary.__mro__[:-1]:
+            assert '__slots__' in vars(cls)
+
+        with pytest.raises(AttributeError):
+            Entity({'id': 1}, self.user).name = 'Buffer'
+
+    def test_missing_fields(self):
+        item = ResourceItem({'name': 'Buffer'}, self.user)
+
+        assert item.id is None
+        assert item['amount'] is None
+        with pytest.raises(AttributeError):
+            item.amount
+
+    def test_class_attributes_take_precedence(self):
+        field = ExperimentInventoryField(
+            {'id': 1, 'value': '5', 'resource': None}, self.user)
+
+        assert field.amount == '5'
+        assert field.resource is None
+        assert callable(field.edit)
+
+    def test_update_replaces_attributes(self):
+        item = ResourceItem({'id': 1, 'name': 'Buffer'}, self.user)
+        item.name = 'Renamed'
+        item.note = 'kept'
+
+        assert item.name == 'Renamed'
+
+        item.__init__({'id': 1, 'name': 'Buffer 2'}, self.user)
+
+        assert item.name == 'Buffer 2'
+        assert item.note == 'kept'
+
+    def test_protocol_version(self):
+        version = ProtocolVersion({'id': 1, 'name': 'PCR', 'version': 1}, self.user)
+
+        assert version.name == 'PCR v2'
+        assert version.state is None
+
+        version.__init__({'id': 1, 'name': 'PCR', 'version': 2, 'state': {}}, self.user)
+
+        assert version.name == 'PCR v3'
+        assert version.state == {}
+
+    def test_copy_and_pickle(self):
+        item = ResourceItem({'id': 1, 'name': 'Buffer'}, None)
+
+        for clone in (copy.copy(item), copy.deepcopy(item), pickle.loads(pickle.dumps(item))):
+            assert clone.__data__ == item.__data__
+            assert clone.name == 'Buffer'
+
+    def test_dir_and_repr(self):
+        item = ResourceItem({'id': 1, 'name': 'Buffer'}, self.user)
+
+        assert 'name' in dir(item)
+        assert "'name': 'Buffer'" in repr(item)
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+import json as jsonlib
+from unittest import mock
+
+import pytest
+
+from labstep.entities.experiment.model import Experiment
+from labstep.entities.resourceItem.model import ResourceItem
+from labstep.entities.tag.model import Tag
+from labstep.service.helpers import filterUnspecified
+from labstep.service.request import RequestException
+from labstep.generic.entityList.model import EntityList, getPath
+
+
+class TestEntityList:
+    def setup_method(self):
+        self.user = mock.Mock(token='token', activeWorkspace=1, spec=['token', 'activeWorkspace'])
+        self.items = EntityList([
+            {'id': 1, 'name': 'Buffer', 'resource': {'id': 10}, 'tags': ['a']},
+            {'id': 2, 'name': 'Primer', 'resource': {'id': 20}, 'tags': ['b']},
+            {'id': 3, 'name': 'Buffer', 'resource': {'id': 10}},
+        ], ResourceItem, self.user)
+
+    def test_get(self):
+        assert self.items.get('Primer').id == 2
+        assert self.items.get(3, 'id').name == 'Buffer'
+        assert self.items.get('Missing') is None
+
+    def test_get_missing_attribute(self):
+        with pytest.raises(AttributeError):
+            self.items.get(['a'], 'tags')
+        with pytest.raises(AttributeError):
+            self.items.get('a', 'tags')
+
+        assert self.items.get(None, 'resource.name').id == 1
+        assert [item.id for item in self.items.getAll(None, 'tags')] == [3]
+
+    def test_get_does_not_copy_matches(self):
+        with mock.patch.object(EntityList, '_fromEntities') as fromEntities:
+            assert self.items.get('Primer') is self.items[1]
+
+        fromEntities.assert_not_called()
+
+    def test_get_first_of_multiple_matches(self, capsys):
+        assert self.items.get('Buffer').id == 1
+        assert 'multiple matches' in capsys.readouterr().out
+
+    def test_getAll_by_nested_path(self):
+        hits = self.items.getAll(10, 'resource.id')
+
+        assert isinstance(hits, EntityList)
+        assert [item.id for item in hits] == [1, 3]
+        assert len(self.items.getAll(None, 'tags')) == 1
+
+    def test_getAll_unhashable_key(self):
+        assert [item.id for item in self.items.getAll(['a'], 'tags')] == [1]
+
+    def test_groupBy_and_indexBy(self):
+        groups = self.items.groupBy('name')
+
+        assert {name: [item.id for item in group] for name, group in groups.items()} == \
+            {'Buffer': [1, 3], 'Primer': [2]}
+        assert self.items.indexBy('id')[2].name == 'Primer'
+
+    def test_index_built_once(self):
+        with mock.patch('labstep.generic.entityList.model.getPath', wraps=getPath) as wrapped:
+            for i in range(10):
+                self.items.getAll('Primer')
+
+        assert wrapped.call_count == len(self.items)
+
+    def test_updates_outside_list_keep_indexes(self):
+        others = EntityList([{'id': 4, 'name': 'Water'}], ResourceItem, self.user)
+        others.get('Water')
+
+        with mock.patch('labstep.generic.entityList.model.getPath', wraps=getPath) as wrapped:
+            for i in range(10):
+                assert self.items.get('Primer').id == 2
+                ResourceItem.__init__(others[0], {'id': 4, 'name': f'Water {i}'}, self.user)
+
+        assert wrapped.call_count == len(self.items) + 2 * 10
+        assert others.get('Water 9') is others[0]
+
+    def test_mutation_invalidates_indexes(self):
+        assert self.items.get(4, 'id') is None
+
+        self.items.append(ResourceItem({'id': 4, 'name': 'Water'}, self.user))
+        assert self.items.get(4, 'id').name == 'Water'
+
+        del self.items[0]
+        assert self.items.get(1, 'id') is None
+
+        self.items[0] = ResourceItem({'id': 5, 'name': 'Ethanol'}, self.user)
+        assert self.items.get('Ethanol').id == 5
+
+        self.items += [ResourceItem({'id': 6, 'name': 'Salt'}, self.user)]
+        assert self.items.get('Salt').id == 6
+
+    def test_reindex(self):
+        item = self.items.get('Primer')
+        item.name = 'Reverse Primer'
+
+        self.items.reindex()
+
+        assert self.items.get('Reverse Primer') is item
+
+
+class TestBulkOperations:
+    def setup_method(self):
+        self.user = mock.Mock(token='token', activeWorkspace=1, spec=['token', 'activeWorkspace'])
+        self.experiments = EntityList(
+            [{'id': i, 'name': f'Experiment {i}'} for i in range(1, 11)], Experiment, self.user)
+
+    def put(self, url, headers, json=None):
+        id = int(url.rstrip('/').split('/')[-1])
+        if id == 3:
+            raise RequestException(500, 'Server error')
+        return mock.Mock(content=jsonlib.dumps({'id': id, 'name': f'Experiment {id}', **filterUnspecified(json or {})}))
+
+    def test_delete_reports_each_item(self):
+        with mock.patch('labstep.service.request.requestService') as requestService:
+            requestService.put.side_effect = self.put
+            result = self.experiments.delete(concurrency=4)
+
+        assert requestService.put.call_count == 10
+        assert not result.ok
+        assert [experiment.id for experiment in result.succeeded] == [1, 2, 4, 5, 6, 7, 8, 9, 10]
+        assert [experiment.id for experiment, error in result.failed] == [3]
+        assert isinstance(result.results[2], RequestException)
+        assert self.experiments.get(1, 'id').deleted_at is not None
+
+    def test_edit(self):
+        with mock.patch('labstep.service.request.requestService') as requestService:
+            requestService.put.side_effect = self.put
+            result = self.experiments.filter(lambda e: e.id != 3).edit(name='Renamed')
+
+        assert result.ok and len(result) == 9
+        assert self.experiments.get('Renamed').id == 1
+
+    def test_edit_of_sub_list_updates_parent_indexes(self):
+        assert self.experiments.get('Experiment 1').id == 1
+        groups = self.experiments.groupBy('id')
+
+        with mock.patch('labstep.service.request.requestService') as requestService:
+            requestService.put.side_effect = self.put
+            groups[1].edit(name='Renamed')
+
+        assert self.experiments.get('Experiment 1') is None
+        assert self.experiments.get('Renamed').id == 1
+
+    def test_edits_between_lookups_keep_indexes(self):
+        with mock.patch('labstep.service.request.requestService') as requestService, \
+                mock.patch('labstep.generic.entityList.model.getPath', wraps=getPath) as wrapped:
+            requestService.put.side_effect = self.put
+            for id in [4, 2, 7]:
+                self.experiments.get(f'Experiment {id}').edit(name='Renamed')
+
+        # Each edit moves one entity, rather than rebuilding the index.
+        assert wrapped.call_count == len(self.experiments) + 2 * 3
+        assert self.experiments.get('Experiment 4') is None
+        assert [experiment.id for experiment in self.experiments.getAll('Renamed')] == [2, 4, 7]
+        assert self.experiments.get('Experiment 5').id == 5
+
+    def test_addTag_looks_up_tag_once(self):
+        tag = Tag({'id': 99, 'name': 'Done'}, self.user)
+
+        with mock.patch('labstep.entities.tag.repository.getOrCreateTag', return_value=tag) as getOrCreateTag, \
+                mock.patch('labstep.entities.tag.repository.addTagTo') as addTagTo:
+            result = self.experiments.addTag('Done')
+
+        getOrCreateTag.assert_called_once_with(self.user, 'Done', Experiment)
+        assert addTagTo.call_count == 10
+        assert result.ok
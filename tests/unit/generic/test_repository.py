@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+import json
+from unittest import mock
+
+import labstep.generic.entity.repository as entityRepository
+from labstep.entities.resource.model import Resource
+from labstep.constants import UNSPECIFIED
+
+
+def response(content):
+    return mock.Mock(content=json.dumps(content))
+
+
+class TestRepository:
+    def setup_method(self):
+        self.user = mock.Mock(token='token', activeWorkspace=1, spec=['token', 'activeWorkspace'])
+
+    def test_filterEntitiesConcurrently(self, capsys):
+        def post(url, headers, json, params=None):
+            page = json['page']
+            size = json['count'] if page < 4 else 3
+            start = (page - 1) * json['count']
+            return response({'items': [{'id': start + i} for i in range(size)]})
+
+        with mock.patch('labstep.service.request.requestService') as requestService:
+            requestService.post.side_effect = post
+            resources = entityRepository.filterEntities(
+                self.user, Resource, [], pageSize=10, concurrency=3)
+
+        assert [resource.id for resource in resources] == list(range(33))
+        assert capsys.readouterr().out == ''
+
+    def test_getEntitiesConcurrently(self):
+        def get(url, headers, params):
+            if 'get_count' in params:
+                return response(125)
+            start = (params['page'] - 1) * params['count']
+            end = min(start + params['count'], 125)
+            return response({'items': [{'id': i} for i in range(start, end)]})
+
+        with mock.patch('labstep.service.request.requestService') as requestService:
+            requestService.get.side_effect = get
+            resources = entityRepository.getEntities(
+                self.user, Resource, 110, concurrency=4)
+
+        assert [resource.id for resource in resources] == list(range(110))
+
+    def test_getEntitiesConcurrently_listing_without_pages(self):
+        def get(url, headers, params):
+            if 'get_count' in params:
+                return response(25)
+            if 'cursor' in params:
+                start = int(params['cursor']) + 1
+                end = min(start + params['count'], 25)
+                return response({'items': [{'id': i} for i in range(start, end)],
+                                 'next_cursor': str(end - 1) if end < 25 else '-1'})
+            # The page parameter is ignored.
+            return response({'items': [{'id': i} for i in range(10)]})
+
+        with mock.patch('labstep.service.request.requestService') as requestService:
+            requestService.get.side_effect = get
+            resources = entityRepository.getEntities(
+                self.user, Resource, UNSPECIFIED, pageSize=10, concurrency=4)
+
+        assert [resource.id for resource in resources] == list(range(25))
+
+    def test_iterEntities(self):
+        pages = [
+            {'items': [{'id': 1}, {'id': 2}], 'next_cursor': '2'},
+            {'items': [{'id': 3}], 'next_cursor': '-1'},
+        ]
+        with mock.patch('labstep.service.request.requestService') as requestService:
+            requestService.get.side_effect = [response(page) for page in pages]
+            resources = entityRepository.iterEntities(
+                self.user, Resource, UNSPECIFIED, prefetch=True)
+
+            assert next(resources).id == 1
+            assert [resource.id for resource in resources] == [2, 3]
+            assert requestService.get.call_count == 2
+
+    def test_getEntitiesPageSizeAndSerializerGroups(self):
+        with mock.patch('labstep.service.request.requestService') as requestService:
+            requestService.get.return_value = response(
+                {'items': [{'id': 1}], 'next_cursor': '-1'})
+            entityRepository.getEntities(
+                self.user, Resource, UNSPECIFIED, pageSize=200, serializerGroups=['default', 'resource_metadatas'])
+
+        params = requestService.get.call_args.kwargs['params']
+        assert params['count'] == 200
+        assert params['serializerGroups'] == 'default,resource_metadatas'
+
+    def test_getEntitiesKeepsSerializerGroupsInFilterParams(self):
+        with mock.patch('labstep.service.request.requestService') as requestService:
+            requestService.get.return_value = response(
+                {'items': [{'id': 1}], 'next_cursor': '-1'})
+            entityRepository.getEntities(
+                self.user, Resource, UNSPECIFIED, {'serializerGroups': 'default'})
+
+        params = requestService.get.call_args.kwargs['params']
+        assert params['serializerGroups'] == 'default'
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+import json
+from unittest import mock
+
+import labstep.generic.entity.repository as entityRepository
+import labstep.service.request as request
+from labstep.entities.experiment.model import Experiment
+from labstep.service.client import Client, getRequestService
+from labstep.service.config import configService
+
+
+class TestClient:
+    def test_sessionPoolSize(self):
+        client = Client(pool_connections=2, pool_maxsize=48, timeout=5)
+        adapter = client.requestService.session.get_adapter('https://api.labstep.com')
+
+        assert adapter._pool_maxsize == 48
+        assert adapter._pool_connections == 2
+        assert adapter.timeout == 5
+        assert client.requestService.session is not request.http
+
+    def test_userRequestsUseTheirClient(self):
+        client = Client()
+        user = mock.Mock(token='token', activeWorkspace=1, __client__=client,
+                         spec=['token', 'activeWorkspace', '__client__'])
+        response = mock.Mock(content=json.dumps({'id': 1}))
+
+        with mock.patch.object(client.requestService, '_session') as session, \
+                mock.patch('labstep.service.request.http') as http:
+            session.get.return_value = response
+            entityRepository.getEntity(user, Experiment, 1)
+
+        assert session.get.call_count == 1
+        assert http.get.call_count == 0
+        assert getRequestService(mock.Mock(spec=[])) is request.requestService
+
+    def test_clientsWithDifferentHosts(self):
+        staging = Client(host='https://staging.example.com', user_agent='staging-job')
+        production = Client()
+        users = [
+            mock.Mock(token='token', activeWorkspace=1, __client__=client,
+                      spec=['token', 'activeWorkspace', '__client__'])
+            for client in (staging, production)
+        ]
+        response = mock.Mock(content=json.dumps({'id': 1}))
+
+        with mock.patch.object(staging.requestService, '_session') as stagingSession, \
+                mock.patch.object(production.requestService, '_session') as productionSession:
+            stagingSession.get.return_value = response
+            productionSession.get.return_value = response
+            for user in users:
+                entityRepository.getEntity(user, Experiment, 1)
+
+        stagingCall = stagingSession.get.call_args
+        assert stagingCall.args[0].startswith('https://staging.example.com/')
+        assert stagingCall.kwargs['headers']['User-Agent'] == 'staging-job'
+        assert productionSession.get.call_args.args[0].startswith(configService.getHost())
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+import subprocess
+import sys
+from unittest import mock
+from labstep.service.config import ConfigService
+
+
+def runPython(code, cwd, env={}):
+    return subprocess.run(
+        [sys.executable, '-c', code], cwd=cwd, capture_output=True, text=True, check=True,
+        env={'PATH': '', 'PYTHONPATH': ':'.join(sys.path), **env}).stdout
+
+
+class TestConfigService:
+    def test_import_does_not_load_dotenv(self, tmp_path):
+        (tmp_path / '.env').write_text('LABSTEP_API_URL=https://api.example.com\n')
+
+        output = runPython(
+            'import os, sys, labstep; '
+            'print("dotenv" in sys.modules, os.getenv("LABSTEP_API_URL"))', tmp_path)
+
+        assert output == 'False None\n'
+
+    def test_dotenv_loaded_on_first_use(self, tmp_path):
+        (tmp_path / '.env').write_text('LABSTEP_API_URL=https://api.example.com\n')
+
+        output = runPython(
+            'from labstep.service.config import configService; '
+            'print(configService.getHost())', tmp_path)
+
+        assert output.splitlines()[-1] == 'https://api.example.com'
+
+    def test_configure_takes_precedence_over_environment(self, tmp_path):
+        (tmp_path / '.env').write_text('LABSTEP_API_URL=https://api.example.com\n')
+
+        output = runPython(
+            'import labstep; '
+            'from labstep.service.config import configService; '
+            'labstep.configure(host="https://other.example.com", user_agent="Test"); '
+            'print(configService.getHost(), configService.getUserAgent())', tmp_path)
+
+        assert output.splitlines()[-1] == 'https://other.example.com Test'
+
+    def test_loads_once(self):
+        config = ConfigService()
+
+        with mock.patch('dotenv.load_dotenv') as load_dotenv, \
+                mock.patch.dict('os.environ', clear=True):
+            config.getHost()
+            config.getHost()
+            config.getEnv('LABSTEP_API_KEY')
+
+            assert load_dotenv.call_count == 1
+            assert config.getHost() == 'https://api.labstep.com'
+
+            config.reload('/path/to/.env')
+            config.getHost()
+
+            assert load_dotenv.call_count == 2
+            assert load_dotenv.call_args.kwargs == {'dotenv_path': '/path/to/.env'}
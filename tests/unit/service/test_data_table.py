@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+import json
+from unittest import mock
+
+import numpy
+import pandas
+
+from labstep.entities.experimentTable.model import ExperimentTable
+from labstep.entities.protocolTable.model import ProtocolTable
+from labstep.service.helpers import (
+    DataFrameSheets,
+    dataFramesToData,
+    dataFrameToDataTable,
+    dataTableToDataFrame,
+    getDataTable,
+)
+
+
+class TestDataTable:
+    def test_dataTableToDataFrame_keeps_dtypes(self):
+        df = dataTableToDataFrame({
+            '0': {'0': {'value': 'Well'}, '1': {'value': 'OD'}, '2': {'value': 'Count'}},
+            '1': {'0': {'value': ' A1 '}, '1': {'value': 0.5}, '2': {'value': 3}},
+            '2': {'0': {'value': 'A2'}, '1': {'value': 1.5}, '2': {'value': 4}},
+        })
+
+        assert list(df.columns) == ['Well', 'OD', 'Count']
+        assert df['Well'].tolist() == ['A1', 'A2']
+        assert df['OD'].dtype == numpy.float64
+        assert df['Count'].dtype == numpy.int64
+
+    def test_dataTableToDataFrame_sparse(self):
+        df = dataTableToDataFrame({
+            0: {0: {'value': 'A'}, 1: {'value': 'B'}},
+            10: {1: {'value': 2}},
+            2: {0: {'value': 'x'}, 3: {'value': 'unnamed'}},
+        })
+
+        assert list(df.columns) == ['A', 'B', '3']
+        assert df['A'][0] == 'x' and pandas.isna(df['A'][1])
+        assert df['B'].isna().tolist() == [True, False]
+        assert df['B'][1] == 2
+
+    def test_dataTableToDataFrame_list_rows(self):
+        df = dataTableToDataFrame([[{'value': 'A'}], [{'value': 1}], [{}]])
+
+        assert df['A'].isna().tolist() == [False, True]
+
+    def test_dataFrameToDataTable(self):
+        df = pandas.DataFrame({
+            'Well': ['A1', None],
+            'OD': [0.5, numpy.nan],
+            'Count': numpy.array([3, 4], dtype=numpy.int64),
+            'Read at': pandas.to_datetime(['2024-01-02', None]),
+        }, index=[5, 9])
+
+        data = dataFrameToDataTable(df)
+
+        assert data['rowCount'] == 3 and data['columnCount'] == 4
+        assert data['data']['dataTable'] == {
+            '0': {'0': {'value': 'Well'}, '1': {'value': 'OD'},
+                  '2': {'value': 'Count'}, '3': {'value': 'Read at'}},
+            '1': {'0': {'value': 'A1'}, '1': {'value': 0.5},
+                  '2': {'value': 3}, '3': {'value': '2024-01-02T00:00:00'}},
+            '2': {'2': {'value': 4}},
+        }
+        json.dumps(data)
+
+    def test_dataFrameToDataTable_counts_header_and_omits_missing_cells(self):
+        df = pandas.DataFrame({'OD': [numpy.nan, 0.5, numpy.nan], 'Well': [None, 'A2', 'A3']})
+
+        data = dataFrameToDataTable(df)
+
+        assert data['rowCount'] == len(df) + 1
+        assert data['data']['dataTable']['1'] == {}
+        assert data['data']['dataTable']['3'] == {'1': {'value': 'A3'}}
+        assert dataFrameToDataTable(df.iloc[:0])['rowCount'] == 1
+
+    def test_round_trip(self):
+        df = pandas.DataFrame({'Well': ['A1', 'A2'], 'OD': [0.5, 1.5]})
+
+        result = dataTableToDataFrame(dataFrameToDataTable(df)['data']['dataTable'])
+
+        pandas.testing.assert_frame_equal(result, df)
+
+    def test_getDataTable(self):
+        dataTable = {'0': {}}
+
+        assert getDataTable({'data': {'dataTable': dataTable}}) is dataTable
+        assert getDataTable(
+            {'sheets': {'Plate 2': {'data': {'dataTable': dataTable}}}}, 'Plate 2') is dataTable
+
+
+def getSheet(name, value):
+    return {'name': name, 'rowCount': 2, 'columnCount': 1, 'style': {'font': 'Arial'},
+            'data': {'dataTable': {'0': {'0': {'value': 'OD'}}, '1': {'0': {'value': value}}}}}
+
+
+class TestSheets:
+    def setup_method(self):
+        self.user = mock.Mock(token='token', activeWorkspace=1, spec=['token', 'activeWorkspace'])
+        self.data = {'sheetCount': 2, 'sheets': {
+            'Plate 1': getSheet('Plate 1', 0.1), 'Plate 2': getSheet('Plate 2', 0.2)}}
+
+    def test_sheets_are_converted_once_on_access(self):
+        table = ExperimentTable({'id': 1, 'data': self.data}, self.user)
+
+        with mock.patch('labstep.service.helpers.dataTableToDataFrame',
+                        wraps=dataTableToDataFrame) as convert:
+            dataFrames = table.getDataFrames()
+            assert list(dataFrames) == ['Plate 1', 'Plate 2']
+            assert convert.call_count == 0
+
+            assert dataFrames['Plate 2']['OD'][0] == 0.2
+            assert table.getDataFrame('Plate 2')['OD'][0] == 0.2
+            assert table.getDataFrames() is dataFrames
+            assert convert.call_count == 1
+
+        assert 'Plate 3' not in dataFrames
+
+    def test_cache_dropped_when_data_changes(self):
+        table = ProtocolTable({'id': 1, 'data': self.data}, self.user)
+        dataFrames = table.getDataFrames()
+
+        table.__init__({'id': 1, 'data': {'data': getSheet('Sheet1', 1)['data']}}, self.user)
+
+        assert table.getDataFrames() is not dataFrames
+        assert list(table.getDataFrames()) == ['Sheet1']
+        assert table.getDataFrame()['OD'][0] == 1
+
+    def test_dataFramesToData_keeps_other_sheets(self):
+        data = dataFramesToData({
+            'Plate 2': pandas.DataFrame({'OD': [0.5, 0.6]}),
+            'Plate 3': pandas.DataFrame({'Count': [1]}),
+        }, self.data)
+
+        assert data['sheetCount'] == 3
+        assert list(data['sheets']) == ['Plate 1', 'Plate 2', 'Plate 3']
+        assert data['sheets']['Plate 1'] == {**self.data['sheets']['Plate 1'], 'index': 0}
+        assert data['sheets']['Plate 2']['style'] == {'font': 'Arial'}
+        assert data['sheets']['Plate 2']['rowCount'] == 3
+        assert data['sheets']['Plate 3']['index'] == 2
+        assert 'index' not in self.data['sheets']['Plate 1']
+        assert DataFrameSheets(data)['Plate 2']['OD'].tolist() == [0.5, 0.6]
+
+    def test_dataFramesToData_keeps_single_sheet(self):
+        single = {k: v for k, v in getSheet('Sheet1', 1).items() if k != 'name'}
+
+        data = dataFramesToData({'Plate 2': pandas.DataFrame({'OD': [0.5]})}, single)
+
+        assert list(data['sheets']) == ['Sheet1', 'Plate 2']
+        assert data['sheets']['Sheet1'] == {**single, 'name': 'Sheet1', 'index': 0}
+        assert 'data' not in data and 'rowCount' not in data
+        assert DataFrameSheets(data)['Sheet1']['OD'].tolist() == [1]
+
+    def test_getDataFrame_of_single_sheet_ignores_name(self):
+        table = ExperimentTable({'id': 1, 'data': {'data': getSheet('Sheet1', 1)['data']}}, self.user)
+
+        assert table.getDataFrame('Plate 1')['OD'][0] == 1
+
+    def test_setDataFrames(self):
+        table = ExperimentTable({'id': 1, 'guid': 'guid', 'data': self.data}, self.user)
+
+        with mock.patch('labstep.generic.entity.repository.editEntity') as editEntity:
+            table.setDataFrames({'Plate 1': pandas.DataFrame({'OD': [1.0]})})
+
+        data = editEntity.call_args.args[1]['data']
+        assert DataFrameSheets(data)['Plate 1']['OD'].tolist() == [1.0]
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+import hashlib
+import json
+from unittest import mock
+
+import pytest
+
+import labstep.service.download as download
+
+
+def streamingResponse(body, chunkSize=4):
+    response = mock.Mock(status_code=200)
+    response.headers = {'Content-Length': str(len(body))}
+    response.iter_content.side_effect = lambda chunk_size: (
+        body[i:i + chunkSize] for i in range(0, len(body), chunkSize))
+    return response
+
+
+class TestDownload:
+    def test_streamsToPath(self, tmp_path):
+        body = b'0123456789abcdef!'
+        progress = []
+        target = tmp_path.joinpath('data.bin')
+
+        with mock.patch.object(download.request, 'requestService') as requestService:
+            requestService.get.return_value = streamingResponse(body)
+            digest = download.downloadToPath(
+                'https://files', target,
+                progress=lambda done, total: progress.append((done, total)),
+                checksum=hashlib.sha256(body).hexdigest())
+
+        assert requestService.get.call_args.kwargs['stream'] is True
+        assert target.read_bytes() == body
+        assert digest == hashlib.sha256(body).hexdigest()
+        assert progress[0] == (4, len(body))
+        assert progress[-1] == (len(body), len(body))
+        assert not download.getPartPath(target).exists()
+
+    def test_checksumMismatch(self, tmp_path):
+        target = tmp_path.joinpath('data.bin')
+
+        with mock.patch.object(download.request, 'requestService') as requestService:
+            requestService.get.return_value = streamingResponse(b'corrupt')
+            with pytest.raises(download.ChecksumError):
+                download.downloadToPath(
+                    'https://files', target, checksum='0' * 64)
+
+        assert not target.exists()
+        assert not download.getPartPath(target).exists()
+
+
+class RangeServer:
+    """
+    Serves body with Range support, optionally expiring
+    the first URL and dropping the connection once.
+    """
+
+    def __init__(self, body, expiredUrl=None, dropAfter=None):
+        self.body = body
+        self.expiredUrl = expiredUrl
+        self.dropAfter = dropAfter
+        self.ranges = []
+
+    def get(self, url, headers=None, stream=False):
+        if url == self.expiredUrl:
+            raise download.RequestException(403, 'Request has expired')
+
+        if 'Range' not in headers:
+            self.ranges.append(None)
+            return streamingResponse(self.body)
+
+        start, _, end = headers['Range'][len('bytes='):].partition('-')
+        start, end = int(start), int(end)
+        self.ranges.append((start, end))
+        chunk = self.body[start:end + 1]
+
+        response = mock.Mock(status_code=206)
+        response.headers = {
+            'Content-Range': f'bytes {start}-{end}/{len(self.body)}',
+            'ETag': '"v1"',
+        }
+
+        def iterContent(chunk_size):
+            for i in range(0, len(chunk), 2):
+                if self.dropAfter is not None and i >= 2:
+                    self.dropAfter = None
+                    raise download.requests.exceptions.ChunkedEncodingError()
+                yield chunk[i:i + 2]
+
+        response.iter_content.side_effect = iterContent
+        return response
+
+
+class TestRangedDownload:
+    @pytest.fixture(autouse=True)
+    def smallParts(self):
+        with mock.patch.object(download.downloadConfig, 'partSize', 5):
+            yield
+
+    def test_refreshesExpiredUrlAndRetries(self, tmp_path):
+        body = b'abcdefghijklmnopqrstuvwxyz'
+        server = RangeServer(body, expiredUrl='https://expired', dropAfter=1)
+        target = tmp_path.joinpath('data.bin')
+
+        with mock.patch.object(download.request, 'requestService', server):
+            digest = download.downloadToPath(
+                'https://expired', target, workers=3,
+                refreshUrl=lambda: 'https://fresh')
+
+        assert target.read_bytes() == body
+        assert digest == hashlib.sha256(body).hexdigest()
+        assert not download.getStatePath(target).exists()
+
+    def test_resumesCompletedParts(self, tmp_path):
+        body = b'abcdefghijklmnopqrstuvwxyz'
+        server = RangeServer(body)
+        target = tmp_path.joinpath('data.bin')
+
+        partPath = download.getPartPath(target)
+        partPath.write_bytes(body[:10] + bytes(len(body) - 10))
+        download.getStatePath(target).write_text(json.dumps(
+            {'size': len(body), 'etag': '"v1"', 'partSize': 5, 'parts': [0, 1]}))
+
+        with mock.patch.object(download.request, 'requestService', server):
+            digest = download.downloadToPath('https://file', target, workers=1)
+
+        assert target.read_bytes() == body
+        assert digest == hashlib.sha256(body).hexdigest()
+        assert min(start for start, end in server.ranges[1:]) == 10
+
+    def test_streamsSinglePartInOneRequest(self, tmp_path):
+        body = b'abcde'
+        server = RangeServer(body)
+        target = tmp_path.joinpath('data.bin')
+
+        with mock.patch.object(download.request, 'requestService', server):
+            digest = download.downloadToPath('https://file', target)
+
+        assert target.read_bytes() == body
+        assert digest == hashlib.sha256(body).hexdigest()
+        assert server.ranges == [(0, 0), None]
+
+    def test_hashesPartsAsTheyAreWritten(self, tmp_path):
+        body = b'abcdefghijklmnopqrstuvwxyz'
+        target = tmp_path.joinpath('data.bin')
+
+        with mock.patch.object(download.request, 'requestService', RangeServer(body)), \
+                mock.patch('builtins.open', wraps=open) as opened:
+            download.downloadToPath('https://file', target, workers=3)
+
+        assert 'rb' not in [call.args[1] for call in opened.call_args_list]
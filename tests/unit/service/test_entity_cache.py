@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+import json
+from unittest import mock
+
+import labstep.generic.entity.repository as entityRepository
+import labstep.service.request as request
+from labstep.entities.experiment.model import Experiment
+from labstep.entities.user.model import User
+from labstep.service.entityCache import EntityCache
+from labstep.service.metrics import RequestEvent
+
+
+class TestEntityCache:
+    def test_hitsAndMisses(self):
+        cache = EntityCache()
+        assert cache.get('experiment-workflow', 1) is None
+        cache.set('experiment-workflow', {'id': 1, 'guid': 'abc'})
+        assert cache.get('experiment-workflow', 1) == {'id': 1, 'guid': 'abc'}
+        assert cache.get('experiment-workflow', 'abc') == {'id': 1, 'guid': 'abc'}
+        assert cache.getStats() == {'hits': 2, 'misses': 1, 'size': 2}
+
+    def test_ttl(self):
+        cache = EntityCache(ttl=10)
+        with mock.patch('time.monotonic', return_value=0):
+            cache.set('file', {'id': 1})
+        with mock.patch('time.monotonic', return_value=11):
+            assert cache.get('file', 1) is None
+
+    def test_lruEviction(self):
+        cache = EntityCache(maxSize=2)
+        cache.set('file', {'id': 1})
+        cache.set('file', {'id': 2})
+        cache.get('file', 1)
+        cache.set('file', {'id': 3})
+        assert cache.get('file', 2) is None
+        assert cache.get('file', 1) is not None
+
+    def test_invalidateOnEdit(self):
+        user = mock.Mock(token='token', spec=['token', '_entityCache'])
+        user._entityCache = EntityCache()
+
+        with mock.patch('labstep.service.request.requestService') as requestService:
+            requestService.get.return_value = mock.Mock(
+                content=json.dumps({'id': 1, 'name': 'before'}))
+            requestService.put.return_value = mock.Mock(
+                content=json.dumps({'id': 1, 'name': 'after'}))
+
+            experiment = entityRepository.getEntity(user, Experiment, 1)
+            entityRepository.getEntity(user, Experiment, 1)
+            assert requestService.get.call_count == 1
+
+            entityRepository.editEntity(experiment, {'name': 'after'})
+            entityRepository.getEntity(user, Experiment, 1)
+            assert requestService.get.call_count == 2
+
+    def test_updateBypassesCache(self):
+        user = mock.Mock(token='token', spec=['token', '_entityCache'])
+        user._entityCache = EntityCache()
+
+        with mock.patch('labstep.service.request.requestService') as requestService:
+            requestService.get.return_value = mock.Mock(
+                content=json.dumps({'id': 1, 'comments': []}))
+            experiment = entityRepository.getEntity(user, Experiment, 1)
+
+            requestService.get.return_value = mock.Mock(
+                content=json.dumps({'id': 1, 'comments': [{'id': 2}]}))
+            experiment.update()
+
+        assert requestService.get.call_count == 2
+        assert experiment.comments == [{'id': 2}]
+        assert entityRepository.getEntity(user, Experiment, 1).comments == [{'id': 2}]
+
+    def test_clearedAfterWrites(self):
+        cache = EntityCache()
+        cache.set('experiment-workflow', {'id': 1})
+
+        cache.afterRequest(RequestEvent('GET', 'https://api.labstep.com/api/generic/comment'))
+        assert cache.get('experiment-workflow', 1) is not None
+
+        cache.afterRequest(RequestEvent('POST', 'https://api.labstep.com/api/generic/comment'))
+        assert cache.get('experiment-workflow', 1) is None
+
+    def test_enableRegistersHook(self):
+        user = User({'id': 1})
+        cache = user.enableEntityCache()
+        assert cache in request.requestService.hooks
+
+        user.disableEntityCache()
+        assert cache not in request.requestService.hooks
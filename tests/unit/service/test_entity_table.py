@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+from unittest import mock
+
+import pytest
+
+from labstep.entities.resourceItem.model import ResourceItem
+from labstep.generic.entityList.model import EntityList
+from labstep.service.entityTable import getColumns, iterDataFrames, parsePath, WILDCARD
+
+
+def getPayloads():
+    return [
+        {'id': 1, 'name': 'Buffer', 'created_at': '2024-01-02T03:04:05+00:00',
+         'resource': {'id': 10, 'name': 'PBS'},
+         'metadata_thread': {'metadatas': [{'label': 'pH'}, {'label': 'Volume'}]}},
+        {'id': 2, 'name': 'Primer', 'created_at': None,
+         'resource': None,
+         'metadata_thread': {'metadatas': []}},
+    ]
+
+
+class TestEntityTable:
+    def setup_method(self):
+        self.user = mock.Mock(token='token', activeWorkspace=1, spec=['token', 'activeWorkspace'])
+        self.items = EntityList(getPayloads(), ResourceItem, self.user)
+
+    def test_parsePath(self):
+        assert parsePath('metadata_thread.metadatas[*].label') == \
+            ['metadata_thread', 'metadatas', WILDCARD, 'label']
+        assert parsePath('tags[-1].name') == ['tags', -1, 'name']
+
+    def test_default_columns_flatten_objects(self):
+        columns = getColumns(getPayloads(), parseDates=False)
+
+        assert list(columns) == ['id', 'name', 'created_at', 'resource.id',
+                                 'resource.name', 'metadata_thread.metadatas', 'resource']
+        assert columns['resource.name'] == ['PBS', None]
+
+    def test_selected_columns(self):
+        columns = getColumns(self.items, {
+            'item': 'name',
+            'labels': 'metadata_thread.metadatas[*].label',
+            'firstLabel': 'metadata_thread.metadatas[0].label',
+        })
+
+        assert columns == {
+            'item': ['Buffer', 'Primer'],
+            'labels': [['pH', 'Volume'], []],
+            'firstLabel': ['pH', None],
+        }
+
+    def test_columns_with_invalid_dates_are_left_as_strings(self):
+        payloads = getPayloads() + [{'id': 3, 'created_at': 'yesterday'}]
+        columns = getColumns(payloads, ['created_at'])
+
+        assert columns['created_at'] == ['2024-01-02T03:04:05+00:00', None, 'yesterday']
+        assert getColumns(payloads[:1], ['created_at'])['created_at'][0].year == 2024
+
+    def test_toDataFrame(self):
+        df = self.items.toDataFrame(columns=['id', 'resource.name', 'created_at'])
+
+        assert list(df.columns) == ['id', 'resource.name', 'created_at']
+        assert str(df['id'].dtype) == 'int64'
+        assert str(df['created_at'].dt.tz) == 'UTC'
+        assert df['created_at'][0].hour == 3
+
+    def test_toDataFrame_without_date_parsing(self):
+        df = self.items.toDataFrame(columns=['created_at'], parse_dates=False)
+
+        assert df['created_at'][0] == '2024-01-02T03:04:05+00:00'
+
+    def test_iterDataFrames(self):
+        payloads = [{'id': i, 'name': f'Item {i}'} for i in range(25)]
+        entities = (ResourceItem(payload, self.user) for payload in payloads)
+
+        frames = list(iterDataFrames(entities, chunkSize=10))
+
+        assert [len(df) for df in frames] == [10, 10, 5]
+        assert frames[2]['name'].tolist()[-1] == 'Item 24'
+
+    def test_toArrow(self):
+        pyarrow = pytest.importorskip('pyarrow')
+
+        table = self.items.toArrow(columns=['id', 'created_at'])
+
+        assert table.column('id').to_pylist() == [1, 2]
+        assert pyarrow.types.is_timestamp(table.schema.field('created_at').type)
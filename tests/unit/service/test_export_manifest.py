@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+from unittest import mock
+
+import pytest
+
+import labstep.entities.workspace.repository as workspaceRepository
+from labstep.service.exportManifest import ExportManifest
+
+
+class FakeEntity:
+    __entityName__ = 'experiment-workflow'
+
+    def __init__(self, id, updated_at, exports):
+        self.id = id
+        self.name = f'Entity {id}'
+        self.updated_at = updated_at
+        self.exports = exports
+
+    def __getitem__(self, key):
+        return getattr(self, key, None)
+
+    def export(self, rootPath):
+        if self.updated_at == 'broken':
+            raise Exception('export failed')
+        self.exports.append(self.id)
+        folder = rootPath.joinpath(f'{self.id} - {self.name}')
+        folder.mkdir(parents=True, exist_ok=True)
+        folder.joinpath('entity.json').write_text(self.updated_at)
+
+
+class FakeProtocol(FakeEntity):
+    __entityName__ = 'protocol-collection'
+
+
+def export(entities, rootPath, **kwargs):
+    workspaceRepository.exportWorkspaceEntities(
+        entities, rootPath, type(entities[0]).__entityName__, incremental=True, **kwargs)
+
+
+class TestExportManifest:
+    @pytest.fixture(autouse=True)
+    def nameInFolder(self):
+        with mock.patch('labstep.generic.entity.repository.entityNameInFolderName', True):
+            yield
+
+    def test_incrementalExportSkipsUnchanged(self, tmp_path):
+        exports = []
+        entities = [FakeEntity(1, '2024-01-01', exports),
+                    FakeEntity(2, '2024-01-01', exports)]
+
+        export(entities, tmp_path, workers=2)
+        assert sorted(exports) == [1, 2]
+
+        exports.clear()
+        entities[1].updated_at = '2024-02-01'
+        export(entities, tmp_path, workers=2)
+        assert exports == [2]
+
+    def test_verifyDetectsModifiedFiles(self, tmp_path):
+        exports = []
+        entity = FakeEntity(1, '2024-01-01', exports)
+        export([entity], tmp_path, workers=1)
+
+        tmp_path.joinpath('1 - Entity 1', 'entity.json').write_text('edited')
+
+        assert ExportManifest(tmp_path).isUnchanged(entity)
+        assert not ExportManifest(tmp_path).isUnchanged(entity, verify=True)
+
+    def test_removesDeletedEntities(self, tmp_path):
+        exports = []
+        entities = [FakeEntity(1, '2024-01-01', exports),
+                    FakeEntity(2, '2024-01-01', exports)]
+        export(entities, tmp_path, workers=1)
+
+        export(entities[:1], tmp_path, workers=1)
+
+        assert tmp_path.joinpath('1 - Entity 1').exists()
+        assert not tmp_path.joinpath('2 - Entity 2').exists()
+        assert list(ExportManifest(tmp_path).entries) == ['experiment-workflow:1']
+        assert not tmp_path.joinpath('.labstep-staging').exists()
+
+    def test_keepsOtherEntitiesInTheSameFolder(self, tmp_path):
+        exports = []
+        export([FakeEntity(1, '2024-01-01', exports)], tmp_path, workers=1)
+        export([FakeProtocol(1, '2024-01-01', exports)], tmp_path, workers=1)
+
+        assert sorted(ExportManifest(tmp_path).entries) == [
+            'experiment-workflow:1', 'protocol-collection:1']
+
+    def test_filteredExportKeepsEntitiesLeftOut(self, tmp_path):
+        exports = []
+        entities = [FakeEntity(1, '2024-01-01', exports),
+                    FakeEntity(2, '2024-01-01', exports)]
+        export(entities, tmp_path, workers=1)
+
+        export(entities[:1], tmp_path, workers=1, removeMissing=False)
+
+        assert tmp_path.joinpath('2 - Entity 2').exists()
+
+    def test_failedExportKeepsPreviousCopy(self, tmp_path):
+        exports = []
+        entity = FakeEntity(1, '2024-01-01', exports)
+        export([entity], tmp_path, workers=1)
+
+        entity.updated_at = 'broken'
+        with pytest.raises(Exception, match='export failed'):
+            export([entity], tmp_path, workers=1)
+
+        assert tmp_path.joinpath('1 - Entity 1', 'entity.json').read_text() == '2024-01-01'
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+import json
+from unittest import mock
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+
+import labstep.service.request as request
+from labstep.service.request import RequestService
+
+
+def makeResponse(status_code, content=None, headers={}):
+    response = Response()
+    response.status_code = status_code
+    response.url = 'https://api.labstep.com/api/generic/file'
+    response.headers = CaseInsensitiveDict(
+        {'Content-Type': 'application/json', **headers})
+    response._content = json.dumps(content).encode() if content is not None else b''
+    return response
+
+
+class TestHTTPCache:
+    def setup_method(self):
+        self.requestService = RequestService()
+
+    def test_freshResponseServedFromDisk(self, tmp_path):
+        self.requestService.enableCache(path=tmp_path / 'cache.sqlite')
+        payload = {'id': 1, 'updated_at': '2020-01-01T00:00:00+00:00'}
+
+        with mock.patch.object(request, 'http') as http:
+            http.get.return_value = makeResponse(200, payload)
+            self.requestService.get('https://api.labstep.com/api/generic/file', headers={'apikey': 'key'})
+            cached = self.requestService.get('https://api.labstep.com/api/generic/file', headers={'apikey': 'key'})
+
+        assert http.get.call_count == 1
+        assert json.loads(cached.content) == payload
+
+    def test_conditionalRevalidation(self, tmp_path):
+        self.requestService.enableCache(path=tmp_path / 'cache.sqlite')
+        payload = {'id': 1}
+
+        with mock.patch.object(request, 'http') as http:
+            http.get.return_value = makeResponse(200, payload, {'ETag': '"v1"'})
+            self.requestService.get('https://api.labstep.com/api/generic/file', headers={})
+
+            http.get.return_value = makeResponse(304)
+            cached = self.requestService.get('https://api.labstep.com/api/generic/file', headers={})
+
+        assert http.get.call_args.kwargs['headers']['If-None-Match'] == '"v1"'
+        assert json.loads(cached.content) == payload
+
+    def test_bypass(self, tmp_path):
+        self.requestService.enableCache(path=tmp_path / 'cache.sqlite')
+
+        with mock.patch.object(request, 'http') as http:
+            http.get.return_value = makeResponse(200, {'id': 1})
+            self.requestService.get('https://api.labstep.com/api/generic/file', headers={}, useCache=False)
+
+        assert self.requestService.httpCache.lookup(
+            self.requestService.httpCache.getKey('https://api.labstep.com/api/generic/file', {}, None)) is None
+
+    def test_eviction(self, tmp_path):
+        httpCache = self.requestService.enableCache(path=tmp_path / 'cache.sqlite', maxSize=1)
+
+        with mock.patch.object(request, 'http') as http:
+            http.get.return_value = makeResponse(200, {'id': 1}, {'ETag': '"v1"'})
+            self.requestService.get('https://api.labstep.com/api/generic/file', headers={})
+
+        assert httpCache.lookup(httpCache.getKey('https://api.labstep.com/api/generic/file', {}, None)) is None
+        assert httpCache._size == 0
+
+    def test_responsesThatCannotBeReusedAreNotStored(self, tmp_path):
+        httpCache = self.requestService.enableCache(path=tmp_path / 'cache.sqlite')
+
+        with mock.patch.object(request, 'http') as http:
+            http.get.return_value = makeResponse(200, {'items': [{'id': 1}]})
+            self.requestService.get('https://api.labstep.com/api/generic/file', headers={})
+
+        assert httpCache.lookup(httpCache.getKey('https://api.labstep.com/api/generic/file', {}, None)) is None
+        assert httpCache._size == 0
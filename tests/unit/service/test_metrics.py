@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+from unittest import mock
+
+import pytest
+
+import labstep.service.request as request
+from labstep.service.metrics import Metrics, getEndpoint
+from labstep.service.request import RequestService
+
+
+def makeResponse(status, content=b'{}'):
+    response = mock.Mock(status_code=status, content=content, headers={})
+    response.request.body = b'{"name": "test"}'
+    response.raw.retries.history = ()
+    return response
+
+
+class TestMetrics:
+    def test_getEndpoint(self):
+        assert getEndpoint(
+            'https://api.labstep.com/api/generic/experiment/123') == '/api/generic/experiment/{id}'
+        assert getEndpoint(
+            'https://api.labstep.com/api/generic/file/download/0b7c8d4a-2f3e-4c5d-9e8f-1a2b3c4d5e6f') == '/api/generic/file/download/{id}'
+
+    def test_recordsRequests(self):
+        service = RequestService(session=mock.Mock())
+        metrics = service.addHook(Metrics())
+        url = 'https://api.labstep.com/api/generic/experiment'
+
+        service.session.get.return_value = makeResponse(200, b'{"id": 1}')
+        service.get(url, headers={}, params={'get_single': 1, 'id': 1})
+        service.get(url, headers={}, params={'get_single': 1, 'id': 2})
+        service.session.post.return_value = makeResponse(200)
+        service.post(url, headers={}, json={'name': 'test'})
+
+        service.session.get.side_effect = request.RequestException(
+            404, 'Not found', response=makeResponse(404))
+        with pytest.raises(request.RequestException):
+            service.get(url, headers={}, params={'cursor': -1})
+
+        stats = metrics.toDict()
+        single = stats['GET /api/generic/experiment single']
+        assert single['count'] == 2
+        assert single['bytesReceived'] == 18
+        assert single['statusCodes'] == {'200': 2}
+        assert stats['POST /api/generic/experiment']['bytesSent'] == 16
+        assert stats['GET /api/generic/experiment list']['errors'] == 1
+
+        text = metrics.toPrometheus()
+        assert 'labstep_requests_total{method="GET",endpoint="/api/generic/experiment",operation="single"} 2' in text
+        assert 'labstep_request_duration_seconds_bucket{method="GET",endpoint="/api/generic/experiment",operation="single",le="+Inf"} 2' in text
+
+    def test_recordsCacheHits(self, tmp_path):
+        service = RequestService(session=mock.Mock())
+        service.enableCache(path=tmp_path / 'cache.sqlite')
+        metrics = service.addHook(Metrics())
+        url = 'https://api.labstep.com/api/generic/experiment'
+
+        response = makeResponse(200, b'{"id": 1, "updated_at": "2020-01-01T00:00:00+0000"}')
+        response.headers = {'Content-Type': 'application/json'}
+        response.url = url
+        service.session.get.return_value = response
+        service.get(url, headers={})
+        service.get(url, headers={})
+
+        assert metrics.toDict()['GET /api/generic/experiment']['cacheHits'] == 1
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+import io
+import json
+from email.parser import BytesParser
+from unittest import mock
+
+import labstep.entities.file.repository as fileRepository
+from labstep.service.multipart import MultipartEncoder
+
+
+def parse(contentType, body):
+    message = BytesParser().parsebytes(
+        f'Content-Type: {contentType}\r\n\r\n'.encode('utf-8') + body)
+    return {part.get_param('name', header='content-disposition'): part
+            for part in message.get_payload()}
+
+
+class TestMultipartEncoder:
+    def test_encodesFieldsAndFiles(self, tmp_path):
+        path = tmp_path.joinpath('plate.csv')
+        path.write_bytes(b'A1,0.5\n' * 1000)
+        progress = []
+
+        with open(path, 'rb') as fileobj:
+            body = MultipartEncoder(
+                {'group_id': 7, 'tags': ['a', 'b'], 'skipped': None},
+                {'file': ('plate.csv', fileobj)},
+                progress=lambda sent, total: progress.append((sent, total)))
+            data = b''.join(iter(lambda: body.read(1024), b''))
+
+        assert len(data) == len(body)
+        assert progress[-1] == (len(body), len(body))
+
+        parts = parse(body.contentType, data)
+        assert parts['group_id'].get_payload() == '7'
+        assert 'skipped' not in parts
+        assert parts['file'].get_filename() == 'plate.csv'
+        assert parts['file'].get_content_type() == 'text/csv'
+        assert parts['file'].get_payload(decode=True) == path.read_bytes()
+
+    def test_newFileStreamsAndClosesHandle(self, tmp_path):
+        path = tmp_path.joinpath('trace.bin')
+        path.write_bytes(bytes(range(256)) * 64)
+        user = mock.Mock(token='token', activeWorkspace=1,
+                         spec=['token', 'activeWorkspace'])
+        opened = []
+
+        def post(url, headers, data):
+            opened.extend(part[0] for part in data._parts)
+            parts = parse(headers['Content-Type'], data.read())
+            assert parts['file'].get_payload(decode=True) == path.read_bytes()
+            return mock.Mock(content=json.dumps({'0': {'id': 1}}))
+
+        with mock.patch('labstep.service.request.requestService') as requestService:
+            requestService.post.side_effect = post
+            file = fileRepository.newFile(user, str(path))
+
+        assert file.id == 1
+        assert all(f.closed for f in opened if hasattr(f, 'name'))
+
+    def test_escapesNames(self):
+        body = MultipartEncoder({}, {'file': ('a"b\r\n.csv', io.BytesIO(b'1'))})
+        data = body.read()
+
+        assert b'filename="a%22b%0D%0A.csv"' in data
+        assert parse(body.contentType, data)['file'].get_payload(decode=True) == b'1'
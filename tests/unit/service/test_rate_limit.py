@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+import io
+from unittest import mock
+
+import pytest
+
+import labstep.service.rateLimit as rateLimit
+import labstep.service.request as request
+
+
+def throttled(retryAfter):
+    response = mock.Mock(status_code=429, headers={'Retry-After': retryAfter})
+    return request.RequestException(429, 'Too Many Requests', response=response)
+
+
+class TestRateLimit:
+    @pytest.fixture(autouse=True)
+    def freshLimiters(self):
+        rateLimit.resetRateLimiters()
+        yield
+        rateLimit.resetRateLimiters()
+
+    def test_retriesThrottledRequests(self):
+        service = request.RequestService(session=mock.Mock())
+        service.session.get.side_effect = [throttled('2'), throttled('1'), 'ok']
+
+        with mock.patch.object(request.time, 'sleep') as sleep:
+            result = service.send('GET', 'https://api.labstep.com', {'apikey': 'key'})
+
+        assert result == 'ok'
+        assert service.session.get.call_count == 3
+        assert sleep.call_args_list[0].args[0] >= 2
+        assert sleep.call_args_list[1].args[0] >= 1
+        assert int(rateLimit.getRateLimiter({'apikey': 'key'}).concurrency.limit) == 2
+
+    def test_givesUpAfterMaxRetries(self):
+        service = request.RequestService(session=mock.Mock())
+        service.session.post.side_effect = throttled('0')
+
+        with mock.patch.object(request.time, 'sleep'), \
+                pytest.raises(request.RequestException):
+            service.send('POST', 'https://api.labstep.com', {'apikey': 'key'})
+
+        assert service.session.post.call_count == rateLimit.rateLimitConfig.maxRetries + 1
+
+    def test_limiterSharedPerUser(self):
+        assert rateLimit.getRateLimiter({'apikey': 'a'}) is rateLimit.getRateLimiter({'apikey': 'a'})
+        assert rateLimit.getRateLimiter({'apikey': 'a'}) is not rateLimit.getRateLimiter({'apikey': 'b'})
+        assert rateLimit.getRateLimiter({'User-Agent': 'python'}) is None
+
+    def test_additiveIncrease(self):
+        limiter = rateLimit.AIMDLimiter(initial=2, maximum=4)
+        for i in range(20):
+            limiter.acquire()
+            limiter.release()
+        assert limiter.limit == 4
+
+    def test_parseRetryAfter(self):
+        assert rateLimit.parseRetryAfter('5') == 5
+        assert rateLimit.parseRetryAfter('Wed, 21 Oct 2015 07:28:00 GMT') == 0
+        assert rateLimit.parseRetryAfter('soon') is None
+
+    def test_serviceUnavailableLowersLimitWithoutRetry(self):
+        service = request.RequestService(session=mock.Mock())
+        service.session.get.side_effect = request.RequestException(503, 'Service Unavailable')
+
+        with pytest.raises(request.RequestException):
+            service.send('GET', 'https://api.labstep.com', {'apikey': 'key'})
+
+        assert service.session.get.call_count == 1
+        assert rateLimit.getRateLimiter({'apikey': 'key'}).concurrency.limit == 4
+
+    def test_rewindsFilesBeforeRetrying(self):
+        service = request.RequestService(session=mock.Mock())
+        fileobj = io.BytesIO(b'data')
+        sent = []
+
+        def post(url, headers, files):
+            sent.append(files['file'][1].read())
+            if len(sent) == 1:
+                raise throttled('0')
+            return 'ok'
+
+        service.session.post.side_effect = post
+
+        with mock.patch.object(request.time, 'sleep'):
+            service.send('POST', 'https://api.labstep.com', {'apikey': 'key'},
+                         files={'file': ('data.txt', fileobj)})
+
+        assert sent == [b'data', b'data']
+
+    def test_doesNotRetryUnseekableBodies(self):
+        class Pipe(io.BytesIO):
+            def seekable(self):
+                return False
+
+        service = request.RequestService(session=mock.Mock())
+        service.session.post.side_effect = throttled('0')
+
+        with pytest.raises(request.RequestException):
+            service.send('POST', 'https://api.labstep.com', {'apikey': 'key'},
+                         files={'file': Pipe(b'data')})
+
+        assert service.session.post.call_count == 1
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+import json
+from unittest import mock
+
+import pytest
+
+import labstep.generic.entity.repository as entityRepository
+import labstep.service.request as request
+from labstep.entities.experiment.model import Experiment
+from labstep.service.requestProfile import (
+    profileRequests, RequestBudgetExceeded, RedundantRequestsFound)
+
+
+@pytest.fixture
+def user():
+    return mock.Mock(token='token', activeWorkspace=1,
+                     spec=['token', 'activeWorkspace'])
+
+
+@pytest.fixture(autouse=True)
+def session():
+    with mock.patch('labstep.service.request.http') as http:
+        http.get.side_effect = lambda url, headers, params: mock.Mock(
+            status_code=200, content=json.dumps({'id': params.get('id')}), headers={})
+        yield http
+
+
+class TestRequestProfile:
+    def test_findsPerItemRequests(self, user):
+        with profileRequests() as profile:
+            for id in range(6):
+                entityRepository.getEntity(user, Experiment, id)
+
+        findings = profile.getFindings()
+        assert profile.count == 6
+        assert [finding['kind'] for finding in findings] == ['n+1']
+        assert findings[0]['endpoint'] == '/api/generic/experiment-workflow'
+        assert __file__ in findings[0]['callSite']
+
+    def test_findsRepeatedRequests(self, user):
+        with pytest.raises(RedundantRequestsFound) as error:
+            with profileRequests(strict=True):
+                entityRepository.getEntity(user, Experiment, 1)
+                entityRepository.getEntity(user, Experiment, 1)
+
+        assert '2 identical requests' in str(error.value)
+
+    def test_budget(self, user, session):
+        with pytest.raises(RequestBudgetExceeded):
+            with profileRequests(budget=2):
+                for id in range(3):
+                    entityRepository.getEntity(user, Experiment, id)
+
+        assert session.get.call_count == 2
+
+    def test_cacheHitsAreNotCounted(self, user, tmp_path):
+        httpCache = request.requestService.enableCache(path=tmp_path / 'cache.sqlite')
+        try:
+            with profileRequests(budget=1) as profile:
+                cached = mock.Mock(content=json.dumps({'id': 1}))
+                with mock.patch.object(httpCache, 'lookup', return_value=(cached, True)):
+                    for id in range(3):
+                        entityRepository.getEntity(user, Experiment, id)
+        finally:
+            request.requestService.disableCache()
+
+        assert profile.count == 0
+
+    def test_lazyPropertiesAttributedToTheirModel(self, user, session):
+        session.get.side_effect = lambda url, headers, params: mock.Mock(
+            status_code=200, content=json.dumps({'id': 1, 'root_experiment': None}), headers={})
+        experiment = Experiment({'id': 1}, user)
+
+        with profileRequests() as profile:
+            experiment.root_experiment
+
+        assert 'experiment/model.py' in profile.records[0].callSite
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+import threading
+import time
+
+import pytest
+
+import labstep.service.taskGraph as taskGraph
+
+
+class TestTaskGraph:
+    def exportTree(self, log, depth=0):
+        lock = threading.Lock()
+
+        def leaf(name):
+            time.sleep(0.01)
+            with lock:
+                log.append(name)
+
+        def branch(name):
+            for i in range(3):
+                taskGraph.submit(leaf, f'{name}.{i}')
+
+        def root():
+            for i in range(3):
+                taskGraph.run(branch, f'branch{i}')
+            taskGraph.afterChildren(log.append, 'html')
+
+        return root
+
+    @pytest.mark.parametrize('workers', [1, 4])
+    def test_afterChildrenRunsLast(self, workers):
+        log = []
+        taskGraph.run(self.exportTree(log), workers=workers)
+        assert len(log) == 10
+        assert log[-1] == 'html'
+
+    def test_errorsPropagate(self):
+        def fail():
+            raise ValueError('failed')
+
+        def root():
+            taskGraph.submit(fail)
+
+        with pytest.raises(ValueError):
+            taskGraph.run(root, workers=4)
@@ -0,0 +1,16 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Author: Labstep <dev@labstep.com>
+
+import subprocess
+import sys
+
+
+def test_import_does_not_load_heavy_dependencies():
+    output = subprocess.run(
+        [sys.executable, '-c',
+         'import sys, labstep; '
+         'print(",".join(m for m in ("pandas", "numpy", "bs4", "PIL", "dotenv") if m in sys.modules))'],
+        capture_output=True, text=True, check=True).stdout.strip()
+
+    assert output == ''